@@ -0,0 +1,82 @@
+"""
+Benchmark de la primera derivada para Newton: compara el camino simbólico
+(parse_expr + sp.diff + lambdify con cse de [f, f']) con la diferenciación
+automática en modo directo (autodiff) en expresiones grandes. Mide el costo
+de preparación (en frío), el de una evaluación escalar y el de una evaluación
+vectorizada, y verifica que las derivadas coincidan.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_autodiff
+"""
+import timeit
+
+import numpy as np
+import sympy as sp
+
+from microservices.app.util import equation as eq
+from microservices.app.util.autodiff import compile_value_and_derivative
+
+
+def _sum_of_sines(n):
+    return '+'.join(f'sin({k}*x)/{k}' for k in range(1, n + 1))
+
+
+def _polynomial(n):
+    return '+'.join(f'{(-1) ** k * (k + 1)}*x**{k}' for k in range(n + 1))
+
+
+def _nested(depth):
+    expr = 'x'
+    for k in range(depth):
+        expr = f'sqrt(1+({expr})**2)*exp(-x/{k + 2})+cos({expr})'
+    return expr
+
+
+def _rational(n):
+    numerator = '+'.join(f'x**{k}/{k + 1}' for k in range(n))
+    denominator = '+'.join(f'exp(x/{k + 1})' for k in range(n))
+    return f'({numerator})/({denominator})+log(1+x**2)'
+
+
+CASES = [
+    ('suma de 50 senos', _sum_of_sines(50)),
+    ('suma de 120 senos', _sum_of_sines(120)),
+    ('polinomio grado 60', _polynomial(60)),
+    ('anidada profundidad 6', _nested(6)),
+    ('racional 40 términos', _rational(40)),
+]
+
+
+def symbolic_path(processed):
+    expr = eq._sympy_parse(processed)
+    return eq._lambdify([expr, sp.diff(expr, eq.X_SYMBOL)])
+
+
+def main(number=5, evaluations=2000):
+    x_vals = np.linspace(-2, 2, 10001)
+    print(f"{'expresión':24} {'prep. simb. (ms)':>17} {'prep. AD (ms)':>14} "
+          f"{'escalar simb. (us)':>19} {'escalar AD (us)':>16} "
+          f"{'vector simb. (ms)':>18} {'vector AD (ms)':>15} {'dif. max':>9}")
+    for name, processed in CASES:
+        t_symbolic = timeit.timeit(lambda: symbolic_path(processed), number=number) / number
+        t_dual = timeit.timeit(lambda: compile_value_and_derivative(processed), number=number) / number
+
+        symbolic = symbolic_path(processed)
+        dual = compile_value_and_derivative(processed)
+        with np.errstate(all='ignore'):
+            s_scalar = timeit.timeit(lambda: symbolic(0.7), number=evaluations) / evaluations
+            d_scalar = timeit.timeit(lambda: dual(0.7), number=evaluations) / evaluations
+            s_vector = timeit.timeit(lambda: symbolic(x_vals), number=number) / number
+            d_vector = timeit.timeit(lambda: dual(x_vals), number=number) / number
+
+            expected = np.broadcast_to(symbolic(x_vals)[1], x_vals.shape)
+            got = np.broadcast_to(dual(x_vals)[1], x_vals.shape)
+        finite = np.isfinite(expected) & np.isfinite(got)
+        diff = np.max(np.abs(got[finite] - expected[finite]) / np.maximum(1, np.abs(expected[finite])))
+        print(f"{name:24} {t_symbolic * 1e3:17.1f} {t_dual * 1e3:14.2f} "
+              f"{s_scalar * 1e6:19.1f} {d_scalar * 1e6:16.1f} "
+              f"{s_vector * 1e3:18.2f} {d_vector * 1e3:15.2f} {diff:9.1e}")
+
+
+if __name__ == '__main__':
+    main()
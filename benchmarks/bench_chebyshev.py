@@ -0,0 +1,62 @@
+"""
+Benchmark del interpolante de Chebyshev (util/chebyshev.py) frente a los
+caminos anteriores: todas las raíces en [a, b] por barrido + bisección
+(/bisection/all_roots) y la integral por Simpson compuesto (/simpson).
+Se comparan el tiempo, el número de evaluaciones de f y el error.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_chebyshev
+"""
+import time
+
+import numpy as np
+
+from microservices.app.util import equation as eq
+from microservices.app.util.chebyshev import ChebyshevProxy
+from microservices.app.util.evaluator import CountingEvaluator
+from microservices.bisection.logic import bisection
+from microservices.simpson.logic import simpson
+
+CASES = [
+    # (ecuación, a, b, raíces exactas, integral exacta)
+    ('\\sin(x)', -10.0, 10.0, np.pi * np.arange(-3, 4), 0.0),
+    ('\\sin(50x)', 0.0, 10.0, np.pi / 50 * np.arange(0, 160), (1 - np.cos(500.0)) / 50),
+    ('\\cos(x)-x', 0.0, 2.0, np.array([0.7390851332151607]), np.sin(2.0) - 2.0),
+    ('e^{x}-2', 0.0, 1.0, np.array([np.log(2.0)]), np.e - 3.0),
+]
+
+
+def _max_error(found, exact):
+    if len(found) != len(exact):
+        return float('nan')
+    return float(np.max(np.abs(np.sort(found) - exact))) if len(exact) else 0.0
+
+
+def main():
+    print(f"{'ecuación':>12} {'método':>10} {'tiempo (ms)':>12} {'evaluaciones':>13} {'raíces':>7} "
+          f"{'error raíces':>13} {'error integral':>15}")
+    for equation, a, b, exact_roots, exact_integral in CASES:
+        f = eq.parse_function(equation)
+
+        counted = CountingEvaluator(f)
+        start = time.perf_counter()
+        brackets, _ = eq.find_valid_intervals(counted, a, b, 1000, max_expansions=0)
+        roots, _ = bisection.bisection_refine_brackets(counted, brackets, 100, 1e-10)
+        area, _ = simpson.simpson_method(counted, a, b, 1000)
+        elapsed = time.perf_counter() - start
+        found = [r['root'] for r in roots]
+        print(f"{equation:>12} {'anterior':>10} {elapsed * 1e3:12.1f} {counted.evaluations:13d} {len(found):7d} "
+              f"{_max_error(found, exact_roots):13.2e} {abs(area - exact_integral):15.2e}")
+
+        counted = CountingEvaluator(f)
+        start = time.perf_counter()
+        proxy = ChebyshevProxy(counted, a, b)
+        found = proxy.roots()
+        area = proxy.integral()
+        elapsed = time.perf_counter() - start
+        print(f"{equation:>12} {'chebyshev':>10} {elapsed * 1e3:12.1f} {counted.evaluations:13d} {len(found):7d} "
+              f"{_max_error(found, exact_roots):13.2e} {abs(area - exact_integral):15.2e}")
+
+
+if __name__ == '__main__':
+    main()
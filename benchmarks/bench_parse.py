@@ -0,0 +1,52 @@
+"""
+Benchmark del parseo de ecuaciones: compara el compilador rápido
+(expression_compiler) con el camino de SymPy (parse_expr + lambdify) y
+verifica que ambos den los mismos valores numéricos.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_parse
+"""
+import timeit
+
+import numpy as np
+import sympy as sp
+
+from microservices.app.util import equation as eq
+from microservices.app.util.expression_compiler import compile_expression
+
+CASES = [
+    'x^{2}-4',
+    'x^{3}-2x-5',
+    '\\sin\\left(x\\right)+x^{3}-2x',
+    'e^{x}-3x',
+    '\\frac{1}{x}-\\sqrt{x}',
+    '\\ln\\left(x\\right)-1',
+    '\\frac{x^{5}-3x^{4}+2x^{2}-7}{x^{2}+1}+\\cos\\left(2x\\right)',
+    '((27-9x)**(1/2))/2',
+]
+
+
+def sympy_path(processed):
+    return sp.lambdify(eq.X_SYMBOL, eq._sympy_parse(processed), modules=['numpy'])
+
+
+def main(number=50):
+    x_vals = np.linspace(-5, 5, 1001)
+    print(f"{'ecuacion':60} {'sympy (ms)':>11} {'rapido (ms)':>12} {'mejora':>8} {'dif. max':>10}")
+    for latex in CASES:
+        processed = eq.preprocess_equation(latex)
+        t_sympy = timeit.timeit(lambda: sympy_path(processed), number=number) / number
+        t_fast = timeit.timeit(lambda: compile_expression(processed), number=number) / number
+
+        with np.errstate(all='ignore'):
+            expected = sympy_path(processed)(x_vals)
+            got = compile_expression(processed)(x_vals)
+        finite = np.isfinite(expected) & np.isfinite(got)
+        same_mask = np.array_equal(np.isfinite(expected), np.isfinite(got))
+        diff = np.max(np.abs(got[finite] - expected[finite]) / np.maximum(1, np.abs(expected[finite])))
+        note = '' if same_mask else '  (dominio distinto)'
+        print(f"{latex:60} {t_sympy * 1e3:11.3f} {t_fast * 1e3:12.3f} {t_sympy / t_fast:7.1f}x {diff:10.1e}{note}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""
+Benchmark del preprocesado de ecuaciones: compara el traductor de una sola
+pasada (latex_translator) con la cadena de expresiones regulares anterior,
+sobre salidas de MathQuill largas y con fracciones y raíces muy anidadas.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_preprocess
+"""
+import logging
+import re
+import sys
+import timeit
+
+from sympy.parsing.sympy_parser import parse_expr
+
+from microservices.app.util import equation as eq
+from microservices.app.util.latex_translator import translate_latex
+
+# El registro por paso formaba parte del costo original: se formatea pero no se emite
+logger = logging.getLogger('benchmarks.legacy_preprocess')
+logger.setLevel(logging.CRITICAL)
+
+
+# --- Implementación anterior (cadena de expresiones regulares) ---------------
+
+def legacy_replace_integrals(eq):
+    r"""
+    Reemplaza expresiones de integrales definidas en LaTeX por la sintaxis de SymPy.
+    Por ejemplo, \int_{a}^{b} f(x) dx -> Integral(f(x), (x, a, b))
+    """
+    # Patrón para detectar \int_{a}^{b} f(x) dx
+    integral_pattern = r'\\int_\{([^}]+)\}\^{([^}]+)\}\s*([^\\]+?)\s*dx'
+    
+    # Función de reemplazo
+    def integral_replacer(match):
+        lower_limit = match.group(1).strip()
+        upper_limit = match.group(2).strip()
+        integrand = match.group(3).strip()
+        return f'Integral({integrand}, (x, {lower_limit}, {upper_limit}))'
+    
+    # Reemplazar todas las integrales encontradas
+    eq = re.sub(integral_pattern, integral_replacer, eq)
+    
+    return eq
+
+def legacy_replace_fractions(eq):
+    r"""
+    Reemplaza todas las instancias de \frac{a}{b} por (a)/(b).
+    Maneja múltiples y fracciones anidadas.
+    """
+    while '\\frac' in eq:
+        frac_start = eq.find('\\frac')
+        first_brace = eq.find('{', frac_start)
+        if first_brace == -1:
+            logger.error("Fracción malformada: No se encontró '{' después de '\\frac'.")
+            raise ValueError("Fracción malformada: No se encontró '{' después de '\\frac'.")
+
+        # Función para extraer el contenido dentro de las llaves
+        def extract_brace_content(s, start):
+            if s[start] != '{':
+                logger.error(f"Se esperaba '{{' en la posición {start}.")
+                return None, start
+            stack = 1
+            content = []
+            for i in range(start + 1, len(s)):
+                if s[i] == '{':
+                    stack += 1
+                    content.append(s[i])
+                elif s[i] == '}':
+                    stack -= 1
+                    if stack == 0:
+                        return ''.join(content), i
+                    else:
+                        content.append(s[i])
+                else:
+                    content.append(s[i])
+            logger.error("Fracción malformada: No se encontró '}' correspondiente.")
+            return None, start  # No matching closing brace
+
+        # Extraer el numerador
+        numerator, num_end = extract_brace_content(eq, first_brace)
+        if numerator is None:
+            raise ValueError("Fracción malformada: No se pudo extraer el numerador.")
+
+        # Encontrar la primera '{' después del numerador
+        denominator_start = eq.find('{', num_end)
+        if denominator_start == -1:
+            raise ValueError("Fracción malformada: Faltante '{' para el denominador.")
+
+        # Extraer el denominador
+        denominator, den_end = extract_brace_content(eq, denominator_start)
+        if denominator is None:
+            raise ValueError("Fracción malformada: No se pudo extraer el denominador.")
+
+        # Reemplazar \frac{numerador}{denominador} con (numerador)/(denominador)
+        frac_full = eq[frac_start:den_end + 1]
+        frac_replacement = f'({numerator})/({denominator})'
+        eq = eq.replace(frac_full, frac_replacement, 1)
+        logger.info(f"Reemplazado '{frac_full}' por '{frac_replacement}'.")
+
+    return eq
+def legacy_preprocess_equation(equation):
+    r"""
+    Preprocesa la ecuación para manejar notación LaTeX, inserción de '*', reemplazo de '^' por '**', y reemplazo de \frac y \int.
+    """
+    eq = equation.strip()
+    logger.info(f"Ecuación original: {eq}")
+
+    # 1. Reemplazar \frac{a}{b} por (a)/(b)
+    eq = legacy_replace_fractions(eq)
+    logger.info(f"Ecuación después de reemplazar fracciones: {eq}")
+
+    # 2. Reemplazar \sqrt{...} por sqrt(...)
+    eq = re.sub(r'\\sqrt\{([^{}]+)\}', r'sqrt(\1)', eq)
+    logger.info(f"Ecuación después de reemplazar '\\sqrt{{...}}': {eq}")
+
+    # 3. Reemplazar otros comandos de LaTeX
+    eq = re.sub(r'\\left|\\right', '', eq)  # Eliminar \left y \right
+    eq = re.sub(r'\\cdot|\\times', '*', eq)  # Multiplicación
+    eq = re.sub(r'\\div', '/', eq)  # División
+    eq = re.sub(r'\\pi', 'pi', eq)  # Pi
+    eq = re.sub(r'\\ln', 'log', eq)  # Logaritmo natural
+    eq = re.sub(r'\\log', 'log10', eq)  # Logaritmo en base 10
+    eq = re.sub(r'\\exp\{([^{}]+)\}', r'exp(\1)', eq)  # Exponentes
+    eq = re.sub(r'\\sin', 'sin', eq)  # Seno
+    eq = re.sub(r'\\cos', 'cos', eq)  # Coseno
+    eq = re.sub(r'\\tan', 'tan', eq)  # Tangente
+    logger.info(f"Ecuación después de reemplazar otros comandos de LaTeX: {eq}")
+
+    # 4. Reemplazar integrales
+    eq = legacy_replace_integrals(eq)
+    logger.info(f"Ecuación después de reemplazar integrales: {eq}")
+
+    # 5. Reemplazar '{' y '}' por '(' y ')'
+    eq = eq.replace('{', '(').replace('}', ')')
+    logger.info(f"Ecuación después de reemplazar '{{}}' por '()': {eq}")
+
+    # 6. Insertar explícitamente '*' entre dígitos y letras o '(' con manejo de espacios
+    eq = re.sub(r'(\d)\s*([a-zA-Z(])', r'\1*\2', eq)
+    eq = re.sub(r'(\))\s*([a-zA-Z(])', r'\1*\2', eq)
+    logger.info(f"Ecuación después de insertar '*': {eq}")
+
+    # 7. Reemplazar '^' por '**' para exponentiación
+    eq = eq.replace('^', '**')
+    logger.info(f"Ecuación después de reemplazar '^' por '**': {eq}")
+
+    # Validar paréntesis balanceados
+    if eq.count('(') != eq.count(')'):
+        raise ValueError("Paréntesis desbalanceados en la ecuación.")
+
+    logger.info(f"Ecuación preprocesada: {eq}")
+    return eq
+
+
+# --- Casos de prueba ---------------------------------------------------------
+
+def nested_fraction(depth):
+    """\\frac{1}{1+\\frac{1}{1+...}} con `depth` niveles."""
+    latex = 'x'
+    for _ in range(depth):
+        latex = '\\frac{1}{1+' + latex + '}'
+    return latex
+
+
+def nested_sqrt(depth):
+    """\\sqrt{1+\\sqrt{1+...}} con `depth` niveles."""
+    latex = 'x'
+    for _ in range(depth):
+        latex = '\\sqrt{1+' + latex + '}'
+    return latex
+
+
+def long_polynomial(terms):
+    """Suma larga de términos como los que produce MathQuill: 3x^{2}\\cdot\\sin x."""
+    return '+'.join(f'{k}x^{{{k % 5 + 1}}}\\cdot\\sin\\left(x\\right)' for k in range(1, terms + 1))
+
+
+def mixed(terms):
+    """Fracciones, raíces y funciones mezcladas."""
+    return '+'.join(
+        f'\\frac{{\\sqrt{{x+{k}}}}}{{{k}+\\frac{{x}}{{{k + 1}}}}}-\\cos\\left({k}x\\right)'
+        for k in range(1, terms + 1)
+    )
+
+
+CASES = {
+    'fraccion anidada (40 niveles)': nested_fraction(40),
+    'fraccion anidada (150 niveles)': nested_fraction(150),
+    'raiz anidada (100 niveles)': nested_sqrt(100),
+    'ecuacion tipica': '\\frac{x^{2}-4}{x+1}+3\\sin\\left(x\\right)',
+    'polinomio largo (200 terminos)': long_polynomial(200),
+    'mezcla (100 terminos)': mixed(100),
+}
+
+
+def same_expression(a, b):
+    """Compara las expresiones de SymPy; None si la salida anterior no se puede parsear."""
+    local_dict = {'x': eq.X_SYMBOL, **eq.ALLOWED_FUNCS}
+    expr_b = parse_expr(b, local_dict=local_dict, transformations=eq.transformations)
+    try:
+        expr_a = parse_expr(a, local_dict=local_dict, transformations=eq.transformations)
+    except Exception:
+        return None
+    return (expr_a - expr_b).equals(0)
+
+
+def main(number=20):
+    print(f"{'caso':32} {'longitud':>9} {'regex (ms)':>11} {'una pasada (ms)':>16} {'mejora':>8}")
+    for name, latex in CASES.items():
+        new = translate_latex(latex)
+        try:
+            old = legacy_preprocess_equation(latex)
+        except ValueError:
+            old = None
+
+        t_new = timeit.timeit(lambda: translate_latex(latex), number=number) / number
+        if old is not None:
+            t_old = timeit.timeit(lambda: legacy_preprocess_equation(latex), number=number) / number
+            speedup = f"{t_old / t_new:7.1f}x"
+            old_ms = f"{t_old * 1e3:11.3f}"
+            if len(latex) < 2000:
+                same = same_expression(old, new)
+                if same is None:
+                    print(f"  '{name}': la salida anterior no era una expresión válida", file=sys.stderr)
+                elif not same:
+                    print(f"  ¡Resultados distintos en '{name}'!", file=sys.stderr)
+        else:
+            speedup, old_ms = '      -', '      error'
+        print(f"{name:32} {len(latex):9d} {old_ms} {t_new * 1e3:16.3f} {speedup}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark del arranque de cada microservicio: tiempo de importar el módulo
+run (que llama a create_app()) y memoria residual máxima del proceso. Cada
+servicio se mide en un intérprete nuevo para partir siempre en frío.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_startup [repeticiones]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+SERVICES = [
+    'app',
+    'bisection',
+    'newton_raphson',
+    'secant',
+    'fixed_point',
+    'jacobi',
+    'gauss_seidel',
+    'euler',
+    'simpson',
+    'trapecio',
+]
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import microservices.{service}.run
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'sympy': 'sympy' in sys.modules,
+    'plotly': 'plotly.graph_objs' in sys.modules,
+}}))
+"""
+
+
+def measure(service):
+    output = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(service=service)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(repeat=3):
+    print(f"{'servicio':16} {'import (ms)':>12} {'RSS (MB)':>9} {'sympy':>6} {'plotly':>7}")
+    for service in SERVICES:
+        runs = [measure(service) for _ in range(repeat)]
+        seconds = statistics.median(run['seconds'] for run in runs)
+        rss_mb = statistics.median(run['max_rss_kb'] for run in runs) / 1024
+        print(f"{service:16} {seconds * 1e3:12.1f} {rss_mb:9.1f} "
+              f"{'sí' if runs[0]['sympy'] else 'no':>6} {'sí' if runs[0]['plotly'] else 'no':>7}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
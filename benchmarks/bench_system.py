@@ -0,0 +1,138 @@
+"""
+Benchmark del solver de sistemas no lineales (/newton_raphson/system) en el
+problema de Bratu discretizado con n incógnitas. Compara el esquema anterior
+(evalf por ecuación en cada residuo y sp.diff + lambdify por entrada de la
+Jacobiana) con el sistema compilado una sola vez, usando en ambos casos el
+mismo Newton con búsqueda lineal. Después compara Newton con Broyden
+(good/bad) en número de evaluaciones de la Jacobiana y resoluciones lineales,
+y la Jacobiana simbólica densa con la dispersa por diferencias finitas con
+coloreo de columnas.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_system
+"""
+import time
+
+import numpy as np
+import sympy as sp
+
+from microservices.app.util import equation as eq
+from microservices.newton_raphson.logic.newton_system import newton_system, broyden_system
+from microservices.newton_raphson.logic.sparse_jacobian import FiniteDifferenceJacobian
+
+
+def bratu(n, lam=1.0):
+    h = 1.0 / (n + 1)
+    names = [f'u{i}' for i in range(n)]
+    equations = []
+    for i in range(n):
+        left = names[i - 1] if i > 0 else '0'
+        right = names[i + 1] if i < n - 1 else '0'
+        equations.append(f'{left} - 2*{names[i]} + {right} + {h * h * lam}*exp({names[i]})')
+    return equations, names
+
+
+def legacy(system):
+    """Residuo con evalf y Jacobiana entrada por entrada, como antes."""
+    def F(x):
+        subs = dict(zip(system.symbols, x))
+        return np.array([float(e.evalf(subs=subs)) for e in system.exprs], dtype=float)
+
+    def J(x):
+        rows = []
+        for e in system.exprs:
+            rows.append([sp.lambdify(system.symbols, sp.diff(e, s), modules=['numpy'])(*x)
+                         for s in system.symbols])
+        return np.array(rows, dtype=float)
+
+    return F, J
+
+
+def main(sizes=(5, 10, 20, 40)):
+    print(f"{'n':>4} {'anterior (ms)':>14} {'compilado, frío (ms)':>21} "
+          f"{'compilado, caliente (ms)':>25} {'iteraciones':>12} {'||F||':>9}")
+    for n in sizes:
+        equations, names = bratu(n)
+        x0 = np.zeros(n)
+
+        eq.clear_expression_cache()
+        start = time.perf_counter()
+        system = eq.get_compiled_system(equations, names)
+        result = newton_system(system.residual, system.jacobian, x0, 50)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        newton_system(system.residual, system.jacobian, x0, 50)
+        warm = time.perf_counter() - start
+
+        F, J = legacy(system)
+        start = time.perf_counter()
+        newton_system(F, J, x0, 50)
+        old = time.perf_counter() - start
+
+        print(f"{n:4d} {old * 1e3:14.1f} {cold * 1e3:21.1f} {warm * 1e3:25.2f} "
+              f"{result['iterations']:12d} {result['residual_norm']:9.1e}")
+
+
+def compare_methods(sizes=(20, 100, 200), lam=3.0):
+    print(f"\n{'n':>4} {'método':>13} {'tiempo (ms)':>12} {'iteraciones':>12} {'residuos':>9} "
+          f"{'Jacobianas':>11} {'res. lineales':>14} {'||F||':>9}")
+    solvers = {
+        'newton': lambda s, x0: newton_system(s.residual, s.jacobian, x0, 200),
+        'broyden_good': lambda s, x0: broyden_system(s.residual, s.jacobian, x0, 200, update='good'),
+        'broyden_bad': lambda s, x0: broyden_system(s.residual, s.jacobian, x0, 200, update='bad'),
+    }
+    for n in sizes:
+        equations, names = bratu(n, lam)
+        system = eq.get_compiled_system(equations, names)
+        x0 = np.zeros(n)
+        system.residual(x0)
+        system.jacobian(x0)
+        for method, solve in solvers.items():
+            start = time.perf_counter()
+            result = solve(system, x0)
+            elapsed = time.perf_counter() - start
+            print(f"{n:4d} {method:>13} {elapsed * 1e3:12.2f} {result['iterations']:12d} "
+                  f"{result['residual_evaluations']:9d} {result['jacobian_evaluations']:11d} "
+                  f"{result['linear_solves']:14d} {result['residual_norm']:9.1e}")
+
+
+def compare_jacobians(sizes=(50, 200, 1000), lam=3.0):
+    print(f"\n{'n':>5} {'Jacobiana':>10} {'frío (ms)':>10} {'caliente (ms)':>14} {'entradas':>9} "
+          f"{'colores':>8} {'residuos':>9} {'||F||':>9}")
+    for n in sizes:
+        equations, names = bratu(n, lam)
+        x0 = np.zeros(n)
+        eq.clear_expression_cache()
+        system = eq.get_compiled_system(equations, names)
+        system.residual(x0)
+
+        if n <= 200:
+            start = time.perf_counter()
+            J = system.jacobian
+            result = newton_system(system.residual, J, x0, 50)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            newton_system(system.residual, J, x0, 50)
+            warm = time.perf_counter() - start
+            print(f"{n:5d} {'simbólica':>10} {cold * 1e3:10.1f} {warm * 1e3:14.2f} {n * n:9d} "
+                  f"{'-':>8} {result['residual_evaluations']:9d} {result['residual_norm']:9.1e}")
+
+        start = time.perf_counter()
+        rows, cols = system.sparsity
+        fd = FiniteDifferenceJacobian(system.residual, rows, cols, n)
+        result = newton_system(fd.residual, fd, x0, 50)
+        cold = time.perf_counter() - start
+        evaluations = result['residual_evaluations'] + fd.evaluations
+        start = time.perf_counter()
+        newton_system(fd.residual, fd, x0, 50)
+        warm = time.perf_counter() - start
+        print(f"{n:5d} {'dispersa':>10} {cold * 1e3:10.1f} {warm * 1e3:14.2f} {rows.size:9d} "
+              f"{fd.num_colors:8d} {evaluations:9d} "
+              f"{result['residual_norm']:9.1e}")
+
+
+if __name__ == '__main__':
+    main()
+    compare_methods()
+    compare_jacobians()
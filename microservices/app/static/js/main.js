@@ -568,6 +568,8 @@ class CalculatorApp {
             const data = await response.json();
             if (data.error) {
                 this.showError(data.error);
+            } else if (data.a === undefined) {
+                this.showError("La función no cambia de signo en ningún intervalo; sus raíces no se pueden acotar para bisección.");
             } else {
                 this.elements.aBisection.value = data.a;
                 this.elements.bBisection.value = data.b;
@@ -0,0 +1,174 @@
+"""
+Diferenciación automática en modo directo (números duales) sobre el árbol de
+la expresión.
+
+Cada nodo del árbol que produce expression_compiler.parse_expression se
+evalúa como un par (valor, derivada) aplicando la regla de la cadena nodo a
+nodo. En lugar de interpretar el árbol en cada llamada, el recorrido genera
+una única función de NumPy con un temporal por nodo, de modo que una sola
+evaluación devuelve (f(x), f'(x)) sin derivación simbólica ni SymPy. Los
+subárboles constantes no generan código para su derivada.
+"""
+import ast
+
+import numpy as np
+
+from . import expression_compiler
+
+# Nombres que usa el código generado; todos existen también en el espacio de
+# nombres de NumPy con el que la caché en disco reconstruye las funciones.
+_NAMESPACE = {
+    '_asarray': np.asarray,
+    'sign': np.sign,
+    **expression_compiler._FUNCTIONS,
+    **expression_compiler._CONSTANTS,
+}
+
+
+def _is_literal(code):
+    try:
+        float(code)
+    except ValueError:
+        return False
+    return True
+
+
+class _DualBuilder:
+    """
+    Emite el código de la pasada directa. Cada visita devuelve el par
+    (valor, derivada) como fragmentos de código; la derivada es None cuando el
+    subárbol no depende de x.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.names = {}
+
+    def assign(self, code):
+        # Un temporal por código distinto: los subárboles repetidos se
+        # calculan una sola vez (eliminación de subexpresiones comunes)
+        if _is_literal(code):
+            # Un literal con signo va entre paréntesis: -2.0 ** x es -(2.0 ** x)
+            return f"({code})" if code.startswith('-') else code
+        name = self.names.get(code)
+        if name is None:
+            name = f"_t{len(self.names)}"
+            self.names[code] = name
+            self.lines.append(f"    {name} = {code}")
+        return name
+
+    @staticmethod
+    def times(factor, derivative):
+        return factor if derivative == '1.0' else f"{factor} * {derivative}"
+
+    def visit(self, node):
+        if isinstance(node, ast.Constant):
+            return repr(float(node.value)), None
+        if isinstance(node, ast.Name):
+            return node.id, ('1.0' if node.id == 'x' else None)
+        if isinstance(node, ast.UnaryOp):
+            value, derivative = self.visit(node.operand)
+            if isinstance(node.op, ast.UAdd):
+                return value, derivative
+            return self.assign(f"-{value}"), (None if derivative is None else self.assign(f"-{derivative}"))
+        if isinstance(node, ast.BinOp):
+            return self.binary(node)
+        return self.call(node.func.id, *self.visit(node.args[0]))
+
+    def binary(self, node):
+        a, da = self.visit(node.left)
+        b, db = self.visit(node.right)
+        op = node.op
+
+        if isinstance(op, (ast.Add, ast.Sub)):
+            sign = '+' if isinstance(op, ast.Add) else '-'
+            value = self.assign(f"{a} {sign} {b}")
+            if da is None and db is None:
+                return value, None
+            if db is None:
+                return value, da
+            if da is None:
+                return value, (db if sign == '+' else self.assign(f"-{db}"))
+            return value, self.assign(f"{da} {sign} {db}")
+
+        if isinstance(op, ast.Mult):
+            value = self.assign(f"{a} * {b}")
+            terms = []
+            if da is not None:
+                terms.append(self.times(b, da))
+            if db is not None:
+                terms.append(self.times(a, db))
+            return value, (self.assign(' + '.join(terms)) if terms else None)
+
+        if isinstance(op, ast.Div):
+            value = self.assign(f"{a} / {b}")
+            if da is None and db is None:
+                return value, None
+            if db is None:
+                return value, self.assign(f"{da} / {b}")
+            numerator = f"{da} - {value} * {db}" if da is not None else f"-{value} * {db}"
+            return value, self.assign(f"({numerator}) / {b}")
+
+        # Potencia
+        value = self.assign(f"{a} ** {b}")
+        if da is None and db is None:
+            return value, None
+        if db is None:
+            # Exponente constante: d(u**n) = n * u**(n - 1) * du
+            if isinstance(node.right, ast.Constant):
+                power = self.assign(f"{a} ** {float(node.right.value) - 1.0!r}")
+            else:
+                power = self.assign(f"{a} ** ({b} - 1.0)")
+            return value, self.assign(self.times(f"{b} * {power}", da))
+        if da is None:
+            # Base constante: d(c**v) = c**v * log(c) * dv
+            return value, self.assign(self.times(f"{value} * log({a})", db))
+        return value, self.assign(f"{value} * ({db} * log({a}) + {b} * {da} / {a})")
+
+    def call(self, name, u, du):
+        value = self.assign(f"{name}({u})")
+        if du is None:
+            return value, None
+        if name == 'log':
+            return value, self.assign(f"{du} / {u}")
+        if name == 'sqrt':
+            return value, self.assign(f"{du} / (2.0 * {value})")
+        factors = {
+            'sin': f"cos({u})",
+            'cos': f"-sin({u})",
+            'tan': f"(1.0 + {value} ** 2)",
+            'exp': value,
+            'abs': f"sign({u})",
+        }
+        return value, self.assign(self.times(factors[name], du))
+
+
+def compile_value_and_derivative(processed_eq):
+    """
+    Genera una función que devuelve (f(x), f'(x)) en una sola evaluación.
+
+    Args:
+        processed_eq (str): Ecuación en sintaxis de Python/SymPy (salida de preprocess_equation).
+
+    Returns:
+        function: fd(x) -> (f(x), f'(x)); acepta escalares o arreglos de NumPy.
+            Tiene el atributo `source` con el código generado.
+
+    Raises:
+        UnsupportedExpression: si la expresión requiere el camino de SymPy.
+    """
+    tree = expression_compiler.parse_expression(processed_eq)
+    builder = _DualBuilder()
+    value, derivative = builder.visit(tree.body)
+    source = "\n".join(
+        # Los escalares se quedan como float: las operaciones de NumPy sobre
+        # arreglos de dimensión 0 son varias veces más lentas
+        ["def _dual(x):", "    x = x if type(x) is float else _asarray(x, dtype=float)"]
+        + builder.lines
+        + [f"    return {value}, {derivative if derivative is not None else '0.0'}", ""]
+    )
+    namespace = dict(_NAMESPACE)
+    exec(compile(source, '<autodiff>', 'exec'), namespace)
+    func = namespace['_dual']
+    func.source = source
+    return func
@@ -0,0 +1,203 @@
+"""
+Representación de f en [a, b] por su interpolante de Chebyshev (al estilo de
+chebfun).
+
+f se muestrea en puntos de Chebyshev de segunda especie, cuyo número se
+duplica hasta que los coeficientes (obtenidos con una FFT) decaen al nivel
+del redondeo. Como las mallas son anidadas, al duplicar solo se evalúan los
+puntos nuevos. Con esa única muestra se obtienen todas las raíces reales
+(valores propios de la matriz colega), la integral definida
+(Clenshaw-Curtis) y los valores para la gráfica, sin volver a evaluar f.
+"""
+import numpy as np
+
+# Tamaño inicial de la malla y máximo de intervalos de Chebyshev (n + 1 puntos)
+MIN_POINTS = 16
+MAX_POINTS = 2 ** 13
+# Grado a partir del cual las raíces se buscan subdividiendo el intervalo
+ROOTS_MAX_DEGREE = 50
+# Punto de corte ligeramente asimétrico (evita caer justo sobre raíces simétricas)
+SPLIT_POINT = -0.004849834917525
+
+
+def chebyshev_points(n):
+    """Los n + 1 puntos cos(pi j / n), j = 0..n, en [-1, 1] (de 1 a -1)."""
+    return np.cos(np.pi * np.arange(n + 1) / n)
+
+
+def values_to_coefficients(values):
+    """Coeficientes de Chebyshev del interpolante en los puntos de chebyshev_points."""
+    n = len(values) - 1
+    if n == 0:
+        return np.array(values, dtype=float)
+    extended = np.concatenate([values, values[n - 1:0:-1]])
+    coefficients = np.real(np.fft.fft(extended))[:n + 1] / n
+    coefficients[0] /= 2
+    coefficients[n] /= 2
+    return coefficients
+
+
+def _tail_level(coefficients, scale=None):
+    """Mayor coeficiente de la cola (al menos 4 o 1/8 del total), relativo a scale."""
+    if scale is None:
+        scale = np.max(np.abs(coefficients))
+    if scale == 0:
+        return 0.0
+    tail = max(4, len(coefficients) // 8)
+    return float(np.max(np.abs(coefficients[-tail:])) / scale)
+
+
+def _chop(coefficients, tol):
+    """Descarta los coeficientes finales menores que tol (relativo al mayor)."""
+    scale = np.max(np.abs(coefficients))
+    significant = np.nonzero(np.abs(coefficients) > tol * scale)[0]
+    if significant.size == 0:
+        return coefficients[:1] * 0
+    return coefficients[:significant[-1] + 1]
+
+
+def _real_roots(coefficients, tol, imag_tol=1e-6):
+    """
+    Raíces reales en [-1, 1] de la serie de Chebyshev, con subdivisión
+    recursiva; tol es el nivel relativo de los coeficientes despreciables.
+    """
+    from numpy.polynomial import chebyshev as C
+
+    coefficients = _chop(coefficients, tol)
+    degree = len(coefficients) - 1
+    if degree < 1 or not np.any(coefficients):
+        return np.array([])
+    if degree <= ROOTS_MAX_DEGREE:
+        roots = C.chebroots(coefficients)
+        roots = roots[np.abs(roots.imag) <= imag_tol]
+        roots = np.real(roots)
+        return np.clip(roots[np.abs(roots) <= 1 + 1e-8], -1.0, 1.0)
+
+    # Restringir el interpolante a cada mitad (sin evaluar f) y seguir en ella.
+    # En medio intervalo suele bastar algo más de la mitad del grado; si no, el completo.
+    scale = np.max(np.abs(coefficients))
+    found = []
+    for lo, hi in ((-1.0, SPLIT_POINT), (SPLIT_POINT, 1.0)):
+        for n in ((5 * degree) // 8 + 8, degree):
+            t = (hi + lo) / 2 + (hi - lo) / 2 * chebyshev_points(n)
+            restricted = values_to_coefficients(C.chebval(t, coefficients))
+            if _tail_level(restricted, scale) <= tol:
+                break
+        sub_roots = _real_roots(restricted, tol, imag_tol)
+        found.append((hi + lo) / 2 + (hi - lo) / 2 * sub_roots)
+    return np.concatenate(found)
+
+
+class ChebyshevProxy:
+    """
+    Interpolante de Chebyshev adaptativo de f en [a, b].
+
+    `f` debe aceptar arreglos (como las funciones de equation.parse_function)
+    y ser continua en [a, b]: si algún punto de la muestra no es finito se
+    lanza ValueError. Si con MAX_POINTS puntos los coeficientes aún no han
+    decaído (f no es suave), `converged` es False y la aproximación se
+    conserva con la precisión alcanzada.
+    """
+
+    def __init__(self, f, a, b, tol=1e-13, max_points=MAX_POINTS):
+        if not a < b:
+            raise ValueError("Se requiere a < b.")
+        self.a = float(a)
+        self.b = float(b)
+        self.evaluations = 0
+        self.converged = False
+
+        n = MIN_POINTS
+        values = self._sample(f, chebyshev_points(n))
+        previous_level = np.inf
+        while True:
+            coefficients = values_to_coefficients(values)
+            level = _tail_level(coefficients)
+            if level <= tol:
+                self.converged = True
+                break
+            if level < 1e-8 and level > previous_level / 4:
+                # La cola dejó de decaer: es el ruido de evaluación de f (p. ej.
+                # sin(500x) lejos del origen), no falta de resolución
+                self.converged = True
+                tol = 2 * level
+                break
+            if 2 * n > max_points:
+                break
+            # La malla de 2n contiene la de n en los índices pares
+            refined = np.empty(2 * n + 1)
+            refined[::2] = values
+            refined[1::2] = self._sample(f, np.cos(np.pi * np.arange(1, 2 * n, 2) / (2 * n)))
+            values = refined
+            previous_level = level
+            n *= 2
+
+        self.tol = tol
+        self.values = values
+        self.coefficients = _chop(coefficients, tol) if self.converged else coefficients
+
+    def _sample(self, f, t):
+        x = self._to_interval(t)
+        values = np.asarray(np.broadcast_to(f(x), x.shape), dtype=float)
+        self.evaluations += x.size
+        if not np.all(np.isfinite(values)):
+            bad = x[~np.isfinite(values)][0]
+            raise ValueError(
+                f"La función no es finita en x = {bad:.6g}; la aproximación de Chebyshev "
+                f"requiere una función continua en [{self.a}, {self.b}]."
+            )
+        return values
+
+    def _to_interval(self, t):
+        return (self.b + self.a) / 2 + (self.b - self.a) / 2 * t
+
+    @property
+    def degree(self):
+        return len(self.coefficients) - 1
+
+    @property
+    def nodes(self):
+        """Puntos de [a, b] donde se evaluó f, con sus valores."""
+        return self._to_interval(chebyshev_points(len(self.values) - 1)), self.values
+
+    def __call__(self, x):
+        """Evalúa el interpolante (Clenshaw) en x, escalar o arreglo."""
+        from numpy.polynomial import chebyshev as C
+
+        t = (2 * np.asarray(x, dtype=float) - (self.a + self.b)) / (self.b - self.a)
+        return C.chebval(t, self.coefficients)
+
+    def roots(self):
+        """
+        Raíces reales de f en [a, b], en orden creciente y sin repetir. Solo
+        son fiables si el interpolante convergió; si no, se lanza ValueError.
+        """
+        if not self.converged:
+            raise ValueError(
+                f"La función no se pudo representar con {len(self.values)} puntos de Chebyshev "
+                f"(no es suave en [{self.a}, {self.b}]); sus raíces no son fiables."
+            )
+        roots = np.sort(self._to_interval(_real_roots(self.coefficients, self.tol)))
+        if roots.size > 1:
+            # Una raíz doble o una raíz en el punto de corte aparece dos veces
+            keep = np.concatenate([[True], np.diff(roots) > 1e-7 * (self.b - self.a)])
+            roots = roots[keep]
+        return roots
+
+    def integral(self):
+        """Integral de f en [a, b] por Clenshaw-Curtis: ∫T_k = 2 / (1 - k²) para k par."""
+        k = np.arange(0, len(self.coefficients), 2)
+        weights = 2.0 / (1.0 - k ** 2)
+        return float(np.dot(self.coefficients[::2], weights) * (self.b - self.a) / 2)
+
+    def sample(self, num_points=1000):
+        """Valores del interpolante en una malla uniforme, para graficar."""
+        x = np.linspace(self.a, self.b, num_points)
+        return x, self(x)
+
+    def info(self):
+        return {
+            'degree': self.degree,
+            'converged': self.converged,
+            'evaluations': self.evaluations
+        }
@@ -0,0 +1,181 @@
+"""
+Caché persistente (SQLite) de ecuaciones compiladas.
+
+Guarda, por ecuación, la cadena preprocesada y el código fuente generado de
+sus funciones (f, derivadas, funciones fusionadas). Cualquier worker de
+cualquier servicio que apunte al mismo archivo puede reconstruir esas
+funciones con un `exec` en el espacio de nombres de NumPy, sin volver a
+pasar por el traductor de LaTeX ni por SymPy.
+
+Es opcional: solo se activa si la variable de entorno EQUATION_DISK_CACHE
+contiene la ruta del archivo. Es una caché de mejor esfuerzo; cualquier error
+de SQLite se registra y se trata como un fallo de caché. El archivo contiene
+código que se ejecuta al cargarlo, así que debe vivir en un volumen al que
+solo tengan acceso los servicios.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS equations (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    equation TEXT NOT NULL,
+    processed TEXT NOT NULL,
+    sources TEXT NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+def function_from_source(source):
+    """
+    Reconstruye una función a partir del código guardado. El espacio de nombres
+    es el mismo que usa lambdify(modules=['numpy']), que también cubre el
+    código del compilador rápido.
+    """
+    namespace = {}
+    exec("import numpy; from numpy import *; from numpy.linalg import *", namespace)
+    namespace.update({'I': 1j, 'Abs': abs, '_asarray': namespace['numpy'].asarray})
+    names_before = set(namespace)
+    exec(compile(source, '<compile_cache>', 'exec'), namespace)
+    defined = [name for name in namespace if name not in names_before]
+    if len(defined) != 1 or not callable(namespace[defined[0]]):
+        raise ValueError("El código guardado no define exactamente una función.")
+    func = namespace[defined[0]]
+    func.source = source
+    return func
+
+
+class DiskCompileCache:
+    """
+    Tabla SQLite con una fila por ecuación y versión del parser.
+
+    Cada servicio solo lee y escribe las filas de su versión, así que durante
+    un despliegue escalonado conviven las de la versión vieja y la nueva sin
+    pisarse. Las de versiones que ya nadie usa dejan de tocarse y salen por
+    antigüedad: al superar `max_entries` (en todo el archivo) se descartan las
+    filas usadas hace más tiempo.
+    """
+
+    def __init__(self, path, version, max_entries=10000):
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _connection(self):
+        # sqlite3 no admite compartir conexiones entre procesos (fork de gunicorn) ni hilos
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _key(self, equation):
+        return hashlib.sha256(f"{self.version}\0{equation}".encode('utf-8')).hexdigest()
+
+    def get(self, equation):
+        """Devuelve {'processed': str, 'sources': dict} o None si no está."""
+        key = self._key(equation)
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT processed, sources FROM equations WHERE key = ? AND version = ?", (key, self.version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE equations SET last_access = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"Caché en disco no disponible: {str(e)}")
+            return None
+
+        self.hits += 1
+        return {'processed': row[0], 'sources': json.loads(row[1])}
+
+    def put(self, equation, processed, sources):
+        """Guarda (o reemplaza) la entrada de la ecuación y aplica el límite de tamaño."""
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO equations (key, version, equation, processed, sources, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._key(equation), self.version, equation, processed, json.dumps(sources), time.time())
+            )
+            count = conn.execute("SELECT COUNT(*) FROM equations").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM equations WHERE key IN "
+                    "(SELECT key FROM equations ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"No se pudo escribir en la caché en disco: {str(e)}")
+
+    def clear(self):
+        """Borra las entradas de esta versión; las de otras versiones no se tocan."""
+        try:
+            self._connection().execute("DELETE FROM equations WHERE version = ?", (self.version,))
+        except sqlite3.Error as e:
+            logger.warning(f"No se pudo vaciar la caché en disco: {str(e)}")
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def info(self):
+        try:
+            size = self._connection().execute(
+                "SELECT COUNT(*) FROM equations WHERE version = ?", (self.version,)
+            ).fetchone()[0]
+        except sqlite3.Error:
+            size = None
+        return {
+            'path': self.path,
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'size': size,
+            'max_entries': self.max_entries
+        }
+
+
+_disk_cache = None
+_disk_cache_lock = threading.Lock()
+
+
+def get_disk_cache(version):
+    """
+    Devuelve la caché en disco configurada por EQUATION_DISK_CACHE (y
+    EQUATION_DISK_CACHE_MAX_ENTRIES), o None si no está activada.
+    """
+    global _disk_cache
+    path = os.environ.get('EQUATION_DISK_CACHE')
+    if not path:
+        return None
+    with _disk_cache_lock:
+        if _disk_cache is None or _disk_cache.path != path or _disk_cache.version != version:
+            max_entries = int(os.environ.get('EQUATION_DISK_CACHE_MAX_ENTRIES', 10000))
+            _disk_cache = DiskCompileCache(path, version, max_entries=max_entries)
+        return _disk_cache
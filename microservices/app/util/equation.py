@@ -1,203 +1,515 @@
-from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
+from microservices.app.util import latex_translator, expression_compiler, compile_cache, autodiff, polynomial
 
 import numpy as np
-import plotly
-import plotly.graph_objs as go
 import json
-import sympy as sp
-import re
+import os
+import hashlib
+import inspect
+import functools
+import threading
 import logging
+from collections import OrderedDict
 
-# Definir las transformaciones incluyendo 'convert_xor'
-transformations = (
-    standard_transformations +
-    (implicit_multiplication_application,) +
-    (convert_xor,)
-)
 # Configuración del logger
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
-def replace_integrals(eq):
-    """
-    Reemplaza expresiones de integrales definidas en LaTeX por la sintaxis de SymPy.
-    Por ejemplo, \int_{a}^{b} f(x) dx -> Integral(f(x), (x, a, b))
-    """
-    # Patrón para detectar \int_{a}^{b} f(x) dx
-    integral_pattern = r'\\int_\{([^}]+)\}\^{([^}]+)\}\s*([^\\]+?)\s*dx'
-    
-    # Función de reemplazo
-    def integral_replacer(match):
-        lower_limit = match.group(1).strip()
-        upper_limit = match.group(2).strip()
-        integrand = match.group(3).strip()
-        return f'Integral({integrand}, (x, {lower_limit}, {upper_limit}))'
-    
-    # Reemplazar todas las integrales encontradas
-    eq = re.sub(integral_pattern, integral_replacer, eq)
-    
-    return eq
-
-def replace_fractions(eq):
-    """
-    Reemplaza todas las instancias de \frac{a}{b} por (a)/(b).
-    Maneja múltiples y fracciones anidadas.
-    """
-    while '\\frac' in eq:
-        frac_start = eq.find('\\frac')
-        first_brace = eq.find('{', frac_start)
-        if first_brace == -1:
-            logger.error("Fracción malformada: No se encontró '{' después de '\\frac'.")
-            raise ValueError("Fracción malformada: No se encontró '{' después de '\\frac'.")
-
-        # Función para extraer el contenido dentro de las llaves
-        def extract_brace_content(s, start):
-            if s[start] != '{':
-                logger.error(f"Se esperaba '{{' en la posición {start}.")
-                return None, start
-            stack = 1
-            content = []
-            for i in range(start + 1, len(s)):
-                if s[i] == '{':
-                    stack += 1
-                    content.append(s[i])
-                elif s[i] == '}':
-                    stack -= 1
-                    if stack == 0:
-                        return ''.join(content), i
-                    else:
-                        content.append(s[i])
-                else:
-                    content.append(s[i])
-            logger.error("Fracción malformada: No se encontró '}' correspondiente.")
-            return None, start  # No matching closing brace
-
-        # Extraer el numerador
-        numerator, num_end = extract_brace_content(eq, first_brace)
-        if numerator is None:
-            raise ValueError("Fracción malformada: No se pudo extraer el numerador.")
-
-        # Encontrar la primera '{' después del numerador
-        denominator_start = eq.find('{', num_end)
-        if denominator_start == -1:
-            raise ValueError("Fracción malformada: Faltante '{' para el denominador.")
-
-        # Extraer el denominador
-        denominator, den_end = extract_brace_content(eq, denominator_start)
-        if denominator is None:
-            raise ValueError("Fracción malformada: No se pudo extraer el denominador.")
-
-        # Reemplazar \frac{numerador}{denominador} con (numerador)/(denominador)
-        frac_full = eq[frac_start:den_end + 1]
-        frac_replacement = f'({numerator})/({denominator})'
-        eq = eq.replace(frac_full, frac_replacement, 1)
-        logger.info(f"Reemplazado '{frac_full}' por '{frac_replacement}'.")
-
-    return eq
 def preprocess_equation(equation):
     """
-    Preprocesa la ecuación para manejar notación LaTeX, inserción de '*', reemplazo de '^' por '**', y reemplazo de \frac y \int.
+    Preprocesa la ecuación para manejar notación LaTeX, inserción de '*', reemplazo de '^' por '**', y reemplazo de \\frac y \\int.
+    La traducción se hace en una sola pasada (ver latex_translator).
     """
     eq = equation.strip()
-    logger.info(f"Ecuación original: {eq}")
-
-    # 1. Reemplazar \frac{a}{b} por (a)/(b)
-    eq = replace_fractions(eq)
-    logger.info(f"Ecuación después de reemplazar fracciones: {eq}")
-
-    # 2. Reemplazar \sqrt{...} por sqrt(...)
-    eq = re.sub(r'\\sqrt\{([^{}]+)\}', r'sqrt(\1)', eq)
-    logger.info(f"Ecuación después de reemplazar '\\sqrt{{...}}': {eq}")
-
-    # 3. Reemplazar otros comandos de LaTeX
-    eq = re.sub(r'\\left|\\right', '', eq)  # Eliminar \left y \right
-    eq = re.sub(r'\\cdot|\\times', '*', eq)  # Multiplicación
-    eq = re.sub(r'\\div', '/', eq)  # División
-    eq = re.sub(r'\\pi', 'pi', eq)  # Pi
-    eq = re.sub(r'\\ln', 'log', eq)  # Logaritmo natural
-    eq = re.sub(r'\\log', 'log10', eq)  # Logaritmo en base 10
-    eq = re.sub(r'\\exp\{([^{}]+)\}', r'exp(\1)', eq)  # Exponentes
-    eq = re.sub(r'\\sin', 'sin', eq)  # Seno
-    eq = re.sub(r'\\cos', 'cos', eq)  # Coseno
-    eq = re.sub(r'\\tan', 'tan', eq)  # Tangente
-    logger.info(f"Ecuación después de reemplazar otros comandos de LaTeX: {eq}")
-
-    # 4. Reemplazar integrales
-    eq = replace_integrals(eq)
-    logger.info(f"Ecuación después de reemplazar integrales: {eq}")
-
-    # 5. Reemplazar '{' y '}' por '(' y ')'
-    eq = eq.replace('{', '(').replace('}', ')')
-    logger.info(f"Ecuación después de reemplazar '{{}}' por '()': {eq}")
-
-    # 6. Insertar explícitamente '*' entre dígitos y letras o '(' con manejo de espacios
-    eq = re.sub(r'(\d)\s*([a-zA-Z(])', r'\1*\2', eq)
-    eq = re.sub(r'(\))\s*([a-zA-Z(])', r'\1*\2', eq)
-    logger.info(f"Ecuación después de insertar '*': {eq}")
-
-    # 7. Reemplazar '^' por '**' para exponentiación
-    eq = eq.replace('^', '**')
-    logger.info(f"Ecuación después de reemplazar '^' por '**': {eq}")
-
-    # Validar paréntesis balanceados
-    if eq.count('(') != eq.count(')'):
-        raise ValueError("Paréntesis desbalanceados en la ecuación.")
-
-    logger.info(f"Ecuación preprocesada: {eq}")
-    return eq
+    processed = latex_translator.translate_latex(eq)
+    logger.debug(f"Ecuación preprocesada: {eq} -> {processed}")
+    return processed
 
-def parse_equation(equation_str):
+@functools.lru_cache(maxsize=None)
+def _sympy_context():
+    """
+    Importa SymPy y arma lo necesario para parsear ecuaciones en x. Se hace
+    solo la primera vez que hace falta: las ecuaciones que resuelve el
+    compilador rápido (o la caché en disco) nunca cargan SymPy.
+    """
+    import sympy as sp
+    from sympy.parsing.sympy_parser import (
+        standard_transformations,
+        implicit_multiplication_application,
+        convert_xor
+    )
+
+    # Definir las transformaciones incluyendo 'convert_xor'
+    transformations = (
+        standard_transformations +
+        (implicit_multiplication_application,) +
+        (convert_xor,)
+    )
+    # Funciones y constantes permitidas al parsear ecuaciones en x
+    allowed_funcs = {
+        'E': sp.E,
+        'e': sp.E,
+        'ℯ': sp.E,
+        'exp': sp.exp,
+        'sin': sp.sin,
+        'cos': sp.cos,
+        'tan': sp.tan,
+        'log': sp.log,
+        'log10': sp.log,
+        'sqrt': sp.sqrt,
+        'abs': sp.Abs,
+        'pi': sp.pi,
+        'Integral': sp.Integral
+    }
+    return {
+        'transformations': transformations,
+        'ALLOWED_FUNCS': allowed_funcs,
+        'X_SYMBOL': sp.Symbol('x'),
+    }
+
+
+_LAZY_ATTRIBUTES = ('transformations', 'ALLOWED_FUNCS', 'X_SYMBOL')
+
+
+def __getattr__(name):
+    # Nombres públicos que dependen de SymPy: se construyen al pedirlos
+    if name in _LAZY_ATTRIBUTES:
+        return _sympy_context()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _sympy_parse(processed_eq):
+    from sympy.parsing.sympy_parser import parse_expr
+
+    context = _sympy_context()
+    return parse_expr(processed_eq, local_dict={'x': context['X_SYMBOL'], **context['ALLOWED_FUNCS']},
+                      transformations=context['transformations'])
+
+
+def _lambdify(expr):
+    import sympy as sp
+
+    return sp.lambdify(_sympy_context()['X_SYMBOL'], expr, modules=['numpy'], cse=True)
+
+
+class CompiledEquation:
+    """
+    Resultado compilado de una ecuación: la expresión SymPy, su función
+    lambdificada y los artefactos derivados (derivadas de cualquier orden).
+    Los artefactos se calculan bajo demanda y quedan guardados en la entrada.
+
+    Si la ecuación es elemental, `func` viene del compilador rápido y la
+    expresión SymPy solo se construye cuando alguien la pide (derivadas,
+    estimaciones de error).
+
+    `sources` guarda el código generado de cada función compilada para la
+    caché en disco; si la entrada viene de esa caché, las funciones se
+    reconstruyen desde ahí sin pasar por SymPy.
+    """
+
+    def __init__(self, source, processed, expr=None, func=None, sources=None, disk_cache=None):
+        self.source = source
+        self.processed = processed
+        self._expr = expr
+        self._derivative_exprs = {}
+        self._functions = {}
+        self.sources = dict(sources or {})
+        self._disk_cache = disk_cache
+        self.artifacts = {}
+        if func is not None:
+            self._remember('func', func)
+
+    def _remember(self, name, func):
+        self._functions[name] = func
+        source = getattr(func, 'source', None)
+        if source is None and self._disk_cache is not None:
+            try:
+                source = inspect.getsource(func)
+            except (OSError, TypeError):
+                source = None
+        if source is not None and self.sources.get(name) != source:
+            self.sources[name] = source
+            if self._disk_cache is not None:
+                self._disk_cache.put(self.source, self.processed, self.sources)
+
+    def _compiled_function(self, name, build):
+        """Devuelve la función `name`, cargándola del código guardado o construyéndola."""
+        func = self._functions.get(name)
+        if func is not None:
+            return func
+        source = self.sources.get(name)
+        if source is not None:
+            try:
+                func = compile_cache.function_from_source(source)
+                self._functions[name] = func
+                return func
+            except Exception as e:
+                logger.warning(f"Código en caché inválido para '{self.source}' ({name}): {str(e)}")
+                del self.sources[name]
+        func = build()
+        self._remember(name, func)
+        return func
+
+    @property
+    def expr(self):
+        """Expresión SymPy de la ecuación."""
+        if self._expr is None:
+            self._expr = _sympy_parse(self.processed)
+        return self._expr
+
+    @property
+    def func(self):
+        """Función f(x) evaluable con NumPy (sin envolver)."""
+        return self._compiled_function('func', lambda: _lambdify(self.expr))
+
+    def derivative_expr(self, order=1):
+        """Expresión SymPy de la derivada de orden `order`."""
+        if order not in self._derivative_exprs:
+            import sympy as sp
+
+            self._derivative_exprs[order] = sp.diff(self.expr, _sympy_context()['X_SYMBOL'], order)
+        return self._derivative_exprs[order]
+
+    def derivative_func(self, order=1):
+        """Derivada de orden `order` lambdificada con NumPy."""
+        return self._compiled_function(f'derivative:{order}', lambda: _lambdify(self.derivative_expr(order)))
+
+    def fused_func(self, order=1):
+        """
+        Función única que devuelve [f, f', ..., f^(order)] en una sola llamada.
+        La expresión y sus derivadas se lambdifican juntas con eliminación de
+        subexpresiones comunes (cse), así los términos compartidos se calculan
+        una sola vez por evaluación.
+        """
+        def build():
+            exprs = [self.expr] + [self.derivative_expr(k) for k in range(1, order + 1)]
+            return _lambdify(exprs)
+
+        return self._compiled_function(f'fused:{order}', build)
+
+    def dual_func(self):
+        """
+        Función que devuelve (f, f') en una sola llamada mediante
+        diferenciación automática en modo directo (ver autodiff), sin SymPy.
+        Si la expresión está fuera de la gramática del compilador rápido se
+        usa fused_func(1).
+        """
+        if 'dual' not in self._functions and 'dual' not in self.sources:
+            try:
+                expression_compiler.parse_expression(self.processed)
+            except expression_compiler.UnsupportedExpression as e:
+                logger.debug(f"Sin diferenciación automática para '{self.source}': {str(e)}")
+                return self.fused_func(1)
+        return self._compiled_function('dual', lambda: autodiff.compile_value_and_derivative(self.processed))
+
+
+    def polynomial_coefficients(self):
+        """
+        Coeficientes del polinomio (mayor grado primero) o None si la
+        ecuación no es polinómica. Se calcula una sola vez por entrada.
+        """
+        if 'polynomial' not in self.artifacts:
+            self.artifacts['polynomial'] = polynomial.polynomial_coefficients(
+                self.expr, _sympy_context()['X_SYMBOL']
+            )
+        return self.artifacts['polynomial']
+
+
+class ExpressionCache:
+    """
+    Caché LRU de ecuaciones compiladas, compartida por todo el proceso.
+
+    La clave es la ecuación normalizada; al superar `maxsize` entradas se
+    descarta la usada hace más tiempo.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_create(self, key, factory):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # El parseo se hace fuera del lock para no bloquear otros hilos
+        entry = factory()
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+
+# Cambiar PARSER_VERSION cuando cambie el formato de las entradas de la caché
+# en disco. Los cambios en el preprocesado o en el código generado ya las
+# invalidan solos: la versión incluye un hash del código de los módulos que
+# lo producen.
+PARSER_VERSION = '1'
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_version():
+    # El código que genera lambdify depende además de la versión de SymPy
+    import sys
+    from importlib.metadata import version
+
+    digest = hashlib.sha256()
+    for module in (latex_translator, expression_compiler, autodiff, sys.modules[__name__]):
+        digest.update(inspect.getsource(module).encode('utf-8'))
+    return f"{PARSER_VERSION}/{digest.hexdigest()[:16]}/sympy-{version('sympy')}"
+
+
+def _get_disk_cache():
+    if not os.environ.get('EQUATION_DISK_CACHE'):
+        return None
+    return compile_cache.get_disk_cache(_cache_version())
+
+_expression_cache = ExpressionCache(maxsize=int(os.environ.get('EQUATION_CACHE_SIZE', 256)))
+
+
+def normalize_equation(equation_str):
+    """Normaliza la ecuación para usarla como clave de la caché."""
+    return equation_str.strip()
+
+
+def get_compiled_equation(equation_str):
+    """
+    Devuelve la ecuación compilada desde la caché, parseándola solo si no
+    estaba. Los errores de parseo no se guardan en la caché.
+    """
+    key = normalize_equation(equation_str)
+
+    def build():
+        disk_cache = _get_disk_cache()
+        if disk_cache is not None:
+            record = disk_cache.get(key)
+            if record is not None and 'func' in record['sources']:
+                return CompiledEquation(key, record['processed'], sources=record['sources'],
+                                        disk_cache=disk_cache)
+
+        processed_eq = preprocess_equation(key)
+        try:
+            func = expression_compiler.compile_expression(processed_eq)
+        except expression_compiler.UnsupportedExpression:
+            # Construcciones que solo entiende SymPy (Integral, multiplicación implícita, ...)
+            entry = CompiledEquation(key, processed_eq, expr=_sympy_parse(processed_eq),
+                                     disk_cache=disk_cache)
+            if disk_cache is not None:
+                try:
+                    entry.func
+                except Exception:
+                    # Sin código que guardar (p. ej. Integral); la entrada sigue siendo válida
+                    pass
+            return entry
+        return CompiledEquation(key, processed_eq, func=func, disk_cache=disk_cache)
+
+    return _expression_cache.get_or_create(key, build)
+
+
+def clear_expression_cache():
+    """Vacía la caché de ecuaciones compiladas y reinicia sus contadores."""
+    _expression_cache.clear()
+
+
+def expression_cache_info():
+    """Estadísticas de la caché: aciertos, fallos, desalojos y tamaño."""
+    info = _expression_cache.info()
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        info['disk'] = disk_cache.info()
+    return info
+
+
+def make_safe_function(f_original):
+    """
+    Envuelve una función lambdificada para que los puntos donde no se puede
+    evaluar (desbordamientos, fuera del dominio, divisiones por cero) den inf
+    en lugar de lanzar una excepción.
+
+    Los arreglos se evalúan con una sola llamada vectorizada bajo
+    np.errstate y luego se enmascaran los valores no finitos; los escalares
+    siguen un camino directo sin maquinaria de arreglos.
+    """
+    def safe_scalar(val):
+        try:
+            with np.errstate(all='ignore'):
+                result = f_original(float(val))
+            result = float(result)
+        except Exception:
+            return np.inf
+        return result if np.isfinite(result) else np.inf
+
+    def safe_f(val):
+        if np.isscalar(val):
+            return safe_scalar(val)
+
+        x = np.asarray(val, dtype=float)
+        try:
+            with np.errstate(all='ignore'):
+                result = np.asarray(f_original(x))
+            if np.iscomplexobj(result):
+                result = np.where(result.imag == 0, result.real, np.inf)
+            # Las expresiones constantes devuelven un escalar
+            result = np.array(np.broadcast_to(result, x.shape), dtype=float)
+        except Exception:
+            # Respaldo punto a punto si la evaluación vectorizada falla
+            result = np.array([safe_scalar(v) for v in x.ravel()], dtype=float).reshape(x.shape)
+
+        result[~np.isfinite(result)] = np.inf
+        return result
+
+    return safe_f
+
+
+def make_safe_fused_function(fused, order):
+    """
+    Envuelve una función fusionada (ver CompiledEquation.fused_func) para que
+    devuelva una tupla (f, f', ..., f^(order)) de flotantes o de arreglos.
+    Como en make_safe_function, los valores no finitos de f pasan a inf; las
+    derivadas se devuelven tal cual, igual que en parse_derivative_equation.
+    """
+    def safe_scalar(val):
+        try:
+            with np.errstate(all='ignore'):
+                values = [complex(v) for v in fused(float(val))]
+        except Exception:
+            return (np.inf,) + (np.nan,) * order
+        values = [v.real if v.imag == 0 else np.nan for v in values]
+        if not np.isfinite(values[0]):
+            values[0] = np.inf
+        return tuple(values)
+
+    def safe_fused(val):
+        if np.isscalar(val):
+            return safe_scalar(val)
+
+        x = np.asarray(val, dtype=float)
+        with np.errstate(all='ignore'):
+            values = fused(x)
+        result = []
+        for v in values:
+            v = np.asarray(v)
+            if np.iscomplexobj(v):
+                v = np.where(v.imag == 0, v.real, np.nan)
+            # Las derivadas constantes devuelven un escalar
+            result.append(np.array(np.broadcast_to(v, x.shape), dtype=float))
+        result[0][~np.isfinite(result[0])] = np.inf
+        return tuple(result)
+
+    return safe_fused
+
+
+DERIVATIVE_MODES = ('symbolic', 'autodiff')
+
+
+def parse_fused_equation(equation_str, order=1, derivative='symbolic'):
+    """
+    Devuelve una función que evalúa f y sus derivadas hasta `order` en una
+    sola llamada: fused(x) -> (f(x), f'(x), ..., f^(order)(x)).
+    Se valida igual que parse_derivative_equation (derivadas finitas en x=±1).
+
+    Con derivative='autodiff' (solo order=1) la derivada se obtiene por
+    diferenciación automática en modo directo en lugar de sp.diff.
+    """
+    try:
+        if not equation_str:
+            raise ValueError("La ecuación no puede estar vacía.")
+        if derivative not in DERIVATIVE_MODES:
+            raise ValueError(f"Modo de derivada desconocido: {derivative}.")
+        if derivative == 'autodiff' and order != 1:
+            raise ValueError("La diferenciación automática solo calcula la primera derivada.")
+
+        compiled = get_compiled_equation(equation_str.replace('Math.', ''))
+        key = ('safe_fused', order, derivative)
+        fused = compiled.artifacts.get(key)
+        if fused is None:
+            raw = compiled.dual_func() if derivative == 'autodiff' else compiled.fused_func(order)
+            fused = make_safe_fused_function(raw, order)
+            for test_x in [-1.0, 1.0]:
+                derivatives = fused(test_x)[1:]
+                if not all(np.isfinite(d) for d in derivatives):
+                    raise ValueError(f"La derivada de la función no es finita en x={test_x}.")
+            compiled.artifacts[key] = fused
+        return fused
+
+    except Exception as e:
+        logger.error(f"Error al procesar la derivada de la ecuación: {str(e)}")
+        raise ValueError(f"Error al procesar la derivada de la ecuación: {str(e)}")
+
+
+def parse_polynomial(equation_str):
+    """
+    Devuelve los coeficientes de la ecuación si es un polinomio en x (del
+    término de mayor grado al independiente) o None si no lo es.
+    """
+    try:
+        if not equation_str:
+            raise ValueError("La ecuación no puede estar vacía.")
+        return get_compiled_equation(equation_str.replace('Math.', '')).polynomial_coefficients()
+    except Exception as e:
+        logger.error(f"Error al procesar la ecuación: {str(e)}")
+        raise ValueError(f"Error al procesar la ecuación: {str(e)}")
+
+
+def parse_function(equation_str):
+    """
+    Devuelve solo la función segura f(x) de la ecuación, sin construir la
+    expresión SymPy cuando el compilador rápido puede manejarla.
+    """
     try:
         if not equation_str:
             raise ValueError("La ecuación no puede estar vacía.")
 
         equation_str = equation_str.replace('Math.', '')
-        processed_eq = preprocess_equation(equation_str)
-
-        x = sp.Symbol('x')
-
-        allowed_funcs = {
-            'E': sp.E,
-            'e': sp.E,
-            'ℯ': sp.E,
-            'exp': sp.exp,
-            'sin': sp.sin,
-            'cos': sp.cos,
-            'tan': sp.tan,
-            'log': sp.log,
-            'log10': sp.log,
-            'sqrt': sp.sqrt,
-            'abs': sp.Abs,
-            'pi': sp.pi,
-            'Integral': sp.Integral
-        }
-
-        expr = parse_expr(processed_eq, local_dict={'x': x, **allowed_funcs}, transformations=transformations)
-        f_original = sp.lambdify(x, expr, modules=['numpy'])
-
-        # Función segura para manejar evaluaciones
-        def safe_f(val):
-            try:
-                result = f_original(val)
-                if np.isfinite(result):
-                    return result
-                return np.inf
-            except OverflowError:
-                return np.inf
-            except Exception:
-                return np.inf
+        compiled = get_compiled_equation(equation_str)
 
-        # Vectorizar la función segura sin causar recursión
-        f = np.vectorize(safe_f)
+        f = compiled.artifacts.get('safe_f')
+        if f is None:
+            f = make_safe_function(compiled.func)
+            compiled.artifacts['safe_f'] = f
+        return f
 
-        return expr, f
+    except Exception as e:
+        logger.error(f"Error al procesar la ecuación: {str(e)}")
+        raise ValueError(f"Error al procesar la ecuación: {str(e)}")
+
+def parse_equation(equation_str):
+    f = parse_function(equation_str)
+    try:
+        compiled = get_compiled_equation(equation_str.replace('Math.', ''))
+        return compiled.expr, f
 
     except Exception as e:
         logger.error(f"Error al procesar la ecuación: {str(e)}")
@@ -211,30 +523,10 @@ def parse_derivative_equation(equation_str):
         if not equation_str:
             raise ValueError("La ecuación no puede estar vacía.")
 
-        processed_eq = preprocess_equation(equation_str)
-        logger.info(f"Ecuación preprocesada para derivada: {processed_eq}")
-
-        x = sp.Symbol('x')
-
-        allowed_funcs = {
-            'E': sp.E,
-            'e': sp.E,
-            'ℯ': sp.E,
-            'exp': sp.exp,
-            'sin': sp.sin,
-            'cos': sp.cos,
-            'tan': sp.tan,
-            'log': sp.log,
-            'log10': sp.log,
-            'sqrt': sp.sqrt,
-            'abs': sp.Abs,
-            'pi': sp.pi,
-            'Integral': sp.Integral
-        }
-
-        expr = parse_expr(processed_eq, local_dict={'x': x, **allowed_funcs}, transformations=transformations)
-        derivative_expr = sp.diff(expr, x)
-        fprime = sp.lambdify(x, derivative_expr, modules=['numpy'])
+        compiled = get_compiled_equation(equation_str)
+        logger.info(f"Ecuación preprocesada para derivada: {compiled.processed}")
+
+        fprime = compiled.derivative_func(1)
 
         # Prueba de evaluación de la derivada (excluyendo x=0.0)
         test_points = [-1.0, 1.0]  # Excluye x=0.0
@@ -259,50 +551,223 @@ def parse_g_function(g_func_str):
         if not g_func_str:
             raise ValueError("La función g(x) no puede estar vacía.")
 
-        processed_g_func = preprocess_equation(g_func_str)
-        logger.info(f"Función g(x) preprocesada: {processed_g_func}")
-
-        x = sp.Symbol('x')
-
-        allowed_funcs = {
-            'E': sp.E,
-            'e': sp.E,
-            'ℯ': sp.E,
-            'exp': sp.exp,
-            'sin': sp.sin,
-            'cos': sp.cos,
-            'tan': sp.tan,
-            'log': sp.log,
-            'log10': sp.log,
-            'sqrt': sp.sqrt,
-            'abs': sp.Abs,
-            'pi': sp.pi,
-            'Integral': sp.Integral
-        }
-
-        expr = parse_expr(processed_g_func, local_dict={'x': x, **allowed_funcs}, transformations=transformations)
-        g = sp.lambdify(x, expr, modules=['numpy'])
-
-        return g
+        compiled = get_compiled_equation(g_func_str)
+        logger.info(f"Función g(x) preprocesada: {compiled.processed}")
+
+        return compiled.func
     except Exception as e:
         logger.error(f"Error al procesar la función g(x): {str(e)}")
         raise ValueError(f"Error al procesar la función g(x): {str(e)}")
 
+def _bracket(a, b, kind):
+    return {'a': float(a), 'b': float(b), 'kind': kind}
+
+
+def _sign_changes(f_vals):
+    """Índices i con signos opuestos (y finitos) en f_vals[..., i] y f_vals[..., i + 1]."""
+    finite = np.isfinite(f_vals)
+    sign = np.sign(f_vals)
+    return finite[..., :-1] & finite[..., 1:] & (sign[..., :-1] * sign[..., 1:] < 0)
+
+
+def _narrow_crossings(f, lo, hi, f_lo, f_hi, steps=5):
+    """
+    Aplica `steps` pasos de bisección vectorizada a todos los intervalos con
+    cambio de signo a la vez. En una raíz el mayor |f| de los extremos
+    disminuye; en un polo (tan, 1/x) crece o aparece un valor no finito, así
+    que esos intervalos se descartan.
+
+    Returns:
+        tuple: (máscara de raíces, lo, hi, evaluaciones)
+    """
+    initial = np.maximum(np.abs(f_lo), np.abs(f_hi))
+    valid = np.ones(lo.shape, dtype=bool)
+    for _ in range(steps):
+        mid = 0.5 * (lo + hi)
+        f_mid = np.asarray(f(mid), dtype=float)
+        valid &= np.isfinite(f_mid)
+        left = np.sign(f_mid) == np.sign(f_lo)
+        lo, f_lo = np.where(left, mid, lo), np.where(left, f_mid, f_lo)
+        hi, f_hi = np.where(left, hi, mid), np.where(left, f_hi, f_mid)
+        # Raíz exacta en el punto medio: el intervalo se reduce a ese punto
+        hit = f_mid == 0
+        lo, hi = np.where(hit, mid, lo), np.where(hit, mid, hi)
+        f_lo, f_hi = np.where(hit, 0.0, f_lo), np.where(hit, 0.0, f_hi)
+    valid &= np.maximum(np.abs(f_lo), np.abs(f_hi)) < initial
+    return valid, lo, hi, steps * lo.size
+
+
+def _refine_minima(f, lo, hi, scale, refine_points, refine_rounds, touch_tol):
+    """
+    Acerca en paralelo cada ventana [lo, hi] al mínimo de |f|. Si aparece un
+    cambio de signo (dos raíces cercanas) se devuelven esos intervalos; si el
+    mínimo llega a ser prácticamente cero, la ventana final se marca como
+    raíz de multiplicidad par ('touch').
+    """
+    brackets = []
+    evaluations = 0
+    t = np.linspace(0.0, 1.0, refine_points)
+    abs_min = np.full(lo.shape, np.inf)
+    for _ in range(refine_rounds):
+        if lo.size == 0:
+            break
+        x_vals = lo[:, None] + (hi - lo)[:, None] * t
+        f_vals = np.asarray(f(x_vals), dtype=float)
+        evaluations += x_vals.size
+
+        crossing = _sign_changes(f_vals)
+        exact = np.isfinite(f_vals) & (f_vals == 0)
+        for row, col in zip(*np.nonzero(crossing)):
+            brackets.append(_bracket(x_vals[row, col], x_vals[row, col + 1], 'sign_change'))
+        for row, col in zip(*np.nonzero(exact)):
+            brackets.append(_bracket(x_vals[row, col], x_vals[row, col], 'exact'))
+
+        # Las ventanas sin raíz encontrada se reducen alrededor de su mínimo
+        pending = ~(crossing.any(axis=1) | exact.any(axis=1))
+        abs_vals = np.where(np.isfinite(f_vals), np.abs(f_vals), np.inf)[pending]
+        x_vals = x_vals[pending]
+        rows = np.arange(x_vals.shape[0])
+        best = np.argmin(abs_vals, axis=1)
+        abs_min = abs_vals[rows, best]
+        lo = x_vals[rows, np.maximum(best - 1, 0)]
+        hi = x_vals[rows, np.minimum(best + 1, refine_points - 1)]
+
+    for a, b, value in zip(lo, hi, abs_min):
+        if value <= touch_tol * scale:
+            brackets.append(_bracket(a, b, 'touch'))
+    return brackets, evaluations
+
+
+def _grid_brackets(f, x_vals, f_vals, near_zero, refine_points, refine_rounds, touch_tol):
+    """Intervalos con raíz en una malla ya evaluada y evaluaciones extra gastadas."""
+    brackets = []
+    evaluations = 0
+
+    crossing = np.flatnonzero(_sign_changes(f_vals))
+    if crossing.size:
+        kept, lo, hi, spent = _narrow_crossings(
+            f, x_vals[crossing], x_vals[crossing + 1], f_vals[crossing], f_vals[crossing + 1]
+        )
+        evaluations += spent
+        for a, b in zip(lo[kept], hi[kept]):
+            brackets.append(_bracket(a, b, 'exact' if a == b else 'sign_change'))
+
+    exact = np.flatnonzero(np.isfinite(f_vals) & (f_vals == 0))
+    for i in exact:
+        brackets.append(_bracket(x_vals[i], x_vals[i], 'exact'))
+
+    # Mínimos locales de |f| cercanos a cero que no están junto a una raíz ya encontrada
+    abs_vals = np.where(np.isfinite(f_vals), np.abs(f_vals), np.inf)
+    finite_abs = abs_vals[np.isfinite(abs_vals)]
+    if finite_abs.size == 0 or x_vals.size < 3:
+        return brackets, evaluations
+    scale = max(1.0, float(np.median(finite_abs)))
+    inner = np.arange(1, x_vals.size - 1)
+    is_min = (abs_vals[inner] < abs_vals[inner - 1]) & (abs_vals[inner] <= abs_vals[inner + 1]) \
+        & (abs_vals[inner] <= near_zero * scale) & (abs_vals[inner] > 0)
+    near_root = np.zeros(x_vals.size, dtype=bool)
+    near_root[crossing] = near_root[crossing + 1] = True
+    candidates = inner[is_min & ~near_root[inner - 1] & ~near_root[inner + 1]]
+    if candidates.size:
+        refined, spent = _refine_minima(
+            f, x_vals[candidates - 1], x_vals[candidates + 1], scale,
+            refine_points, refine_rounds, touch_tol
+        )
+        brackets.extend(refined)
+        evaluations += spent
+    return brackets, evaluations
+
+
+def find_valid_intervals(f, start=-10, end=10, num_points=1000, max_expansions=4, growth=4.0,
+                         near_zero=1e-2, refine_points=32, refine_rounds=4, touch_tol=1e-10):
+    """
+    Busca todos los intervalos de [start, end] que contienen una raíz de f.
+
+    La malla se evalúa con una sola llamada vectorizada (f debe aceptar
+    arreglos, como las funciones de parse_function). Si no se encuentra
+    ninguna raíz, la ventana se amplía geométricamente (`growth` veces su
+    ancho, hasta `max_expansions` veces) evaluando solo las franjas nuevas.
+    Los mínimos locales de |f| cercanos a cero se refinan localmente para
+    separar raíces muy próximas y detectar raíces de multiplicidad par, que
+    no producen cambio de signo.
+
+    Returns:
+        tuple: (brackets, evaluations). `brackets` es la lista ordenada de
+        diccionarios {'a', 'b', 'kind'}, donde kind es 'sign_change' (apto
+        para bisección), 'exact' (f(a) == 0, con a == b) o 'touch' (|f| ~ 0
+        sin cambio de signo). `evaluations` es el número de evaluaciones de f.
+    """
+    brackets = []
+    evaluations = 0
+    lo, hi = float(start), float(end)
+    segments = [(lo, hi)]
+    for _ in range(max_expansions + 1):
+        for seg_start, seg_end in segments:
+            x_vals = np.linspace(seg_start, seg_end, num_points)
+            f_vals = np.asarray(f(x_vals), dtype=float)
+            evaluations += num_points
+            found, spent = _grid_brackets(f, x_vals, f_vals, near_zero, refine_points, refine_rounds, touch_tol)
+            brackets.extend(found)
+            evaluations += spent
+        if brackets:
+            break
+        margin = (hi - lo) * (growth - 1) / 2
+        segments = [(lo - margin, lo), (hi, hi + margin)]
+        lo, hi = lo - margin, hi + margin
+
+    brackets.sort(key=lambda bracket: (bracket['a'], bracket['b']))
+    return brackets, evaluations
+
+
 def find_valid_interval(f, start=-10, end=10, num_points=1000):
     """
     Encuentra un intervalo válido [a, b] donde f(a) y f(b) tengan signos opuestos.
     """
-    x_vals = np.linspace(start, end, num_points)
-    f_vals = np.array([f(x) for x in x_vals])
+    brackets, _ = find_valid_intervals(f, start, end, num_points)
+    for bracket in brackets:
+        if bracket['kind'] == 'sign_change':
+            return bracket['a'], bracket['b']
+    raise ValueError("No se encontró un intervalo válido donde la función cambie de signo.")
+
+
+def sample_function(f, x_vals, limit=None):
+    """
+    Evalúa f en la malla de una gráfica con una sola llamada vectorizada.
+
+    Los puntos no finitos, y con `limit` los de |f| > limit, quedan como NaN
+    para que la curva se corte ahí. Se debe pasar la función sin contador
+    (no el CountingEvaluator): las muestras de la gráfica no son
+    evaluaciones del método.
+    """
+    x_vals = np.asarray(x_vals, dtype=float)
+    try:
+        with np.errstate(all='ignore'):
+            y_vals = np.asarray(f(x_vals))
+        if np.iscomplexobj(y_vals):
+            y_vals = np.where(y_vals.imag == 0, y_vals.real, np.nan)
+        # Las expresiones constantes devuelven un escalar
+        y_vals = np.array(np.broadcast_to(y_vals, x_vals.shape), dtype=float)
+    except Exception:
+        # Respaldo punto a punto si la evaluación vectorizada falla
+        y_vals = np.empty(x_vals.shape)
+        for i, x in enumerate(x_vals):
+            try:
+                with np.errstate(all='ignore'):
+                    y_vals[i] = float(f(x))
+            except Exception:
+                y_vals[i] = np.nan
+
+    invalid = ~np.isfinite(y_vals)
+    if limit is not None:
+        invalid |= np.abs(y_vals) > limit
+    y_vals[invalid] = np.nan
+    return y_vals
 
-    sign_changes = np.where(np.diff(np.sign(f_vals)))[0]
-    if sign_changes.size > 0:
-        index = sign_changes[0]
-        return x_vals[index], x_vals[index + 1]
-    else:
-        raise ValueError("No se encontró un intervalo válido donde la función cambie de signo.")
 
 def render_integration_plot(f, a, b, n, method, extra_shapes):
+    import plotly
+    import plotly.graph_objs as go
+
     x_vals = np.linspace(a, b, 1000)
     y_vals = f(x_vals)
 
@@ -339,11 +804,48 @@ def render_integration_plot(f, a, b, n, method, extra_shapes):
     fig = go.Figure(data=data_traces, layout=layout)
     return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
 
+def _lambdify_system(variables, exprs):
+    """
+    Lambdifica una lista (o matriz) de expresiones en las variables como una
+    sola función de NumPy con cse. Devuelve g(x) -> arreglo de flotantes; las
+    entradas complejas pasan a nan.
+    """
+    import sympy as sp
+
+    raw = sp.lambdify(list(variables), exprs, modules=['numpy'], cse=True)
+
+    def g(x):
+        with np.errstate(all='ignore'):
+            values = np.asarray(raw(*np.asarray(x, dtype=float)))
+            if np.iscomplexobj(values):
+                values = np.where(values.imag == 0, values.real, np.nan)
+        return values.astype(float)
+
+    return g
+
+
 def evaluate_system(equations, variables):
-    def F(x):
-        subs = {var: val for var, val in zip(variables, x)}
-        return np.array([float(eq.evalf(subs=subs)) for eq in equations], dtype=float)
-    return F
+    """
+    Devuelve F(x), el vector de residuos del sistema. Todas las ecuaciones se
+    lambdifican juntas una sola vez; cada llamada es una evaluación de NumPy.
+
+    Args:
+        equations: Lista de expresiones SymPy (cada una igualada a cero).
+        variables: Lista de símbolos SymPy que representan las variables.
+    """
+    return _lambdify_system(variables, list(equations))
+
+
+def compute_jacobian_function(equations, variables):
+    """
+    Devuelve J(x), la matriz Jacobiana del sistema como una sola función
+    lambdificada (la matriz simbólica se deriva una vez).
+    """
+    import sympy as sp
+
+    jacobian = sp.Matrix(list(equations)).jacobian(list(variables))
+    return _lambdify_system(variables, jacobian.tolist())
+
 
 def compute_initial_jacobian(equations, variables, x0):
     """
@@ -357,15 +859,100 @@ def compute_initial_jacobian(equations, variables, x0):
     Returns:
         J_initial: Matriz Jacobiana evaluada en x0.
     """
-    J = []
-    for eq in equations:
-        row = []
-        for var in variables:
-            derivative = sp.diff(eq, var)
-            derivative_func = sp.lambdify(variables, derivative, modules=['numpy'])
-            row.append(derivative_func(*x0))
-        J.append(row)
-    return np.array(J, dtype=float)
+    return compute_jacobian_function(equations, variables)(x0)
+
+
+class CompiledSystem:
+    """
+    Sistema no lineal F(x) = 0 parseado una sola vez. El vector de residuos
+    y la Jacobiana se lambdifican bajo demanda y quedan guardados en la
+    entrada, igual que los artefactos de CompiledEquation.
+    """
+
+    def __init__(self, equations, variables, exprs, symbols):
+        self.equations = equations
+        self.variables = variables
+        self.exprs = exprs
+        self.symbols = symbols
+        self._functions = {}
+        self.artifacts = {}
+
+    def _function(self, name, build):
+        func = self._functions.get(name)
+        if func is None:
+            func = build()
+            self._functions[name] = func
+        return func
+
+    @property
+    def residual(self):
+        """F(x) -> arreglo de n residuos."""
+        return self._function('residual', lambda: evaluate_system(self.exprs, self.symbols))
+
+    @property
+    def jacobian(self):
+        """J(x) -> matriz densa n x n."""
+        return self._function('jacobian', lambda: compute_jacobian_function(self.exprs, self.symbols))
+
+    @property
+    def sparsity(self):
+        """
+        Patrón de no ceros de la Jacobiana, deducido de las variables que
+        aparecen en cada ecuación: (filas, columnas) como arreglos de índices.
+        """
+        pattern = self.artifacts.get('sparsity')
+        if pattern is None:
+            index = {symbol: j for j, symbol in enumerate(self.symbols)}
+            rows, cols = [], []
+            for i, expr in enumerate(self.exprs):
+                columns = sorted(index[symbol] for symbol in expr.free_symbols)
+                rows.extend([i] * len(columns))
+                cols.extend(columns)
+            pattern = (np.array(rows, dtype=int), np.array(cols, dtype=int))
+            self.artifacts['sparsity'] = pattern
+        return pattern
+
+
+def _parse_system(equations, variables):
+    import sympy as sp
+    from sympy.parsing.sympy_parser import parse_expr
+
+    context = _sympy_context()
+    symbols = [sp.Symbol(name) for name in variables]
+    local_dict = {**context['ALLOWED_FUNCS'], **dict(zip(variables, symbols))}
+    exprs = []
+    for equation in equations:
+        sides = equation.split('=')
+        if len(sides) > 2:
+            raise ValueError(f"Ecuación inválida: {equation}")
+        processed = ' - '.join(f"({preprocess_equation(side)})" for side in sides)
+        expr = parse_expr(processed, local_dict=local_dict, transformations=context['transformations'])
+        unknown = expr.free_symbols - set(symbols)
+        if unknown:
+            names = ', '.join(sorted(str(symbol) for symbol in unknown))
+            raise ValueError(f"Símbolos desconocidos en '{equation}': {names}")
+        exprs.append(expr)
+    return exprs, symbols
+
+
+def get_compiled_system(equations, variables):
+    """
+    Devuelve el sistema compilado desde la caché de expresiones. Cada
+    ecuación puede tener la forma 'lhs = rhs' o ser una expresión igualada a
+    cero; `variables` son los nombres de las incógnitas, en orden.
+    """
+    equations = tuple(normalize_equation(equation) for equation in equations)
+    variables = tuple(name.strip() for name in variables)
+    if not equations or len(equations) != len(variables):
+        raise ValueError("El sistema debe tener tantas ecuaciones como variables.")
+    if len(set(variables)) != len(variables):
+        raise ValueError("Las variables no pueden repetirse.")
+
+    def build():
+        exprs, symbols = _parse_system(equations, variables)
+        return CompiledSystem(equations, variables, exprs, symbols)
+
+    return _expression_cache.get_or_create(('system', equations, variables), build)
 
 
 def parse_equations(equations, variables):
@@ -379,6 +966,8 @@ def parse_equations(equations, variables):
     Returns:
         tuple: Matriz de coeficientes A y vector de términos independientes b
     """
+    import sympy as sp
+
     A = []
     b = []
     var_symbols = sp.symbols(variables)
@@ -0,0 +1,60 @@
+"""
+Evaluador con memoria y contador, compartido por los métodos de búsqueda de
+raíces y sus controladores.
+
+Envuelve la función de la ecuación (f, g o la función fusionada de Newton)
+durante una petición: las evaluaciones escalares se guardan en una caché LRU
+acotada cuya clave es el valor exacto del flotante, así los puntos que el
+método, el historial y la gráfica vuelven a pedir no se recalculan. Cada
+punto realmente evaluado se cuenta en `evaluations`; los arreglos se evalúan
+de forma vectorizada y cuentan un punto por elemento, igual que los
+valores complejos (raíces de polinomios), que no pasan por la caché.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+
+class CountingEvaluator:
+    """
+    Envuelve f para contar y memorizar sus evaluaciones durante una petición.
+
+    `evaluations` es el número de puntos realmente evaluados (los escalares
+    repetidos salen de la caché y suman a `hits`). `f` sigue disponible sin
+    contador para lo que no es parte del método, como la malla de la gráfica
+    (ver equation.sample_function).
+    """
+
+    def __init__(self, f, maxsize=1024):
+        self.f = f
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self.evaluations = 0
+        self.hits = 0
+
+    def __call__(self, x):
+        if np.iscomplexobj(x):
+            x = np.asarray(x)
+            self.evaluations += x.size
+            return self.f(x)
+        if np.ndim(x) != 0:
+            x = np.asarray(x, dtype=float)
+            self.evaluations += x.size
+            return self.f(x)
+
+        key = float(x)
+        cache = self._cache
+        if key in cache:
+            cache.move_to_end(key)
+            self.hits += 1
+            return cache[key]
+
+        value = self.f(key)
+        self.evaluations += 1
+        cache[key] = value
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return value
+
+    def info(self):
+        return {'evaluations': self.evaluations, 'hits': self.hits, 'size': len(self._cache)}
@@ -0,0 +1,175 @@
+"""
+Compilador ligero de expresiones elementales en x a funciones de NumPy.
+
+Evita pasar por `parse_expr` y `lambdify` de SymPy para las entradas más
+comunes (polinomios y combinaciones de sin, cos, tan, exp, log, sqrt y abs).
+La cadena preprocesada se analiza con el módulo `ast` de Python, se valida
+contra una gramática restringida y se genera directamente el código de la
+función. Cualquier construcción fuera de esa gramática (Integral, símbolos
+desconocidos, multiplicación implícita, ...) lanza UnsupportedExpression para
+que el llamador use el camino de SymPy.
+"""
+import ast
+
+import numpy as np
+
+# Funciones permitidas y su equivalente en NumPy (mismo mapeo que ALLOWED_FUNCS)
+_FUNCTIONS = {
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'exp': np.exp,
+    'log': np.log,
+    'log10': np.log,
+    'sqrt': np.sqrt,
+    'abs': np.abs,
+}
+
+_CONSTANTS = {
+    'pi': np.pi,
+    'e': np.e,
+    'E': np.e,
+}
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+# Límite de nodos para no generar código desproporcionado
+MAX_NODES = 2000
+
+
+class UnsupportedExpression(ValueError):
+    """La expresión usa construcciones que el compilador rápido no maneja."""
+
+
+def _validate(tree):
+    """Recorre el árbol y rechaza todo lo que no sea aritmética elemental en x."""
+    callees = set()
+    function_names = []
+    for count, node in enumerate(ast.walk(tree)):
+        if count >= MAX_NODES:
+            raise UnsupportedExpression("Expresión demasiado grande para el compilador rápido.")
+
+        if isinstance(node, (ast.Expression, ast.Load) + _BINARY_OPERATORS + _UNARY_OPERATORS):
+            continue
+        if isinstance(node, ast.BinOp):
+            if not isinstance(node.op, _BINARY_OPERATORS):
+                raise UnsupportedExpression(f"Operador no soportado: {type(node.op).__name__}")
+        elif isinstance(node, ast.UnaryOp):
+            if not isinstance(node.op, _UNARY_OPERATORS):
+                raise UnsupportedExpression(f"Operador no soportado: {type(node.op).__name__}")
+        elif isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float):
+                raise UnsupportedExpression(f"Constante no soportada: {node.value!r}")
+        elif isinstance(node, ast.Name):
+            if node.id in _FUNCTIONS:
+                function_names.append(node)
+            elif node.id != 'x' and node.id not in _CONSTANTS:
+                raise UnsupportedExpression(f"Símbolo no soportado: {node.id}")
+        elif isinstance(node, ast.Call):
+            if (not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS
+                    or len(node.args) != 1 or node.keywords):
+                raise UnsupportedExpression("Llamada a función no soportada.")
+            callees.add(id(node.func))
+        else:
+            raise UnsupportedExpression(f"Construcción no soportada: {type(node).__name__}")
+
+    # Las funciones solo pueden aparecer como llamadas, no como valores
+    for node in function_names:
+        if id(node) not in callees:
+            raise UnsupportedExpression(f"Uso no soportado de la función {node.id}.")
+
+
+def _call(name, arg):
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=[arg], keywords=[])
+
+
+def _is_one_half(node):
+    if isinstance(node, ast.Constant):
+        return node.value == 0.5
+    return (isinstance(node, ast.BinOp) and isinstance(node.op, ast.Div)
+            and isinstance(node.left, ast.Constant) and node.left.value == 1
+            and isinstance(node.right, ast.Constant) and node.right.value == 2)
+
+
+class _Canonicalize(ast.NodeTransformer):
+    """
+    Imita lo que hace SymPy antes de lambdify para obtener los mismos valores:
+    literales enteros a flotantes (1/2 -> 0.5), e**u -> exp(u) y
+    u**(1/2) -> sqrt(u). Los alias (log10, E) se reescriben a su nombre en
+    NumPy para que el código generado sea válido en el espacio de nombres de
+    lambdify.
+    """
+
+    _ALIASES = {'log10': 'log', 'E': 'e'}
+
+    def visit_Name(self, node):
+        if node.id in self._ALIASES:
+            return ast.copy_location(ast.Name(id=self._ALIASES[node.id], ctx=node.ctx), node)
+        return node
+
+    def visit_Constant(self, node):
+        try:
+            value = float(node.value)
+        except (OverflowError, ValueError):
+            value = np.inf
+        if not np.isfinite(value):
+            # 10**400 escrito completo o 1e400: SymPy los conserva como números exactos
+            raise UnsupportedExpression("Literal numérico fuera del rango de punto flotante.")
+        if type(node.value) is int:
+            return ast.copy_location(ast.Constant(value), node)
+        return node
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            if isinstance(node.left, ast.Name) and node.left.id in ('e', 'E'):
+                return ast.copy_location(_call('exp', node.right), node)
+            if _is_one_half(node.right):
+                return ast.copy_location(_call('sqrt', node.left), node)
+        return node
+
+
+def parse_expression(processed_eq):
+    """
+    Analiza y valida una ecuación preprocesada y devuelve su árbol `ast`
+    canónico (el mismo que se compila en compile_expression).
+
+    Raises:
+        UnsupportedExpression: si la expresión requiere el camino de SymPy.
+    """
+    try:
+        tree = ast.parse(processed_eq.strip(), mode='eval')
+    except SyntaxError as e:
+        raise UnsupportedExpression(f"Sintaxis no soportada: {e.msg}")
+
+    _validate(tree)
+    return ast.fix_missing_locations(_Canonicalize().visit(tree))
+
+
+def compile_expression(processed_eq):
+    """
+    Compila una ecuación ya preprocesada a una función f(x) de NumPy.
+
+    Args:
+        processed_eq (str): Ecuación en sintaxis de Python/SymPy (salida de preprocess_equation).
+
+    Returns:
+        function: f(x) que acepta escalares (devuelve un flotante) o arreglos de NumPy.
+
+    Raises:
+        UnsupportedExpression: si la expresión requiere el camino de SymPy.
+    """
+    tree = parse_expression(processed_eq)
+    # [()] convierte un escalar en np.float64 (no en un arreglo 0-d), como
+    # lambdify; los arreglos no cambian
+    source = (
+        "def _compiled(x):\n"
+        "    x = _asarray(x, dtype=float)[()]\n"
+        f"    return {ast.unparse(tree.body)}\n"
+    )
+    namespace = {'_asarray': np.asarray, **_FUNCTIONS, **_CONSTANTS}
+    exec(compile(source, '<expression_compiler>', 'exec'), namespace)
+    func = namespace['_compiled']
+    func.source = source
+    return func
@@ -0,0 +1,328 @@
+"""
+Traductor de LaTeX (salida de MathQuill) a la sintaxis que entiende SymPy.
+
+Recorre la ecuación una sola vez, de izquierda a derecha, y escribe todos
+los fragmentos traducidos en una única lista que se une al final, por lo que
+el costo es lineal en la longitud de la entrada incluso con fracciones y
+raíces anidadas. Los tramos sin estructura (texto, operadores y comandos de
+la tabla) se traducen con expresiones regulares precompiladas de reemplazo
+literal; solo los comandos con argumentos (\\frac, \\sqrt, \\int, ...) se
+recorren en Python.
+"""
+import re
+
+# Comandos que se reemplazan directamente por un texto
+_COMMAND_TABLE = {
+    'cdot': '*',
+    'times': '*',
+    'div': '/',
+    'pi': 'pi',
+    'sin': 'sin',
+    'cos': 'cos',
+    'tan': 'tan',
+    'ln': 'log',
+    'log': 'log10',
+    'exp': 'exp',
+    'left': '',
+    'right': '',
+    '{': '(',
+    '}': ')',
+    ',': ' ',
+    ';': ' ',
+    ':': ' ',
+    ' ': ' ',
+    '!': '',
+}
+
+# La misma tabla aplicada a un tramo completo: una sustitución literal por
+# cada comando que cambia de nombre (solo si aparece en el tramo) y al final
+# se quita la barra de los demás (\sin -> sin, \{ -> {, que luego pasa a '(')
+_RUN_SUBSTITUTIONS = (
+    ('\\left', re.compile(r'\\left(?:\.|(?![A-Za-z]))'), ''),
+    ('\\right', re.compile(r'\\right(?:\.|(?![A-Za-z]))'), ''),
+    ('\\cdot', re.compile(r'\\cdot(?![A-Za-z])'), '*'),
+    ('\\times', re.compile(r'\\times(?![A-Za-z])'), '*'),
+    ('\\div', re.compile(r'\\div(?![A-Za-z])'), '/'),
+    ('\\ln', re.compile(r'\\ln(?![A-Za-z])'), 'log'),
+    ('\\log', re.compile(r'\\log(?![A-Za-z])'), 'log10'),
+    ('\\', re.compile(r'\\[,;: ]'), ' '),
+    ('\\!', re.compile(r'\\!'), ''),
+)
+_BACKSLASH = re.compile(r'\\(?=[^\\])')
+
+# Nombres de funciones: no se inserta '*' entre ellos y su paréntesis
+_FUNCTION_NAMES = frozenset({
+    'sin', 'cos', 'tan', 'sinh', 'cosh', 'tanh', 'exp', 'log', 'log10',
+    'sqrt', 'abs', 'Integral',
+})
+
+# Comandos con argumentos, que se traducen recorriendo la estructura
+_STRUCTURAL = (r'\\(?:d|t)?frac(?![A-Za-z])|\\sqrt(?![A-Za-z])|\\int(?![A-Za-z])'
+               r'|\\operatorname(?![A-Za-z])|\\left\||\\right\|')
+_SPECIAL = re.compile(_STRUCTURAL)
+_SPECIAL_IN_GROUP = re.compile(_STRUCTURAL + r'|[{}]')
+_SPECIAL_IN_BRACKET = re.compile(_STRUCTURAL + r'|[{}\]]')
+
+_COMMAND = re.compile(r'\\(?:(?:left|right)\.|([A-Za-z]+|.))', re.DOTALL)
+# Multiplicación implícita: 2x -> 2*x, )( -> )*(; log10( es una función.
+# El '*' se inserta en una posición vacía para que el reemplazo sea literal.
+_IMPLICIT = re.compile(r'(?<=[\d)])(?<!log10)(?=\s*[A-Za-z(])')
+_TRAILING_FUNCTION = re.compile(r'(?<![A-Za-z0-9_])log10\s*$')
+
+# Límite de anidamiento para no agotar la pila de recursión
+MAX_DEPTH = 200
+
+
+def _is_ascii_letter(c):
+    return ('a' <= c <= 'z') or ('A' <= c <= 'Z')
+
+
+def _translate_command(match):
+    name = match.group(1)
+    if name is None:
+        # \left. y \right. no producen nada
+        return ''
+    # Comandos desconocidos (\sinh, \cosh, ...): se quita la barra
+    return _COMMAND_TABLE.get(name, name)
+
+
+def _translate_run(run):
+    """Traduce un tramo sin comandos estructurales."""
+    if '\\' in run:
+        for marker, pattern, replacement in _RUN_SUBSTITUTIONS:
+            if marker in run:
+                run = pattern.sub(replacement, run)
+        run = _BACKSLASH.sub('', run)
+    run = run.replace('{', '(').replace('}', ')').replace('^', '**')
+    return _IMPLICIT.sub('*', run)
+
+
+def _strip_pieces(pieces):
+    """Quita los espacios iniciales y finales de una lista de fragmentos, en su lugar."""
+    while pieces and not pieces[0].strip():
+        pieces.pop(0)
+    while pieces and not pieces[-1].strip():
+        pieces.pop()
+    if pieces:
+        pieces[0] = pieces[0].lstrip()
+        pieces[-1] = pieces[-1].rstrip()
+    return pieces
+
+
+class _Translator:
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        self.depth = 0
+        # Todos los niveles escriben en la misma lista, que se une una sola vez
+        self.out = []
+        # Último carácter significativo emitido y si cerraba un nombre de función
+        self.prev = ''
+        self.after_function = False
+
+    def translate(self):
+        self.sequence()
+        return ''.join(self.out)
+
+    def emit(self, piece, is_function=False):
+        stripped = piece.strip()
+        if not stripped:
+            self.out.append(piece)
+            return
+        first = stripped[0]
+        if (self.prev == ')' or self.prev.isdigit()) and not self.after_function and \
+                (_is_ascii_letter(first) or first == '('):
+            self.out.append('*')
+        self.out.append(piece)
+        self.prev = stripped[-1]
+        self.after_function = is_function
+
+    def close(self, piece):
+        """Emite un fragmento que empieza con ')': nunca requiere '*' delante."""
+        self.out.append(piece)
+        self.prev = piece[-1]
+        self.after_function = False
+
+    def emit_run(self, start, end):
+        if start < end:
+            run = _translate_run(self.text[start:end])
+            ends_in_function = run.rstrip().endswith('log10') and _TRAILING_FUNCTION.search(run) is not None
+            self.emit(run, is_function=ends_in_function)
+
+    def capture(self, parse):
+        """Ejecuta `parse` y devuelve (quitándolos de la salida) los fragmentos que emitió."""
+        start = len(self.out)
+        state = self.prev, self.after_function
+        # Se traducen como un texto aparte: no hay nada antes con qué multiplicar
+        self.prev, self.after_function = '', False
+        parse()
+        self.prev, self.after_function = state
+        pieces = self.out[start:]
+        del self.out[start:]
+        return pieces
+
+    def sequence(self, stop=None):
+        """
+        Traduce desde la posición actual hasta encontrar `stop` ('}', ']' o
+        'dx') o hasta el final si `stop` es None.
+        """
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise ValueError("La ecuación está anidada demasiado profundamente.")
+
+        text = self.text
+        n = len(text)
+        if stop == '}':
+            special = _SPECIAL_IN_GROUP
+        elif stop == ']':
+            special = _SPECIAL_IN_BRACKET
+        else:
+            # Fuera de los argumentos las llaves solo agrupan: se copian como paréntesis
+            special = _SPECIAL
+
+        while self.pos < n:
+            m = special.search(text, self.pos)
+            end = m.start() if m else n
+
+            if stop == 'dx':
+                dx = text.find('dx', self.pos, end)
+                if dx != -1:
+                    self.emit_run(self.pos, dx)
+                    self.pos = dx + 2
+                    self.depth -= 1
+                    return
+
+            self.emit_run(self.pos, end)
+            self.pos = end
+            if m is None:
+                break
+
+            token = m.group(0)
+            if token == stop:
+                self.pos += 1
+                self.depth -= 1
+                return
+            if token == '}':
+                raise ValueError("Paréntesis desbalanceados en la ecuación.")
+            if token == '{':
+                self.pos += 1
+                self.emit('(')
+                self.sequence('}')
+                self.close(')')
+            else:
+                self.structural()
+
+        self.depth -= 1
+        if stop == 'dx':
+            raise ValueError("Integral malformada: falta 'dx' al final del integrando.")
+        if stop is not None:
+            raise ValueError("Paréntesis desbalanceados en la ecuación.")
+
+    def skip_spaces(self):
+        text = self.text
+        while self.pos < len(text) and text[self.pos].isspace():
+            self.pos += 1
+
+    def argument(self, context):
+        """Traduce el argumento de un comando: {grupo}, otro comando o un carácter."""
+        self.skip_spaces()
+        text = self.text
+        if self.pos >= len(text) or text[self.pos] == '}':
+            raise ValueError(f"{context}: falta un argumento.")
+
+        if text[self.pos] == '{':
+            self.pos += 1
+            self.sequence('}')
+        elif text[self.pos] == '\\':
+            if _SPECIAL.match(text, self.pos):
+                self.structural()
+            else:
+                m = _COMMAND.match(text, self.pos)
+                self.pos = m.end()
+                self.out.append(_translate_command(m))
+        else:
+            self.pos += 1
+            self.out.append(text[self.pos - 1])
+
+    def structural(self):
+        """Traduce un comando con argumentos que empieza en la posición actual."""
+        m = _SPECIAL.match(self.text, self.pos)
+        token = m.group(0)
+        self.pos = m.end()
+
+        if token.endswith('frac'):
+            self.emit('(')
+            self.argument("Fracción malformada")
+            self.close(')/(')
+            self.argument("Fracción malformada")
+            self.close(')')
+        elif token == '\\sqrt':
+            index = None
+            self.skip_spaces()
+            if self.text.startswith('[', self.pos):
+                self.pos += 1
+                # El índice se lee antes que el radicando pero se escribe después
+                index = self.capture(lambda: self.sequence(']'))
+            if index:
+                self.emit('(')
+                self.argument("Raíz malformada")
+                self.close(')**(1/(')
+                self.out.extend(index)
+                self.close('))')
+            else:
+                self.emit('sqrt(')
+                self.argument("Raíz malformada")
+                self.close(')')
+        elif token == '\\int':
+            self.integral()
+        elif token == '\\operatorname':
+            function_name = ''.join(self.capture(lambda: self.argument("Operador malformado"))).strip()
+            self.emit(function_name, is_function=function_name in _FUNCTION_NAMES)
+        elif token == '\\left|':
+            self.emit('abs(')
+        else:
+            self.close(')')
+
+    def integral(self):
+        """\\int_{a}^{b} f(x) dx -> Integral(f(x), (x, a, b))"""
+        limits = {}
+        text = self.text
+        for _ in range(2):
+            self.skip_spaces()
+            if self.pos < len(text) and text[self.pos] in '_^':
+                key = text[self.pos]
+                self.pos += 1
+                limits[key] = _strip_pieces(self.capture(lambda: self.argument("Integral malformada")))
+        if '_' not in limits or '^' not in limits:
+            raise ValueError("Integral malformada: se esperaban los límites \\int_{a}^{b}.")
+
+        self.emit('Integral(')
+        start = len(self.out)
+        self.sequence('dx')
+        self.out[start:] = _strip_pieces(self.out[start:])
+        self.emit(', (x, ')
+        self.out.extend(limits['_'])
+        self.emit(', ')
+        self.out.extend(limits['^'])
+        self.close('))')
+
+
+def translate_latex(equation):
+    """
+    Traduce una ecuación en LaTeX a una cadena lista para `parse_expr`.
+
+    Soporta \\frac, \\sqrt (también \\sqrt[n]), \\int_{a}^{b} ... dx, \\cdot,
+    \\times, \\div, \\pi, \\ln, \\log, \\exp, funciones trigonométricas,
+    \\left/\\right (|x| se traduce a abs), llaves como agrupación, '^' como
+    potencia y la multiplicación implícita entre números o paréntesis y lo
+    que les sigue.
+    """
+    if _SPECIAL.search(equation) is None:
+        # Sin comandos estructurales basta con traducir el tramo completo
+        translated = _translate_run(equation)
+    else:
+        translated = _Translator(equation).translate()
+
+    if translated.count('(') != translated.count(')'):
+        raise ValueError("Paréntesis desbalanceados en la ecuación.")
+    return translated
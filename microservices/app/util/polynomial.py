@@ -0,0 +1,144 @@
+"""
+Camino rápido para ecuaciones polinomiales.
+
+Si la expresión es un polinomio en x con coeficientes reales (se detecta con
+sp.Poly), todas sus raíces se obtienen de una vez como valores propios de la
+matriz compañera y se pulen con uno o dos pasos de Newton sobre el polinomio
+(evaluado con Horner); las raíces múltiples se reportan una vez con su
+multiplicidad. Es mucho más barato que lanzar los métodos escalares
+desde muchos puntos iniciales.
+"""
+import numpy as np
+
+# Grado máximo que se resuelve por valores propios
+MAX_DEGREE = 500
+
+
+def polynomial_coefficients(expr, x):
+    """
+    Coeficientes reales de `expr` como polinomio en `x`, del término de mayor
+    grado al independiente, o None si no es un polinomio de coeficientes
+    reales (funciones trascendentes, potencias no enteras, x en un
+    denominador, coeficientes complejos, ...).
+    """
+    import sympy as sp
+
+    # x**2.0 (exponente flotante entero) también es un polinomio
+    expr = expr.replace(
+        lambda e: e.is_Pow and e.exp.is_Float and float(e.exp).is_integer(),
+        lambda e: e.base ** int(e.exp)
+    )
+    try:
+        poly = sp.Poly(expr, x)
+    except sp.PolynomialError:
+        return None
+    try:
+        coefficients = [complex(c) for c in poly.all_coeffs()]
+    except TypeError:
+        # Coeficientes con otros símbolos
+        return None
+    if any(c.imag != 0 for c in coefficients):
+        return None
+    return np.array([c.real for c in coefficients], dtype=float)
+
+
+def _polish(coefficients, roots, steps, p):
+    """Pasos de Newton sobre el polinomio; se conserva el de menor residuo."""
+    derivative = np.polyder(coefficients)
+    roots = roots.copy()
+    values = p(roots)
+    residuals = np.abs(values)
+    with np.errstate(all='ignore'):
+        for _ in range(steps):
+            candidate = roots - values / np.polyval(derivative, roots)
+            candidate_values = p(candidate)
+            candidate_residuals = np.abs(candidate_values)
+            better = np.isfinite(candidate) & (candidate_residuals < residuals)
+            roots[better] = candidate[better]
+            values[better] = candidate_values[better]
+            residuals[better] = candidate_residuals[better]
+    return roots, residuals
+
+
+def _is_numerical_root(coefficients, z, p):
+    """|p(z)| está por debajo de la cota de error de redondeo de Horner en z."""
+    bound = 64 * np.finfo(float).eps * np.polyval(np.abs(coefficients), abs(z))
+    return abs(p(z)) <= bound
+
+
+def _cluster(coefficients, roots, radius, p):
+    """
+    Agrupa los valores propios que provienen de una misma raíz múltiple: una
+    raíz de multiplicidad k se abre en k valores a distancia ~eps**(1/k)
+    (a veces con parte imaginaria), pero su centroide sigue siendo una raíz
+    a precisión de máquina. Un valor se une a un grupo cercano (a menos de
+    `radius`, relativo) solo si el nuevo centroide cumple esa condición, así
+    dos raíces simples próximas no se confunden.
+    """
+    clusters = []
+    for root in roots[np.lexsort((roots.imag, roots.real))]:
+        for cluster in clusters:
+            center = np.mean(cluster + [root])
+            if (abs(root - np.mean(cluster)) <= radius * max(1.0, abs(center))
+                    and _is_numerical_root(coefficients, center, p)):
+                cluster.append(root)
+                break
+        else:
+            clusters.append([root])
+    return clusters
+
+
+def polynomial_roots(coefficients, polish_steps=2, imag_tol=1e-7, cluster_radius=1e-2, p=None):
+    """
+    Todas las raíces del polinomio de coeficientes `coefficients` (mayor
+    grado primero).
+
+    Los valores propios de la matriz compañera (np.roots) se agrupan por
+    raíz múltiple (ver _cluster) y las raíces simples se pulen con
+    `polish_steps` pasos de Newton. Una raíz es real si su parte imaginaria
+    es menor que `imag_tol` (relativo para |z| > 1). `p` evalúa el polinomio
+    en arreglos complejos (por defecto np.polyval); el controlador lo envuelve
+    en un CountingEvaluator para contar las evaluaciones.
+
+    Returns:
+        tuple: (reales, complejas). reales es una lista de {'root',
+        'multiplicity', 'residual'} en orden creciente; complejas, una lista
+        de {'real', 'imag', 'multiplicity', 'residual'} con las dos raíces de
+        cada par conjugado.
+    """
+    coefficients = np.trim_zeros(np.asarray(coefficients, dtype=float), 'f')
+    if coefficients.size < 2:
+        return [], []
+    if coefficients.size - 1 > MAX_DEGREE:
+        raise ValueError(f"El polinomio no puede tener grado mayor que {MAX_DEGREE}.")
+
+    if p is None:
+        def p(z):
+            return np.polyval(coefficients, z)
+
+    roots = np.roots(coefficients).astype(complex)
+    clusters = _cluster(coefficients, roots, cluster_radius, p)
+    centers = np.array([np.mean(cluster) for cluster in clusters], dtype=complex)
+    multiplicities = np.array([len(cluster) for cluster in clusters])
+    # Newton solo mejora las raíces simples (en las múltiples converge linealmente)
+    simple = multiplicities == 1
+    centers[simple], residuals = _polish(coefficients, centers[simple], polish_steps, p)
+    all_residuals = np.empty(centers.size)
+    all_residuals[simple] = residuals
+    all_residuals[~simple] = np.abs(p(centers[~simple]))
+    is_real = np.abs(centers.imag) <= imag_tol * np.maximum(1.0, np.abs(centers))
+    # El residuo de una raíz real se mide en su parte real, que es la que se reporta
+    all_residuals[is_real] = np.abs(p(centers[is_real].real + 0j))
+
+    real = []
+    complex_roots = []
+    for center, multiplicity, residual, on_axis in zip(centers, multiplicities, all_residuals, is_real):
+        if on_axis:
+            real.append({'root': float(center.real), 'multiplicity': int(multiplicity),
+                         'residual': float(residual)})
+        else:
+            complex_roots.append({'real': float(center.real), 'imag': float(center.imag),
+                                  'multiplicity': int(multiplicity), 'residual': float(residual)})
+    real.sort(key=lambda entry: entry['root'])
+    complex_roots.sort(key=lambda entry: (entry['real'], entry['imag']))
+    return real, complex_roots
@@ -1,16 +1,4 @@
-from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 import numpy as np
-import plotly
-import plotly.graph_objs as go
-import json
-import sympy as sp
-import re
 import logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -42,4 +30,250 @@ def bisection_method(f, a, b, max_iter, iteration_history, tol=1e-6):
             a = c
             fa = fc
 
-    return c, converged, i, iteration_history
\ No newline at end of file
+    return c, converged, i, iteration_history
+
+
+def brent_method(f, a, b, max_iter, iteration_history, tol=1e-6):
+    """
+    Método de Brent: conserva siempre un intervalo con cambio de signo pero
+    usa pasos de secante o de interpolación cuadrática inversa cuando son
+    aceptables, y bisección cuando no. Suele necesitar bastantes menos
+    evaluaciones que la bisección pura.
+
+    El historial tiene el mismo formato que en bisection_method: 'x' es la
+    mejor aproximación y 'error' la mitad del intervalo con cambio de signo
+    que la contiene, medido después de actualizar el contrapunto. Converge
+    cuando ese semiancho es menor que tol / 2 + 2 eps |x| o f(x) = 0.
+
+    Returns:
+        tuple: (root, converged, iterations, iteration_history, evaluations)
+    """
+    fa = f(a)
+    fb = f(b)
+    evaluations = 2
+    if fa * fb >= 0:
+        raise ValueError("La función no cambia de signo en el intervalo dado.")
+
+    eps = np.finfo(float).eps
+    c, fc = b, fb
+
+    def bracket(a, fa, b, fb, c, fc, d, e):
+        # c es el contrapunto: f(b) y f(c) deben tener signos opuestos
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        # b es siempre la mejor aproximación
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        return a, fa, b, fb, c, fc, d, e
+
+    d = e = b - a
+    a, fa, b, fb, c, fc, d, e = bracket(a, fa, b, fb, c, fc, d, e)
+    tol1 = 2.0 * eps * abs(b) + 0.5 * tol
+    xm = 0.5 * (c - b)
+    converged = abs(xm) <= tol1 or fb == 0
+    i = 0
+    while not converged and i < max_iter:
+        i += 1
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # Secante
+                p = 2.0 * xm * s
+                q = 1.0 - s
+            else:
+                # Interpolación cuadrática inversa
+                q = fa / fc
+                r = fb / fc
+                p = s * (2.0 * xm * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * xm * q - abs(tol1 * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = xm
+        else:
+            d = e = xm
+
+        a, fa = b, fb
+        b += d if abs(d) > tol1 else (tol1 if xm > 0 else -tol1)
+        fb = f(b)
+        evaluations += 1
+
+        # El error se mide sobre el intervalo ya actualizado [b, c]
+        a, fa, b, fb, c, fc, d, e = bracket(a, fa, b, fb, c, fc, d, e)
+        tol1 = 2.0 * eps * abs(b) + 0.5 * tol
+        xm = 0.5 * (c - b)
+        error = abs(xm)
+        iteration_history.append({
+            'iteration': i,
+            'x': round(float(b), 6),
+            'fx': round(float(fb), 6),
+            'error': round(float(error), 6)
+        })
+        logger.info(f"Brent Iteración {i}: x = {b}, f(x) = {fb}, error = {error}")
+        converged = error <= tol1 or fb == 0
+
+    return b, converged, i, iteration_history, evaluations
+
+
+def ksection_method(f, a, b, max_iter, iteration_history, tol=1e-6, k=64):
+    """
+    Variante de bisección que divide el intervalo en `k` partes: en cada
+    iteración evalúa los k - 1 puntos interiores con una sola llamada
+    vectorizada (f debe aceptar arreglos) y se queda con el primer
+    subintervalo con cambio de signo. El intervalo se reduce k veces por
+    iteración en lugar de 2.
+
+    El historial tiene el mismo formato que en bisection_method: 'x' es el
+    extremo del nuevo intervalo con menor |f| y 'error' su semiancho.
+
+    Returns:
+        tuple: (root, converged, iterations, iteration_history, evaluations)
+    """
+    if k < 2:
+        raise ValueError("k debe ser al menos 2.")
+    fa = f(a)
+    fb = f(b)
+    evaluations = 2
+    if fa * fb >= 0:
+        raise ValueError("La función no cambia de signo en el intervalo dado.")
+
+    converged = False
+    x, fx = (a, fa) if abs(fa) < abs(fb) else (b, fb)
+    for i in range(1, max_iter + 1):
+        x_vals = np.linspace(a, b, k + 1)
+        f_vals = np.empty(k + 1)
+        f_vals[0], f_vals[-1] = fa, fb
+        f_vals[1:-1] = f(x_vals[1:-1])
+        evaluations += k - 1
+
+        # f(a) y f(b) tienen signos opuestos, así que hay al menos un cambio de signo
+        zeros = np.flatnonzero(f_vals == 0)
+        if zeros.size:
+            x, fx = x_vals[zeros[0]], 0.0
+            a = b = x
+        else:
+            j = np.flatnonzero(np.sign(f_vals[:-1]) != np.sign(f_vals[1:]))[0]
+            a, b, fa, fb = x_vals[j], x_vals[j + 1], f_vals[j], f_vals[j + 1]
+            x, fx = (a, fa) if abs(fa) < abs(fb) else (b, fb)
+
+        error = abs(b - a) / 2.0
+        iteration_history.append({
+            'iteration': i,
+            'x': round(float(x), 6),
+            'fx': round(float(fx), 6),
+            'error': round(float(error), 6)
+        })
+        logger.info(f"{k}-sección Iteración {i}: x = {x}, f(x) = {fx}, error = {error}")
+        if abs(fx) < tol or error < tol:
+            converged = True
+            break
+
+    return x, converged, i, iteration_history, evaluations
+
+def bisection_batch(f, a, b, max_iter, tol=1e-6):
+    """
+    Bisección vectorizada: resuelve todos los intervalos [a[i], b[i]] a la vez.
+
+    f debe aceptar arreglos (como las funciones de parse_function). Cada carril
+    usa el mismo criterio de parada que bisection_method (|f(c)| < tol o
+    semiancho < tol); los carriles terminados se retiran y en cada iteración
+    solo se evalúan los que siguen activos.
+
+    Returns:
+        dict: arreglos 'root', 'converged', 'iterations', 'valid' (False si el
+        intervalo no cambia de signo) y 'evaluations' (total de evaluaciones de f).
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    a, b = a.ravel().copy(), b.ravel().copy()
+    fa = np.asarray(f(a), dtype=float).ravel()
+    fb = np.asarray(f(b), dtype=float).ravel()
+    evaluations = 2 * a.size
+
+    valid = np.isfinite(fa) & np.isfinite(fb) & (fa * fb < 0)
+    active = valid.copy()
+    root = np.full(a.size, np.nan)
+    converged = np.zeros(a.size, dtype=bool)
+    iterations = np.zeros(a.size, dtype=int)
+
+    for i in range(1, max_iter + 1):
+        lanes = np.flatnonzero(active)
+        if lanes.size == 0:
+            break
+        c = (a[lanes] + b[lanes]) / 2.0
+        fc = np.asarray(f(c), dtype=float).ravel()
+        evaluations += lanes.size
+        error = np.abs(b[lanes] - a[lanes]) / 2.0
+
+        root[lanes] = c
+        iterations[lanes] = i
+        done = (np.abs(fc) < tol) | (error < tol)
+        converged[lanes[done]] = True
+        active[lanes[done]] = False
+
+        # Igual que en bisection_method: si f(a)·f(c) < 0 la raíz está en [a, c]
+        left = fa[lanes] * fc < 0
+        to_b, to_a = ~done & left, ~done & ~left
+        b[lanes[to_b]] = c[to_b]
+        a[lanes[to_a]] = c[to_a]
+        fa[lanes[to_a]] = fc[to_a]
+
+    logger.info(f"Bisección por lotes: {a.size} carriles, {int(converged.sum())} convergieron, "
+                f"{evaluations} evaluaciones")
+    return {
+        'root': root,
+        'converged': converged,
+        'iterations': iterations,
+        'valid': valid,
+        'evaluations': evaluations
+    }
+
+
+def bisection_refine_brackets(f, brackets, max_iter, tol=1e-6):
+    """
+    Refina a la vez todos los intervalos de find_valid_intervals: los que
+    cambian de signo con bisection_batch; las raíces exactas y las de
+    multiplicidad par ('touch') se reportan sin iterar.
+
+    Returns:
+        tuple: (roots, evaluations). Cada raíz es un dict con 'root',
+        'bracket', 'kind', 'iterations', 'converged' y 'residual' (|f(root)|),
+        ordenadas por 'root'.
+    """
+    crossing = [bracket for bracket in brackets if bracket['kind'] == 'sign_change']
+    roots = []
+    evaluations = 0
+    if crossing:
+        batch = bisection_batch(
+            f, [bracket['a'] for bracket in crossing], [bracket['b'] for bracket in crossing], max_iter, tol
+        )
+        evaluations += batch['evaluations']
+        for lane, bracket in enumerate(crossing):
+            roots.append({
+                'root': float(batch['root'][lane]),
+                'bracket': [bracket['a'], bracket['b']],
+                'kind': bracket['kind'],
+                'iterations': int(batch['iterations'][lane]),
+                'converged': bool(batch['converged'][lane])
+            })
+    for bracket in brackets:
+        if bracket['kind'] != 'sign_change':
+            roots.append({
+                'root': 0.5 * (bracket['a'] + bracket['b']),
+                'bracket': [bracket['a'], bracket['b']],
+                'kind': bracket['kind'],
+                'iterations': 0,
+                'converged': True
+            })
+
+    roots.sort(key=lambda r: r['root'])
+    if roots:
+        residuals = np.abs(np.asarray(f(np.array([r['root'] for r in roots])), dtype=float))
+        evaluations += len(roots)
+        for r, residual in zip(roots, residuals):
+            r['residual'] = float(residual)
+    return roots, evaluations
@@ -1,14 +1,9 @@
 from flask import jsonify
-from sympy.parsing.sympy_parser import (
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 from . import bisection
 from microservices.app.util import equation as eq
+from microservices.app.util.chebyshev import ChebyshevProxy
+from microservices.app.util.evaluator import CountingEvaluator
 import numpy as np
-import plotly
-import plotly.graph_objs as go
 import json
 import logging
 
@@ -16,14 +11,21 @@ import logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-# Transformaciones de sympy
-transformations = (
-    standard_transformations +
-    (implicit_multiplication_application,) +
-    (convert_xor,)
-)
+# Métodos de intervalo disponibles en /bisection
+BRACKETING_METHODS = ('bisection', 'brent', 'ksection')
+# Máximo de subintervalos por iteración en el método 'ksection'
+MAX_KSECTION_K = 4096
+# Máximo de puntos de la malla de búsqueda de intervalos (num_points)
+MAX_GRID_POINTS = 100000
+# Máximo de iteraciones de refinamiento en /bisection/all_roots (bisección en
+# punto flotante agota la precisión mucho antes)
+MAX_REFINE_ITERATIONS = 1000
+
 
 def controller_bisection(data):
+    import plotly
+    import plotly.graph_objs as go
+
     try:
         # 1) Validar que existan los campos requeridos
         required_fields = ['equation', 'a', 'b', 'iterations']
@@ -44,17 +46,43 @@ def controller_bisection(data):
 
         # 3) Parsear la ecuación
         try:
-            expr, f = eq.parse_equation(equation)
+            # La gráfica usa la función sin contador: solo se cuentan las evaluaciones del método
+            f_plain = eq.parse_function(equation)
+            f = CountingEvaluator(f_plain)
         except Exception as e:
             logger.error(f"Error al parsear la ecuación: {str(e)}")
             return jsonify({'error': f"Error al parsear la ecuación: {str(e)}"}), 400
 
-        # 4) Ejecutar el método de bisección
+        # 4) Ejecutar el método elegido ('bisection' por defecto, 'brent' o 'ksection')
+        method = data.get('method', 'bisection')
+        if method not in BRACKETING_METHODS:
+            return jsonify({'error': f"Método no soportado: {method}. Opciones: {', '.join(BRACKETING_METHODS)}"}), 400
+
+        # k solo se usa (y se valida) en 'ksection'
+        if method == 'ksection':
+            try:
+                k = int(data.get('k', 64))
+            except (TypeError, ValueError):
+                return jsonify({'error': 'k debe ser un entero.'}), 400
+            if not 2 <= k <= MAX_KSECTION_K:
+                return jsonify({'error': f'k debe estar entre 2 y {MAX_KSECTION_K}.'}), 400
+
         iteration_history = []
         try:
-            root, converged, iterations, iteration_history = bisection.bisection_method(
-                f, a, b, max_iter, iteration_history
-            )
+            if method == 'brent':
+                root, converged, iterations, iteration_history, evaluations = bisection.brent_method(
+                    f, a, b, max_iter, iteration_history
+                )
+            elif method == 'ksection':
+                root, converged, iterations, iteration_history, evaluations = bisection.ksection_method(
+                    f, a, b, max_iter, iteration_history, k=k
+                )
+            else:
+                root, converged, iterations, iteration_history = bisection.bisection_method(
+                    f, a, b, max_iter, iteration_history
+                )
+                # f(a), f(b) y una evaluación por iteración
+                evaluations = iterations + 2
         except ValueError as ve:
             logger.error(str(ve))
             return jsonify({'error': str(ve)}), 400
@@ -74,21 +102,15 @@ def controller_bisection(data):
 
             # Tomamos algunos puntos para "explorar" la función
             test_points = np.linspace(x_min, x_max, 200)
-            y_values = []
-            for x in test_points:
-                try:
-                    y = f(x)
-                    # Filtramos valores extremos
-                    if np.isfinite(y) and abs(y) < 1e4:
-                        y_values.append(y)
-                except:
-                    pass
+            test_values = eq.sample_function(f, test_points)
+            # Filtramos valores extremos
+            y_values = test_values[np.abs(test_values) < 1e4]
 
             # Si no se encontró ningún valor, mantenemos el rango inicial
-            if not y_values:
+            if y_values.size == 0:
                 return x_min, x_max
 
-            y_min, y_max = min(y_values), max(y_values)
+            y_min, y_max = y_values.min(), y_values.max()
             y_range = y_max - y_min
 
             # Si la variación en Y es muy pequeña, ampliamos el rango X para ver más
@@ -97,18 +119,11 @@ def controller_bisection(data):
                 x_max = center + initial_range * 2
             else:
                 # Buscar puntos de inflexión aproximados (donde la pendiente cambie de signo)
-                inflection_points = []
-                for i in range(1, len(test_points) - 1):
-                    try:
-                        left_slope = (f(test_points[i]) - f(test_points[i-1])) / (test_points[i] - test_points[i-1])
-                        right_slope = (f(test_points[i+1]) - f(test_points[i])) / (test_points[i+1] - test_points[i])
-                        if left_slope * right_slope < 0:
-                            inflection_points.append(test_points[i])
-                    except:
-                        pass
+                slopes = np.diff(test_values) / np.diff(test_points)
+                inflection_points = test_points[1:-1][slopes[:-1] * slopes[1:] < 0]
 
                 # Si encontramos inflexiones, ajustamos x_min y x_max para incluirlas con margen
-                if inflection_points:
+                if inflection_points.size:
                     min_infl = min(inflection_points)
                     max_infl = max(inflection_points)
                     x_min = min(x_min, min_infl - 5)
@@ -170,23 +185,12 @@ def controller_bisection(data):
             center = (a + b) / 2.0
 
         # Llamamos a la función para obtener x_min y x_max
-        plot_a, plot_b = determine_plot_range(f, center, initial_range=10)
+        plot_a, plot_b = determine_plot_range(f_plain, center, initial_range=10)
 
-        # 8) Generar puntos para la gráfica
+        # 8) Generar puntos para la gráfica (filtrando valores muy grandes)
         num_points = 1000
         x_vals = np.linspace(plot_a, plot_b, num_points)
-        y_vals = []
-
-        for x in x_vals:
-            try:
-                val = f(x)
-                # Filtrar valores muy grandes
-                if np.isfinite(val) and abs(val) < 1e4:
-                    y_vals.append(val)
-                else:
-                    y_vals.append(np.nan)
-            except:
-                y_vals.append(np.nan)
+        y_vals = eq.sample_function(f_plain, x_vals, limit=1e4)
 
         # 9) Trazas de la función y eje X
         trace_function = go.Scatter(
@@ -213,11 +217,8 @@ def controller_bisection(data):
 
         # 10) Si hay raíz, dibujarla
         if root is not None:
-            try:
-                root_y = f(root)
-                if not np.isfinite(root_y):
-                    root_y = 0
-            except:
+            root_y = eq.sample_function(f_plain, [root])[0]
+            if not np.isfinite(root_y):
                 root_y = 0
 
             root_trace = go.Scatter(
@@ -263,9 +264,12 @@ def controller_bisection(data):
         # 13) Preparar la respuesta
         response = {
             'root': round(root, 6) if root is not None else None,
-            'converged': converged,
+            'converged': bool(converged),
             'iterations': iterations,
             'iteration_history': iteration_history,
+            'method': method,
+            'evaluations': evaluations,
+            'function_evaluations': f.evaluations,
             'plot_json': graphJSON
         }
         return jsonify(response)
@@ -273,3 +277,225 @@ def controller_bisection(data):
     except Exception as e:
         logger.exception("Error inesperado en el controlador de bisección.")
         return jsonify({'error': 'Ocurrió un error inesperado durante el cálculo.'}), 500
+
+
+# Máximo de carriles por petición en /bisection/batch
+MAX_BATCH_LANES = 10000
+
+
+def _batch_lanes(data):
+    """
+    Extrae los carriles (equation, a, b) de la petición: una ecuación con una
+    lista 'intervals' ([a, b] o {'a', 'b'}) o una lista 'problems' de
+    {'equation', 'a', 'b'}.
+    """
+    if 'problems' in data:
+        lanes = [(p['equation'], float(p['a']), float(p['b'])) for p in data['problems']]
+    elif 'equation' in data and 'intervals' in data:
+        lanes = []
+        for interval in data['intervals']:
+            if isinstance(interval, dict):
+                lanes.append((data['equation'], float(interval['a']), float(interval['b'])))
+            else:
+                a, b = interval
+                lanes.append((data['equation'], float(a), float(b)))
+    else:
+        raise ValueError("Se requiere 'equation' con 'intervals' o una lista 'problems'.")
+
+    if not lanes:
+        raise ValueError("La lista de intervalos está vacía.")
+    if len(lanes) > MAX_BATCH_LANES:
+        raise ValueError(f"Se permiten como máximo {MAX_BATCH_LANES} intervalos por petición.")
+    return lanes
+
+
+def _render_batch_plot(f, equation, x_min, x_max, roots):
+    """Gráfica de f con las raíces marcadas; `f` es la función sin contador."""
+    import plotly
+    import plotly.graph_objs as go
+
+    x_vals = np.linspace(x_min, x_max, 1000)
+    y_vals = eq.sample_function(f, x_vals, limit=1000)
+    roots = np.asarray(roots, dtype=float)
+    data_traces = [
+        go.Scatter(x=x_vals, y=y_vals, mode='lines', name='f(x)',
+                   line=dict(color='blue', width=2.5), connectgaps=False),
+        go.Scatter(x=roots, y=np.zeros_like(roots), mode='markers', name='Raíces',
+                   marker=dict(color='red', size=9, symbol='star'))
+    ]
+    layout = go.Layout(title=f'Bisección por lotes: {equation}', xaxis=dict(title='x'),
+                       yaxis=dict(title='f(x)'), plot_bgcolor='#ffffff')
+    return json.dumps(go.Figure(data=data_traces, layout=layout), cls=plotly.utils.PlotlyJSONEncoder)
+
+
+def controller_bisection_batch(data):
+    """
+    Resuelve muchos intervalos (de una o varias ecuaciones) en una sola
+    petición. Los carriles de cada ecuación se refinan juntos con
+    bisection_batch; la respuesta es compacta y, salvo que se pida
+    'plot': true, no incluye gráfica.
+    """
+    try:
+        if not data:
+            return jsonify({'error': 'No se recibió ningún dato.'}), 400
+        try:
+            lanes = _batch_lanes(data)
+            max_iter = int(data.get('iterations', 100))
+            tol = float(data.get('tol', 1e-6))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"Datos inválidos para bisección por lotes: {str(e)}")
+            return jsonify({'error': f"Datos inválidos: {str(e)}"}), 400
+
+        # Agrupar por ecuación: cada grupo se parsea una vez y se resuelve en un solo ciclo vectorizado
+        groups = {}
+        for index, (equation, _, _) in enumerate(lanes):
+            groups.setdefault(equation, []).append(index)
+        a_all = np.array([lane[1] for lane in lanes])
+        b_all = np.array([lane[2] for lane in lanes])
+
+        results = [None] * len(lanes)
+        evaluations = 0
+        functions = {}
+        evaluators = []
+        for equation, indices in groups.items():
+            try:
+                f = CountingEvaluator(eq.parse_function(equation))
+            except ValueError as e:
+                for index in indices:
+                    results[index] = {'converged': False, 'error': str(e)}
+                continue
+            functions[equation] = f
+            evaluators.append(f)
+
+            batch = bisection.bisection_batch(f, a_all[indices], b_all[indices], max_iter, tol)
+            evaluations += batch['evaluations']
+            for lane, index in enumerate(indices):
+                if not batch['valid'][lane]:
+                    results[index] = {'converged': False,
+                                      'error': 'La función no cambia de signo en el intervalo dado.'}
+                    continue
+                results[index] = {
+                    'root': float(batch['root'][lane]),
+                    'iterations': int(batch['iterations'][lane]),
+                    'converged': bool(batch['converged'][lane])
+                }
+
+        response = {
+            'results': results,
+            'lanes': len(lanes),
+            'evaluations': evaluations
+        }
+
+        if data.get('plot'):
+            if len(functions) != 1:
+                return jsonify({'error': 'La gráfica solo está disponible para lotes de una sola ecuación.'}), 400
+            equation, f = next(iter(functions.items()))
+            roots = [r['root'] for r in results if 'root' in r]
+            response['plot_json'] = _render_batch_plot(f.f, equation, float(a_all.min()), float(b_all.max()), roots)
+
+        response['function_evaluations'] = sum(f.evaluations for f in evaluators)
+
+        return jsonify(response)
+
+    except Exception as e:
+        logger.exception("Error inesperado en el controlador de bisección por lotes.")
+        return jsonify({'error': 'Ocurrió un error inesperado durante el cálculo.'}), 500
+
+
+# Estrategias de /bisection/all_roots
+ALL_ROOTS_METHODS = ('sweep', 'chebyshev')
+
+
+def _chebyshev_all_roots(f, equation, a, b, plot):
+    """
+    Todas las raíces con el interpolante de Chebyshev de f en [a, b]: la
+    misma muestra da las raíces y, si se pide, la curva de la gráfica.
+    """
+    proxy = ChebyshevProxy(f, a, b)
+    roots = proxy.roots()
+    residuals = np.abs(np.asarray(f(roots), dtype=float)) if roots.size else []
+    roots = [{'root': float(root), 'residual': float(residual)} for root, residual in zip(roots, residuals)]
+    logger.info(f"Chebyshev (todas las raíces) en [{a}, {b}]: {len(roots)} raíces, grado {proxy.degree}")
+
+    response = {
+        'roots': roots,
+        'count': len(roots),
+        'evaluations': proxy.evaluations + len(roots),
+        'chebyshev': proxy.info()
+    }
+    if plot:
+        response['plot_json'] = _render_batch_plot(proxy, equation, a, b, [r['root'] for r in roots])
+    return response
+
+
+def controller_bisection_all_roots(data):
+    """
+    Busca todas las raíces de la ecuación en [a, b]. Con 'method': 'sweep'
+    (por defecto): un parseo, un barrido vectorizado para aislar los
+    intervalos y un refinamiento conjunto de todos ellos. Con 'chebyshev':
+    las raíces del interpolante de Chebyshev de f (f debe ser continua en
+    [a, b]). Solo incluye gráfica si se pide 'plot': true.
+    """
+    try:
+        required_fields = ['equation', 'a', 'b']
+        for field in required_fields:
+            if not data or field not in data:
+                logger.error(f'Falta el campo requerido: {field}')
+                return jsonify({'error': f'Falta el campo requerido: {field}'}), 400
+
+        equation = data['equation']
+        try:
+            a = float(data['a'])
+            b = float(data['b'])
+            max_iter = int(data.get('iterations', 100))
+            tol = float(data.get('tol', 1e-6))
+            num_points = int(data.get('num_points', 1000))
+        except (TypeError, ValueError):
+            logger.error('a, b y tol deben ser números; iterations y num_points, enteros.')
+            return jsonify({'error': 'a, b y tol deben ser números; iterations y num_points, enteros.'}), 400
+        if a >= b or num_points < 2:
+            return jsonify({'error': 'Se requiere a < b y num_points >= 2.'}), 400
+        if num_points > MAX_GRID_POINTS:
+            return jsonify({'error': f'num_points no puede ser mayor que {MAX_GRID_POINTS}.'}), 400
+        if not 1 <= max_iter <= MAX_REFINE_ITERATIONS:
+            return jsonify({'error': f'iterations debe estar entre 1 y {MAX_REFINE_ITERATIONS}.'}), 400
+        method = data.get('method', 'sweep')
+        if method not in ALL_ROOTS_METHODS:
+            return jsonify({'error': f"Método no soportado: {method}. Opciones: {', '.join(ALL_ROOTS_METHODS)}"}), 400
+
+        try:
+            f = CountingEvaluator(eq.parse_function(equation))
+        except Exception as e:
+            logger.error(f"Error al parsear la ecuación: {str(e)}")
+            return jsonify({'error': f"Error al parsear la ecuación: {str(e)}"}), 400
+
+        if method == 'chebyshev':
+            try:
+                response = _chebyshev_all_roots(f, equation, a, b, data.get('plot'))
+            except ValueError as ve:
+                logger.error(str(ve))
+                return jsonify({'error': str(ve)}), 400
+            response['method'] = method
+            response['function_evaluations'] = f.evaluations
+            return jsonify(response)
+
+        # Solo se buscan raíces dentro de [a, b]: sin ampliar la ventana
+        brackets, evaluations = eq.find_valid_intervals(f, a, b, num_points, max_expansions=0)
+        roots, spent = bisection.bisection_refine_brackets(f, brackets, max_iter, tol)
+        evaluations += spent
+        logger.info(f"Bisección (todas las raíces) en [{a}, {b}]: {len(roots)} raíces, {evaluations} evaluaciones")
+
+        response = {
+            'roots': roots,
+            'count': len(roots),
+            'evaluations': evaluations,
+            'method': method
+        }
+        if data.get('plot'):
+            response['plot_json'] = _render_batch_plot(f.f, equation, a, b, [r['root'] for r in roots])
+        response['function_evaluations'] = f.evaluations
+        return jsonify(response)
+
+    except Exception as e:
+        logger.exception("Error inesperado en el controlador de bisección (todas las raíces).")
+        return jsonify({'error': 'Ocurrió un error inesperado durante el cálculo.'}), 500
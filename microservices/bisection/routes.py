@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, render_template
 from .logic import bisection_controller
 import logging
 from microservices.app.util import equation as eq
+from microservices.app.util.evaluator import CountingEvaluator
 
 # Configuración del logger
 logger = logging.getLogger(__name__)
@@ -13,7 +14,17 @@ main = Blueprint('main', __name__)
 def bisection_endpoint():
     data = request.get_json()
     return bisection_controller.controller_bisection(data)
-    
+
+@main.route('/bisection/batch', methods=['POST'])
+def bisection_batch_endpoint():
+    data = request.get_json()
+    return bisection_controller.controller_bisection_batch(data)
+
+@main.route('/bisection/all_roots', methods=['POST'])
+def bisection_all_roots_endpoint():
+    data = request.get_json()
+    return bisection_controller.controller_bisection_all_roots(data)
+
 @main.route('/find_valid_interval', methods=['POST'])
 def find_valid_interval_route():
     try:
@@ -27,13 +38,38 @@ def find_valid_interval_route():
             return jsonify({'error': 'Falta el campo: equation'}), 400
 
         equation = data['equation']
-        expr, f = eq.parse_equation(equation)
-        # Buscar un intervalo válido en el cual la función cambie de signo
-        a, b = eq.find_valid_interval(f)
-        return jsonify({'a': a, 'b': b})
+        try:
+            start = float(data.get('start', -10))
+            end = float(data.get('end', 10))
+            num_points = int(data.get('num_points', 1000))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'start y end deben ser números y num_points un entero.'}), 400
+        if start >= end or num_points < 2:
+            return jsonify({'error': 'Se requiere start < end y num_points >= 2.'}), 400
+        if num_points > bisection_controller.MAX_GRID_POINTS:
+            return jsonify({'error': f'num_points no puede ser mayor que {bisection_controller.MAX_GRID_POINTS}.'}), 400
+
+        f = CountingEvaluator(eq.parse_function(equation))
+        # Buscar todos los intervalos en los que la función tiene una raíz
+        intervals, _ = eq.find_valid_intervals(f, start, end, num_points)
+        if not intervals:
+            raise ValueError("No se encontró un intervalo válido donde la función cambie de signo.")
+
+        response = {
+            'intervals': intervals,
+            'function_evaluations': f.evaluations
+        }
+        # a y b: el primer intervalo apto para bisección (compatibilidad con clientes
+        # anteriores). Si solo hay raíces sin cambio de signo ('touch' o 'exact') se
+        # omiten, porque /bisection rechazaría ese intervalo.
+        first = next((i for i in intervals if i['kind'] == 'sign_change'), None)
+        if first is not None:
+            response['a'] = first['a']
+            response['b'] = first['b']
+        return jsonify(response)
     except ValueError as e:
         logger.error(f"ValueError: {str(e)}")
         return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.exception("Error inesperado al buscar el intervalo.")
-        return jsonify({'error': 'Ocurrió un error inesperado al buscar el intervalo. Error:' + e}), 500
+        return jsonify({'error': 'Ocurrió un error inesperado al buscar el intervalo. Error: ' + str(e)}), 500
@@ -1,27 +1,10 @@
 from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 from microservices.app.util import equation as eq
 from . import euler
 import numpy as np
-import plotly
-import plotly.graph_objs as go
 import json
-import sympy as sp
-import re
 import logging
 
-# Definir las transformaciones
-transformations = (
-    standard_transformations +
-    (implicit_multiplication_application,) +
-    (convert_xor,)
-)
-
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
@@ -35,6 +18,8 @@ def controller_euler(data):
     Returns:
         tuple: Respuesta JSON con el resultado y visualización, o mensaje de error
     """
+    import plotly
+
     # Validar datos de entrada
     required_fields = ['equation', 'x0', 'y0', 'h', 'n']
     if not data or not all(field in data for field in required_fields):
@@ -115,6 +100,9 @@ def parse_differential_equation(equation_str):
     Returns:
         function: Función f(x,y) evaluable
     """
+    import sympy as sp
+    from sympy.parsing.sympy_parser import parse_expr
+
     try:
         # Preprocesar la ecuación
         processed_eq = eq.preprocess_equation(equation_str)
@@ -139,10 +127,10 @@ def parse_differential_equation(equation_str):
         
         # Parsear expresión
         expr = parse_expr(processed_eq, local_dict={'x': x, 'y': y, **allowed_funcs}, 
-                         transformations=transformations)
+                         transformations=eq.transformations)
         
-        # Crear función lambda
-        f_func = sp.lambdify((x, y), expr, modules=['numpy'])
+        # Crear función lambda (cse calcula una sola vez las subexpresiones repetidas)
+        f_func = sp.lambdify((x, y), expr, modules=['numpy'], cse=True)
         
         # Probar la función con valores de prueba
         test_result = f_func(1.0, 1.0)
@@ -159,6 +147,8 @@ def generate_euler_plot(x_values, y_values, x0, y0, h, equation_str, method_name
     """
     Genera visualización del método de Euler
     """
+    import plotly.graph_objs as go
+
     # Curva de solución aproximada
     solution_trace = go.Scatter(
         x=x_values,
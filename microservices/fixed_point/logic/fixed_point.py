@@ -1,22 +1,108 @@
-from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 import numpy as np
-import plotly
-import plotly.graph_objs as go
-import json
-import sympy as sp
-import re
 import logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
+# Motivos de parada de fixed_point_method
+STOP_REASONS = ('converged', 'max_iter', 'cycle', 'stagnation', 'divergence', 'non_finite')
+
+
+class _IterationMonitor:
+    """
+    Vigila la sucesión x_k de la iteración simple para detenerla en cuanto
+    el resultado es claro:
+
+    - cycle: ciclo de período >= 2 entre iterados cuantizados a `tol`
+      (algoritmo de Brent: tortuga fija que salta a la liebre en potencias de 2).
+    - divergence: |x| supera `bound`, los pasos |x_{k+1} - x_k| crecen
+      geométricamente durante `window` iteraciones, o no se contraen y van
+      todos en la misma dirección (deriva como g(x) = x + 1).
+    - stagnation: la razón de contracción estimada en la ventana no baja de
+      1 (|g'| >= 1 sin diverger) o es tan cercana a 1 que no alcanzarían las
+      iteraciones restantes ni con el doble del presupuesto.
+    """
+
+    def __init__(self, x0, tol, max_iter, window=50, bound=1e12):
+        self.tol = tol
+        self.max_iter = max_iter
+        self.window = window
+        self.bound = bound
+        self.steps = []
+        # Signo de x_{k+1} - x_k de cada paso
+        self.directions = []
+        self._previous = x0
+        self.contraction = None
+        self.cycle_period = None
+        # Estado del algoritmo de Brent
+        self._tortoise = self._quantize(x0)
+        self._power = 1
+        self._length = 1
+
+    def _quantize(self, x):
+        return round(x / self.tol)
+
+    def _is_cycle(self, period):
+        """
+        Descarta los falsos ciclos de una convergencia oscilante: en un ciclo
+        los puntos son distintos (paso mayor que la cuantización) y el paso
+        no se contrae a lo largo de un período.
+        """
+        if len(self.steps) <= period:
+            return False
+        last, before = self.steps[-1], self.steps[-1 - period]
+        return last > 10 * self.tol and abs(last / before - 1) < 1e-3
+
+    def update(self, i, x, step):
+        """Registra el iterado i y devuelve el motivo de parada o None."""
+        if abs(x) > self.bound:
+            return 'divergence'
+
+        self.steps.append(step)
+        self.directions.append(np.sign(x - self._previous))
+        self._previous = x
+        hare = self._quantize(x)
+        if hare == self._tortoise and self._length >= 2 and self._is_cycle(self._length):
+            self.cycle_period = self._length
+            return 'cycle'
+        if self._power == self._length:
+            self._tortoise = hare
+            self._power *= 2
+            self._length = 0
+        self._length += 1
+
+        if len(self.steps) <= self.window:
+            return None
+        first, last = self.steps[-self.window - 1], self.steps[-1]
+        if first == 0 or last == 0:
+            return None
+        self.contraction = (last / first) ** (1.0 / self.window)
+        growing = all(b > a for a, b in zip(self.steps[-self.window - 1:-1], self.steps[-self.window:]))
+        if self.contraction > 1 and growing:
+            return 'divergence'
+        if self.contraction >= 1 - 1e-9:
+            if len(set(self.directions[-self.window:])) == 1:
+                return 'divergence'
+            return 'stagnation'
+        needed = np.log(self.tol / last) / np.log(self.contraction)
+        if needed > 2 * (self.max_iter - i):
+            return 'stagnation'
+        return None
+
+
 def fixed_point_method(g, x0, max_iter, iteration_history, tol=1e-6):
+    """
+    Iteración simple x = g(x). Además de la convergencia (|x_{k+1} - x_k| < tol)
+    detecta ciclos, estancamiento y divergencia (ver _IterationMonitor) y se
+    detiene en cuanto alguno es claro.
+
+    Returns:
+        tuple: (x, convergió, iteraciones, historial, diagnóstico). El
+        diagnóstico tiene 'stop_reason' (ver STOP_REASONS), 'cycle_period' y
+        'contraction' (estimación de |g'|). x es None si g produjo un valor no finito.
+    """
     x_prev = x0
     converged = False
+    monitor = _IterationMonitor(float(x0), tol, max_iter)
+    diagnostics = {'stop_reason': 'max_iter', 'cycle_period': None, 'contraction': None}
     for i in range(1, max_iter + 1):
         try:
             x_next = g(x_prev)
@@ -33,10 +119,131 @@ def fixed_point_method(g, x0, max_iter, iteration_history, tol=1e-6):
             logger.info(f"Punto Fijo Iteración {i}: x = {x_next}, f(x) = {fx}, error = {error}")
             if error < tol:
                 converged = True
+                diagnostics['stop_reason'] = 'converged'
+                break
+            reason = monitor.update(i, float(x_next), float(error))
+            if reason is not None:
+                diagnostics['stop_reason'] = reason
+                logger.info(f"Punto Fijo detenido en la iteración {i}: {reason}")
                 break
             x_prev = x_next
         except Exception as e:
             logger.error(f"Error en la iteración {i} del método de Punto Fijo: {str(e)}")
-            return None, False, i, iteration_history
+            diagnostics['stop_reason'] = 'non_finite'
+            return None, False, i, iteration_history, diagnostics
+
+    diagnostics['cycle_period'] = monitor.cycle_period
+    diagnostics['contraction'] = monitor.contraction
+    return x_next, converged, i, iteration_history, diagnostics
+
+
+# Aceleraciones disponibles en /fixed_point
+ACCELERATIONS = ('aitken', 'steffensen')
+
+
+def _delta_squared(x0, x1, x2):
+    """
+    Extrapolación Δ² de Aitken a partir de x0, x1 = g(x0), x2 = g(x1).
+    Si la segunda diferencia se anula devuelve x2.
+    """
+    denominator = x2 - 2 * x1 + x0
+    if denominator == 0 or not np.isfinite(denominator):
+        return x2
+    return x0 - (x1 - x0) ** 2 / denominator
+
+
+def accelerated_fixed_point(g, x0, max_iter, iteration_history, tol=1e-6, acceleration='steffensen'):
+    """
+    Punto fijo acelerado con el proceso Δ² de Aitken.
+
+    - 'aitken': se itera x = g(x) normalmente y se extrapola cada terna de
+      iteraciones consecutivas; la convergencia se mide sobre la sucesión
+      extrapolada (una evaluación de g por iteración).
+    - 'steffensen': cada iteración calcula g(x) y g(g(x)) y reinicia desde
+      el valor extrapolado; converge cuadráticamente donde la iteración
+      simple converge linealmente (dos evaluaciones de g por iteración).
+
+    Returns:
+        tuple: (raíz, convergió, iteraciones, historial, estadísticas), con
+        'g_evaluations', 'contraction' (estimación de |g'| cerca del punto
+        fijo a partir de las primeras iteraciones, o None) y 'stop_reason'
+        ('converged', 'max_iter' o 'non_finite').
+    """
+    if acceleration not in ACCELERATIONS:
+        raise ValueError(f"Aceleración no soportada: {acceleration}. Opciones: {', '.join(ACCELERATIONS)}")
+
+    stats = {'g_evaluations': 0, 'contraction': None, 'stop_reason': 'max_iter'}
+
+    def evaluate(x, i):
+        value = float(g(x))
+        stats['g_evaluations'] += 1
+        if not np.isfinite(value):
+            raise ValueError(f"El método de Punto Fijo produjo un valor no finito en la iteración {i}.")
+        return value
+
+    def record(i, x, fx, error):
+        iteration_history.append({
+            'iteration': i,
+            'x': round(float(x), 6),
+            'fx': round(float(fx), 6),
+            'error': round(float(error), 6)
+        })
+        logger.info(f"Punto Fijo ({acceleration}) Iteración {i}: x = {x}, f(x) = {fx}, error = {error}")
+
+    def note_contraction(x0, x1, x2):
+        if stats['contraction'] is None and x1 != x0:
+            stats['contraction'] = abs((x2 - x1) / (x1 - x0))
+
+    x = float(x0)
+    i = 0
+    try:
+        if acceleration == 'steffensen':
+            for i in range(1, max_iter + 1):
+                x1 = evaluate(x, i)
+                x2 = evaluate(x1, i)
+                note_contraction(x, x1, x2)
+                x_next = _delta_squared(x, x1, x2)
+                error = abs(x_next - x)
+                record(i, x_next, x1 - x, error)
+                x = x_next
+                if error < tol:
+                    stats['stop_reason'] = 'converged'
+                    return x, True, i, iteration_history, stats
+            return x, False, max_iter, iteration_history, stats
+
+        # Aitken sobre la sucesión de la iteración simple
+        sequence = [x]
+        estimate = x
+        for i in range(1, max_iter + 1):
+            sequence.append(evaluate(sequence[-1], i))
+            sequence = sequence[-3:]
+            if len(sequence) == 3:
+                note_contraction(*sequence)
+                x_next = _delta_squared(*sequence)
+            else:
+                x_next = sequence[-1]
+            error = abs(x_next - estimate)
+            record(i, x_next, sequence[-1] - sequence[-2], error)
+            estimate = x_next
+            if error < tol and len(sequence) == 3:
+                stats['stop_reason'] = 'converged'
+                return estimate, True, i, iteration_history, stats
+        return estimate, False, max_iter, iteration_history, stats
+
+    except Exception as e:
+        logger.error(f"Error en la iteración {i} del método de Punto Fijo: {str(e)}")
+        stats['stop_reason'] = 'non_finite'
+        return None, False, i, iteration_history, stats
+
 
-    return x_next, converged, i, iteration_history
\ No newline at end of file
+def estimate_plain_iterations(contraction, first_step, tol=1e-6):
+    """
+    Iteraciones que necesitaría la iteración simple x = g(x) para que el paso
+    baje de `tol`, suponiendo convergencia lineal con razón `contraction`
+    (|x_{k+1} - x_k| ≈ first_step * contraction**k). None si no converge.
+    """
+    if contraction is None or not 0 < contraction < 1:
+        return None
+    if first_step <= tol:
+        return 1
+    return int(np.ceil(np.log(tol / first_step) / np.log(contraction))) + 1
@@ -1,31 +1,19 @@
 from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
-from . import fixed_point
+from . import fixed_point, fixed_point_system
 from microservices.app.util import equation as eq
+from microservices.app.util.evaluator import CountingEvaluator
 
 import numpy as np
-import plotly
-import plotly.graph_objs as go
 import json
-import sympy as sp
 import logging
 
-# Definir las transformaciones incluyendo 'convert_xor'
-transformations = (
-    standard_transformations +
-    (implicit_multiplication_application,) +
-    (convert_xor,)
-)
-
 # Configuración del logger
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 def controller_fixed(data):
+    import plotly
+    import plotly.graph_objs as go
+
     if not data or 'gFunction' not in data or 'initial_guess' not in data or 'iterations' not in data:
         return jsonify({'error': 'Faltan campos requeridos: gFunction, initial_guess, iterations'}), 400
     
@@ -42,6 +30,13 @@ def controller_fixed(data):
     except ValueError:
         return jsonify({'error': 'El número de iteraciones debe ser un entero válido'}), 400
     
+    # Aceleración opcional: 'aitken' o 'steffensen' (sin aceleración por defecto)
+    acceleration = data.get('acceleration') or None
+    if acceleration == 'none':
+        acceleration = None
+    if acceleration is not None and acceleration not in fixed_point.ACCELERATIONS:
+        return jsonify({'error': f"acceleration debe ser uno de: {', '.join(fixed_point.ACCELERATIONS)}."}), 400
+
     try:
         logger.info(f"Procesando función g(x): {gFunction}")
         
@@ -51,7 +46,9 @@ def controller_fixed(data):
         
         # Intentar parsear la función g(x)
         try:
-            g = eq.parse_g_function(gFunction)
+            # La gráfica usa la función sin contador: solo se cuentan las evaluaciones del método
+            g_plain = eq.parse_g_function(gFunction)
+            g = CountingEvaluator(g_plain)
         except Exception as e:
             logger.error(f"Error al parsear g(x): {str(e)}")
             return jsonify({'error': f'Error al procesar la función g(x): {str(e)}'}), 400
@@ -80,15 +77,41 @@ def controller_fixed(data):
         
         # Llamar al método de punto fijo
         logger.info(f"Iniciando método de punto fijo con x0={initial_guess}, max_iter={max_iter}")
-        root, converged, iterations, iteration_history = fixed_point.fixed_point_method(
-            g, initial_guess, max_iter, iteration_history
-        )
+        acceleration_info = {}
+        if acceleration is None:
+            root, converged, iterations, iteration_history, diagnostics = fixed_point.fixed_point_method(
+                g, initial_guess, max_iter, iteration_history
+            )
+            stop_info = {
+                'stop_reason': diagnostics['stop_reason'],
+                'cycle_period': diagnostics['cycle_period'],
+                'contraction_estimate': diagnostics['contraction']
+            }
+        else:
+            root, converged, iterations, iteration_history, stats = fixed_point.accelerated_fixed_point(
+                g, initial_guess, max_iter, iteration_history, acceleration=acceleration
+            )
+            # Ahorro frente a la iteración simple, estimado con la razón de contracción observada
+            plain_iterations = fixed_point.estimate_plain_iterations(
+                stats['contraction'], abs(float(g_x0) - initial_guess)
+            )
+            stop_info = {'stop_reason': stats['stop_reason']}
+            acceleration_info = {
+                'acceleration': acceleration,
+                'g_evaluations': stats['g_evaluations'],
+                'plain_iterations_estimate': plain_iterations,
+                'iterations_saved': plain_iterations - iterations if plain_iterations is not None else None,
+                'g_evaluations_saved': (plain_iterations - stats['g_evaluations']
+                                        if plain_iterations is not None else None)
+            }
         
         # Verificar si se encontró una raíz
         if root is None:
             return jsonify({
                 'error': 'El método no convergió. Intente con otro valor inicial o función g(x).',
-                'iteration_history': iteration_history
+                'iteration_history': iteration_history,
+                'stop_reason': stop_info['stop_reason'],
+                'function_evaluations': g.evaluations
             }), 400
         
         # Preparar datos para el gráfico
@@ -99,14 +122,8 @@ def controller_fixed(data):
         x_max = root + 2
         x_vals = np.linspace(x_min, x_max, 1000)
         
-        # Evaluar g(x) para cada punto del rango
-        g_vals = []
-        for x in x_vals:
-            try:
-                val = g(x)
-                g_vals.append(val)
-            except Exception:
-                g_vals.append(np.nan)
+        # Evaluar g(x) en todo el rango con una sola llamada
+        g_vals = eq.sample_function(g_plain, x_vals)
         
         # Traza para la función g(x)
         trace_function = go.Scatter(
@@ -199,7 +216,10 @@ def controller_fixed(data):
             'converged': converged,
             'iterations': iterations,
             'iteration_history': iteration_history,
-            'plot_json': graphJSON
+            'function_evaluations': g.evaluations,
+            'plot_json': graphJSON,
+            **stop_info,
+            **acceleration_info
         }
         
         return jsonify(response)
@@ -207,3 +227,77 @@ def controller_fixed(data):
     except Exception as e:
         logger.error(f"Error en controller_fixed: {str(e)}", exc_info=True)
         return jsonify({'error': f'Error interno: {str(e)}'}), 500
+
+
+# Límites de /fixed_point/system
+MAX_SYSTEM_SIZE = 200
+MAX_ANDERSON_DEPTH = 50
+
+
+def controller_fixed_system(data):
+    """
+    Punto fijo vectorial x = G(x). Recibe 'gFunctions' (una componente de G
+    por variable), 'variables' e 'initial_guess'; las componentes se compilan
+    juntas en una sola función vectorizada. 'm' es la profundidad de
+    Anderson (0: iteración simple).
+    """
+    try:
+        required_fields = ['gFunctions', 'variables', 'initial_guess']
+        for field in required_fields:
+            if not data or field not in data:
+                logger.error(f'Faltan campos requeridos: {field}')
+                return jsonify({'error': f'Faltan campos requeridos: {field}'}), 400
+
+        g_functions = data['gFunctions']
+        variables = data['variables']
+        if not isinstance(g_functions, list) or not isinstance(variables, list):
+            return jsonify({'error': 'gFunctions y variables deben ser listas.'}), 400
+        if len(variables) > MAX_SYSTEM_SIZE:
+            return jsonify({'error': f'El sistema no puede tener más de {MAX_SYSTEM_SIZE} incógnitas.'}), 400
+        try:
+            x0 = np.array([float(v) for v in data['initial_guess']])
+            max_iter = int(data.get('iterations', 500))
+            tol = float(data.get('tol', 1e-6))
+            m = int(data.get('m', 5))
+        except (TypeError, ValueError):
+            logger.error('initial_guess debe ser una lista de números, iterations y m enteros y tol un número.')
+            return jsonify({'error': 'initial_guess debe ser una lista de números, iterations y m enteros y tol un número.'}), 400
+        if x0.size != len(variables):
+            return jsonify({'error': 'initial_guess debe tener un valor por variable.'}), 400
+        if max_iter <= 0:
+            return jsonify({'error': 'El número de iteraciones debe ser positivo'}), 400
+        if not 0 <= m <= MAX_ANDERSON_DEPTH:
+            return jsonify({'error': f'm debe estar entre 0 y {MAX_ANDERSON_DEPTH}.'}), 400
+
+        try:
+            # Las componentes de G se compilan como un sistema (sin '=': cada expresión es G_i)
+            system = eq.get_compiled_system(g_functions, variables)
+            G = system.residual
+        except Exception as e:
+            logger.error(f"Error al parsear G(x): {str(e)}")
+            return jsonify({'error': f'Error al procesar las funciones g(x): {str(e)}'}), 400
+
+        try:
+            result = fixed_point_system.anderson_fixed_point(G, x0, max_iter, tol, m=m)
+        except ValueError as ve:
+            logger.error(str(ve))
+            return jsonify({'error': str(ve)}), 400
+
+        x = result['x']
+        return jsonify({
+            'solution': {name: float(value) for name, value in zip(system.variables, x)},
+            'x': [float(value) for value in x],
+            'converged': result['converged'],
+            'iterations': result['iterations'],
+            'residual_norm': result['residual_norm'],
+            'iteration_history': result['iteration_history'],
+            'm': m,
+            'g_evaluations': result['g_evaluations'],
+            'least_squares_solves': result['least_squares_solves'],
+            # Cada evaluación de G evalúa todas sus componentes
+            'function_evaluations': result['g_evaluations']
+        })
+
+    except Exception as e:
+        logger.exception("Error inesperado en el controlador de punto fijo vectorial.")
+        return jsonify({'error': 'Ocurrió un error inesperado durante el cálculo.'}), 500
@@ -0,0 +1,87 @@
+import numpy as np
+import logging
+from collections import deque
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def anderson_fixed_point(G, x0, max_iter, tol=1e-6, m=5, iteration_history=None):
+    """
+    Punto fijo vectorial x = G(x) con aceleración de Anderson(m).
+
+    Guarda las diferencias de los últimos `m` residuos f = G(x) - x y de los
+    valores de G; en cada iteración resuelve por mínimos cuadrados
+    min ||f_k - ΔF γ|| y toma x_{k+1} = G(x_k) - ΔG γ. Con m = 0 es la
+    iteración simple (Picard). Si la mezcla produce un punto no evaluable,
+    se descarta la historia y se da un paso simple.
+    Converge cuando ||G(x) - x||_inf < tol.
+
+    Returns:
+        dict: 'x', 'converged', 'iterations', 'iteration_history',
+        'residual_norm', 'g_evaluations' y 'least_squares_solves'.
+    """
+    if iteration_history is None:
+        iteration_history = []
+
+    x = np.array(x0, dtype=float)
+    gx = G(x)
+    stats = {'g_evaluations': 1, 'least_squares_solves': 0}
+    if not np.all(np.isfinite(gx)):
+        raise ValueError("G(x) no es evaluable en el punto inicial.")
+    fx = gx - x
+    residual = float(np.max(np.abs(fx)))
+
+    delta_f = deque(maxlen=m)
+    delta_g = deque(maxlen=m)
+    converged = residual < tol
+    iterations = 0
+    for i in range(1, max_iter + 1):
+        if converged:
+            break
+        iterations = i
+
+        x_next = gx
+        if delta_f:
+            dF = np.column_stack(delta_f)
+            dG = np.column_stack(delta_g)
+            gamma = np.linalg.lstsq(dF, fx, rcond=None)[0]
+            stats['least_squares_solves'] += 1
+            x_next = gx - dG @ gamma
+
+        g_next = G(x_next)
+        stats['g_evaluations'] += 1
+        if not np.all(np.isfinite(g_next)) and delta_f:
+            # La mezcla salió del dominio: reiniciar la historia con un paso simple
+            delta_f.clear()
+            delta_g.clear()
+            x_next = gx
+            g_next = G(x_next)
+            stats['g_evaluations'] += 1
+        if not np.all(np.isfinite(g_next)):
+            logger.error(f"Anderson: G(x) no es finita en la iteración {i}.")
+            break
+
+        f_next = g_next - x_next
+        if m > 0:
+            delta_f.append(f_next - fx)
+            delta_g.append(g_next - gx)
+        step = float(np.max(np.abs(x_next - x)))
+        x, gx, fx = x_next, g_next, f_next
+        residual = float(np.max(np.abs(fx)))
+        iteration_history.append({
+            'iteration': i,
+            'x': [round(float(v), 6) for v in x],
+            'residual_norm': residual,
+            'step_norm': step
+        })
+        logger.info(f"Anderson({m}) Iteración {i}: ||G(x) - x|| = {residual}, paso = {step}")
+        converged = residual < tol
+
+    return {
+        'x': x,
+        'converged': bool(converged),
+        'iterations': iterations,
+        'iteration_history': iteration_history,
+        'residual_norm': residual,
+        **stats
+    }
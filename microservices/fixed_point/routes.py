@@ -16,3 +16,8 @@ def index():
 def fixed_point_endpoint():
     data = request.get_json()
     return fixed_point_controller.controller_fixed(data)
+
+@main.route('/fixed_point/system', methods=['POST'])
+def fixed_point_system_endpoint():
+    data = request.get_json()
+    return fixed_point_controller.controller_fixed_system(data)
@@ -1,27 +1,11 @@
 from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 from . import gauss_seidel
 from microservices.app.util import equation as eq
 
 import numpy as np
-import plotly
-import plotly.graph_objs as go
 import json
-import sympy as sp
-import re
 import logging
 
-# Definir las transformaciones incluyendo 'convert_xor'
-transformations = (
-    standard_transformations +
-    (implicit_multiplication_application,) +
-    (convert_xor,)
-)
 # Configuración del logger
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -37,6 +21,9 @@ def generate_gauss_seidel_plot(iteration_history, variables):
     Returns:
         plotly.graph_objs.Figure: Figura de Plotly con la visualización
     """
+    import plotly
+    import plotly.graph_objs as go
+
     # Paleta de colores para las variables
     color_palette = [
         'rgb(31, 119, 180)',   # Azul
@@ -151,6 +138,8 @@ def controller_gauss(data):
     Returns:
         flask.Response: Respuesta JSON con resultados y gráfica
     """
+    import plotly
+
     logger.debug(f"Datos recibidos: {data}")
     
     # Validación de campos requeridos
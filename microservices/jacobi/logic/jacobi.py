@@ -1,19 +1,3 @@
-from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
-import numpy as np
-import plotly
-import plotly.graph_objs as go
-import json
-import sympy as sp
-import re
-import logging
-logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 import numpy as np
 import logging
 
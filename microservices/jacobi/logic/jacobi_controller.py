@@ -1,16 +1,7 @@
 from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 from . import jacobi
 import numpy as np
-import plotly
-import plotly.graph_objs as go
 import json
-import sympy as sp
 import logging
 from microservices.app.util import equation as eq
 
@@ -28,6 +19,9 @@ def generate_jacobi_plot(iteration_history, variables):
     Returns:
         plotly.graph_objs.Figure: Figura de Plotly con la visualización
     """
+    import plotly
+    import plotly.graph_objs as go
+
     # Paleta de colores para las variables
     color_palette = [
         'rgb(31, 119, 180)',   # Azul
@@ -139,6 +133,8 @@ def controller_jacobi(data):
     Returns:
         flask.Response: Respuesta JSON con resultados y gráfica
     """
+    import plotly
+
     logger.debug(f"Datos recibidos: {data}")
     
     # Validación de campos requeridos
@@ -1,15 +1,9 @@
 from flask import Blueprint, request, jsonify
-from sympy.parsing.sympy_parser import (
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
-from . import newton_raphson
-from microservices.app.util import equation as eq
+from . import newton_raphson, newton_system, sparse_jacobian
+from microservices.app.util import equation as eq, polynomial
+from microservices.app.util.evaluator import CountingEvaluator
 
 import numpy as np
-import plotly
-import plotly.graph_objs as go
 import json
 import logging
 
@@ -17,7 +11,15 @@ import logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Orden de la derivada más alta que usa cada método (evaluaciones fusionadas
+# de order + 1 valores por iteración)
+NEWTON_METHODS = {'newton': 1, 'halley': 2, 'householder3': 3}
+
+
 def controller_newton(data):
+    import plotly
+    import plotly.graph_objs as go
+
     try:
         # Verificar si faltan campos requeridos
         required_fields = ['equation', 'initial_guess', 'iterations']
@@ -35,10 +37,24 @@ def controller_newton(data):
             logger.error('initial_guess debe ser un número y iterations debe ser un entero.')
             return jsonify({'error': 'initial_guess debe ser un número y iterations debe ser un entero.'}), 400
 
-        # Parsear la función f(x) y su derivada f'(x)
+        method = data.get('method', 'newton')
+        if method not in NEWTON_METHODS:
+            return jsonify({'error': f"method debe ser uno de: {', '.join(NEWTON_METHODS)}."}), 400
+        order = NEWTON_METHODS[method]
+
+        # Derivada simbólica (sp.diff) o diferenciación automática
+        derivative = data.get('derivative', 'symbolic')
+        if derivative not in eq.DERIVATIVE_MODES:
+            return jsonify({'error': f"derivative debe ser uno de: {', '.join(eq.DERIVATIVE_MODES)}."}), 400
+        if derivative == 'autodiff' and order > 1:
+            return jsonify({'error': "derivative='autodiff' solo está disponible con method='newton'."}), 400
+
+        # Parsear la función f(x) y sus derivadas hasta el orden del método
         try:
-            expr, f = eq.parse_equation(equation)
-            f_prime = eq.parse_derivative_equation(equation)
+            # La gráfica usa la función sin contador: solo se cuentan las evaluaciones del método
+            f_plain = eq.parse_function(equation)
+            f = CountingEvaluator(f_plain)
+            f_fused = CountingEvaluator(eq.parse_fused_equation(equation, order=order, derivative=derivative))
         except Exception as e:
             logger.error(f"Error al parsear la ecuación o su derivada: {str(e)}")
             return jsonify({'error': f"Error al parsear la ecuación o su derivada: {str(e)}"}), 400
@@ -46,11 +62,16 @@ def controller_newton(data):
         # Inicializar el historial de iteraciones
         iteration_history = []
 
-        # Ejecutar el método de Newton-Raphson
+        # Ejecutar el método de Newton-Raphson (o de Householder de orden superior)
         try:
-            root, converged, iterations, iteration_history = newton_raphson.newton_raphsonMethod(
-                f, f_prime, initial_guess, max_iter, iteration_history
-            )
+            if method == 'newton':
+                root, converged, iterations, iteration_history = newton_raphson.newton_raphsonMethod(
+                    f, None, initial_guess, max_iter, iteration_history, fused=f_fused
+                )
+            else:
+                root, converged, iterations, iteration_history = newton_raphson.householder_method(
+                    f_fused, initial_guess, max_iter, order, iteration_history
+                )
         except ValueError as ve:
             logger.error(str(ve))
             return jsonify({'error': str(ve)}), 400
@@ -67,20 +88,14 @@ def controller_newton(data):
                 
                 # Evaluamos en varios puntos para encontrar valores interesantes de la función
                 test_points = np.linspace(x_min, x_max, 100)
-                y_values = []
-                for x in test_points:
-                    try:
-                        y = f(x)
-                        if -1000 < y < 1000:  # Filtrar valores extremos
-                            y_values.append(y)
-                    except:
-                        pass
+                test_values = eq.sample_function(f, test_points)
+                y_values = test_values[np.abs(test_values) < 1000]  # Filtrar valores extremos
                 
-                if not y_values:
+                if y_values.size == 0:
                     return x_min, x_max  # Si no hay valores válidos, usar rango inicial
                 
                 # Ajuste de rangos basado en las características de la función
-                y_min, y_max = min(y_values), max(y_values)
+                y_min, y_max = y_values.min(), y_values.max()
                 y_range = y_max - y_min
                 
                 # Ampliar el rango para mostrar la forma de la función
@@ -90,17 +105,13 @@ def controller_newton(data):
                 else:
                     # Para funciones con cambios grandes, ajustar para ver bien las características
                     # Buscar puntos de inflexión o cambios importantes
-                    inflection_points = []
-                    for i in range(1, len(test_points) - 1):
-                        try:
-                            left_slope = (f(test_points[i]) - f(test_points[i-1])) / (test_points[i] - test_points[i-1])
-                            right_slope = (f(test_points[i+1]) - f(test_points[i])) / (test_points[i+1] - test_points[i])
-                            if (left_slope * right_slope < 0) or abs(right_slope - left_slope) > 10:
-                                inflection_points.append(test_points[i])
-                        except:
-                            pass
+                    slopes = np.diff(test_values) / np.diff(test_points)
+                    left_slope, right_slope = slopes[:-1], slopes[1:]
+                    inflection_points = test_points[1:-1][
+                        (left_slope * right_slope < 0) | (np.abs(right_slope - left_slope) > 10)
+                    ]
                     
-                    if inflection_points:
+                    if inflection_points.size:
                         # Incluir los puntos de inflexión y un margen
                         x_min = min(inflection_points) - 5
                         x_max = max(inflection_points) + 5
@@ -155,23 +166,13 @@ def controller_newton(data):
                 )
 
             # Determinar un rango apropiado para la gráfica
-            plot_a, plot_b = determine_plot_range(f, root)
+            plot_a, plot_b = determine_plot_range(f_plain, root)
             
             # Generar puntos para la gráfica usando más puntos en regiones con cambios rápidos
             num_points = 2000  # Mayor número de puntos para mejor resolución
             x_vals = np.linspace(plot_a, plot_b, num_points)
-            y_vals = []
-            
-            # Evaluar la función en cada punto con manejo de errores
-            for x in x_vals:
-                try:
-                    y = f(x)
-                    # Filtrar valores extremos para evitar distorsión en la gráfica
-                    if abs(y) > 1000:
-                        y = np.nan
-                    y_vals.append(y)
-                except:
-                    y_vals.append(np.nan)
+            # Una evaluación vectorizada; los valores extremos se filtran para evitar distorsión
+            y_vals = eq.sample_function(f_plain, x_vals, limit=1000)
             
             # Trace de la función f(x)
             trace_function = go.Scatter(
@@ -185,7 +186,7 @@ def controller_newton(data):
 
             # Trace del punto raíz
             try:
-                root_y = f(root)
+                root_y = f_plain(root)
                 root_trace = go.Scatter(
                     x=[root],
                     y=[root_y],
@@ -266,6 +267,10 @@ def controller_newton(data):
                 'converged': converged,
                 'iterations': iterations,
                 'iteration_history': iteration_history,
+                'method': method,
+                'derivative': derivative,
+                'evaluations_per_iteration': order + 1,
+                'function_evaluations': f.evaluations + f_fused.evaluations,
                 'plot_json': graphJSON
             }
 
@@ -278,4 +283,246 @@ def controller_newton(data):
 
     except Exception as e:
         logger.exception("Error inesperado en el controlador de Newton-Raphson.")
-        return jsonify({'error': 'Ocurrió un error inesperado durante el cálculo.'}), 500
\ No newline at end of file
+        return jsonify({'error': 'Ocurrió un error inesperado durante el cálculo.'}), 500
+
+# Máximo de puntos iniciales por petición en /newton_raphson/multistart
+MAX_STARTS = 10000
+
+
+def controller_newton_multistart(data):
+    """
+    Newton-Raphson desde muchos puntos iniciales: 'initial_guesses' (lista) o
+    'range' [x_min, x_max] con 'count' puntos equiespaciados. Devuelve las
+    raíces distintas y qué arranques convergieron a cada una (cuencas de
+    atracción).
+    """
+    try:
+        if not data or 'equation' not in data:
+            return jsonify({'error': 'Faltan campos requeridos: equation'}), 400
+
+        # El número de arranques se valida antes de construir el arreglo
+        too_many = jsonify({'error': f'Se requieren entre 1 y {MAX_STARTS} puntos iniciales.'}), 400
+        try:
+            if 'initial_guesses' in data:
+                if not 1 <= len(data['initial_guesses']) <= MAX_STARTS:
+                    return too_many
+                starts = np.array([float(x) for x in data['initial_guesses']])
+            elif 'range' in data:
+                x_min, x_max = (float(v) for v in data['range'])
+                count = int(data.get('count', 50))
+                if not 1 <= count <= MAX_STARTS:
+                    return too_many
+                starts = np.linspace(x_min, x_max, count)
+            else:
+                return jsonify({'error': "Se requiere 'initial_guesses' o 'range' con 'count'."}), 400
+            max_iter = int(data.get('iterations', 50))
+            tol = float(data.get('tol', 1e-6))
+        except (TypeError, ValueError, OverflowError):
+            logger.error('Los puntos iniciales y tol deben ser números; count e iterations, enteros.')
+            return jsonify({'error': 'Los puntos iniciales y tol deben ser números; count e iterations, enteros.'}), 400
+        derivative = data.get('derivative', 'symbolic')
+        if derivative not in eq.DERIVATIVE_MODES:
+            return jsonify({'error': f"derivative debe ser uno de: {', '.join(eq.DERIVATIVE_MODES)}."}), 400
+
+        try:
+            f_fused = CountingEvaluator(eq.parse_fused_equation(data['equation'], derivative=derivative))
+        except Exception as e:
+            logger.error(f"Error al parsear la ecuación o su derivada: {str(e)}")
+            return jsonify({'error': f"Error al parsear la ecuación o su derivada: {str(e)}"}), 400
+
+        result = newton_raphson.newton_multistart(f_fused, starts, max_iter, tol)
+        status = result['status']
+        evaluations = result['evaluations']
+
+        # Agrupar las raíces a las que convergieron los arranques
+        converged = np.flatnonzero(status == 'converged')
+        roots = []
+        root_of_start = {}
+        if converged.size:
+            x_conv = result['x'][converged]
+            residuals = np.abs(f_fused(x_conv)[0])
+            evaluations += x_conv.size
+            for members in newton_raphson.group_roots(x_conv, tol=max(10 * tol, 1e-12)):
+                best = min(members, key=lambda m: residuals[m])
+                for m in members:
+                    root_of_start[int(converged[m])] = len(roots)
+                roots.append({
+                    'root': float(x_conv[best]),
+                    'residual': float(residuals[best]),
+                    'starts': [float(starts[converged[m]]) for m in members],
+                    'count': len(members)
+                })
+
+        basins = [
+            {
+                'x0': float(starts[i]),
+                'status': status[i],
+                'root_index': root_of_start.get(i),
+                'iterations': int(result['iterations'][i])
+            }
+            for i in range(starts.size)
+        ]
+
+        return jsonify({
+            'roots': roots,
+            'basins': basins,
+            'converged_starts': int(converged.size),
+            'diverged_starts': int(np.sum(status == 'diverged')),
+            'evaluations': evaluations,
+            'function_evaluations': f_fused.evaluations
+        })
+
+    except Exception as e:
+        logger.exception("Error inesperado en el controlador de Newton-Raphson multiarranque.")
+        return jsonify({'error': 'Ocurrió un error inesperado durante el cálculo.'}), 500
+
+
+# Máximo de incógnitas por petición en /newton_raphson/system (Jacobiana
+# simbólica densa o dispersa por diferencias finitas)
+MAX_SYSTEM_SIZE = 200
+MAX_SPARSE_SYSTEM_SIZE = 2000
+
+JACOBIAN_MODES = ('symbolic', 'sparse_fd')
+
+# Métodos para sistemas: Newton (Jacobiana en cada paso) o Broyden con actualización good/bad
+SYSTEM_METHODS = ('newton', 'broyden_good', 'broyden_bad')
+
+
+def controller_newton_system(data):
+    """
+    Newton con búsqueda lineal para sistemas no lineales. Recibe 'equations'
+    (lista de 'lhs = rhs' o expresiones igualadas a cero), 'variables'
+    (nombres de las incógnitas) e 'initial_guess' (un valor por variable).
+    'method' elige Newton o Broyden (ver SYSTEM_METHODS) y 'jacobian' la
+    Jacobiana simbólica densa o la dispersa por diferencias finitas.
+    """
+    try:
+        required_fields = ['equations', 'variables', 'initial_guess']
+        for field in required_fields:
+            if not data or field not in data:
+                logger.error(f'Faltan campos requeridos: {field}')
+                return jsonify({'error': f'Faltan campos requeridos: {field}'}), 400
+
+        equations = data['equations']
+        variables = data['variables']
+        if not isinstance(equations, list) or not isinstance(variables, list):
+            return jsonify({'error': 'equations y variables deben ser listas.'}), 400
+        jacobian = data.get('jacobian', 'symbolic')
+        if jacobian not in JACOBIAN_MODES:
+            return jsonify({'error': f"jacobian debe ser uno de: {', '.join(JACOBIAN_MODES)}."}), 400
+        max_size = MAX_SPARSE_SYSTEM_SIZE if jacobian == 'sparse_fd' else MAX_SYSTEM_SIZE
+        if len(variables) > max_size:
+            return jsonify({'error': f'El sistema no puede tener más de {max_size} incógnitas.'}), 400
+        try:
+            x0 = np.array([float(v) for v in data['initial_guess']])
+            max_iter = int(data.get('iterations', 50))
+            tol = float(data.get('tol', 1e-8))
+        except (TypeError, ValueError):
+            logger.error('initial_guess debe ser una lista de números, iterations un entero y tol un número.')
+            return jsonify({'error': 'initial_guess debe ser una lista de números, iterations un entero y tol un número.'}), 400
+        if x0.size != len(variables):
+            return jsonify({'error': 'initial_guess debe tener un valor por variable.'}), 400
+        method = data.get('method', 'newton')
+        if method not in SYSTEM_METHODS:
+            return jsonify({'error': f"method debe ser uno de: {', '.join(SYSTEM_METHODS)}."}), 400
+
+        try:
+            system = eq.get_compiled_system(equations, variables)
+            if jacobian == 'sparse_fd':
+                rows, cols = system.sparsity
+                fd = sparse_jacobian.FiniteDifferenceJacobian(system.residual, rows, cols, len(system.variables))
+                F, J = fd.residual, fd
+            else:
+                fd = None
+                F, J = system.residual, system.jacobian
+        except Exception as e:
+            logger.error(f"Error al parsear el sistema de ecuaciones: {str(e)}")
+            return jsonify({'error': f"Error al parsear el sistema de ecuaciones: {str(e)}"}), 400
+
+        try:
+            if method == 'newton':
+                result = newton_system.newton_system(F, J, x0, max_iter, tol)
+            else:
+                update = method.split('_')[1]
+                result = newton_system.broyden_system(F, J, x0, max_iter, tol, update=update)
+        except ValueError as ve:
+            logger.error(str(ve))
+            return jsonify({'error': str(ve)}), 400
+
+        x = result['x']
+        extra = {}
+        if fd is not None:
+            # Las evaluaciones de las diferencias finitas también son evaluaciones del residuo
+            result['residual_evaluations'] += fd.evaluations
+            extra = {'colors': fd.num_colors, 'nonzeros': int(fd.rows.size)}
+        return jsonify({
+            'solution': {name: float(value) for name, value in zip(system.variables, x)},
+            'x': [float(value) for value in x],
+            'method': method,
+            'jacobian': jacobian,
+            'converged': result['converged'],
+            'iterations': result['iterations'],
+            'residual_norm': result['residual_norm'],
+            'iteration_history': result['iteration_history'],
+            'residual_evaluations': result['residual_evaluations'],
+            'jacobian_evaluations': result['jacobian_evaluations'],
+            'linear_solves': result['linear_solves'],
+            # Cada evaluación del residuo evalúa las n ecuaciones
+            'function_evaluations': result['residual_evaluations'],
+            **extra
+        })
+
+    except Exception as e:
+        logger.exception("Error inesperado en el controlador de Newton para sistemas.")
+        return jsonify({'error': 'Ocurrió un error inesperado durante el cálculo.'}), 500
+
+
+def controller_newton_all_roots(data):
+    """
+    Todas las raíces de una ecuación polinómica en una sola petición:
+    valores propios de la matriz compañera pulidos con Newton. Con
+    'complex': true también devuelve las raíces complejas.
+    """
+    try:
+        if not data or 'equation' not in data:
+            return jsonify({'error': 'Faltan campos requeridos: equation'}), 400
+        include_complex = bool(data.get('complex', False))
+        try:
+            polish_steps = int(data.get('polish_steps', 2))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'polish_steps debe ser un entero.'}), 400
+        if not 0 <= polish_steps <= 10:
+            return jsonify({'error': 'polish_steps debe estar entre 0 y 10.'}), 400
+
+        try:
+            coefficients = eq.parse_polynomial(data['equation'])
+        except Exception as e:
+            logger.error(f"Error al parsear la ecuación: {str(e)}")
+            return jsonify({'error': f"Error al parsear la ecuación: {str(e)}"}), 400
+        if coefficients is None:
+            return jsonify({'error': 'La ecuación no es un polinomio en x; use /bisection/all_roots '
+                                     'o /newton_raphson/multistart.'}), 400
+
+        coefficients = np.trim_zeros(coefficients, 'f')
+        p = CountingEvaluator(lambda z: np.polyval(coefficients, z))
+        try:
+            real_roots, complex_roots = polynomial.polynomial_roots(
+                coefficients, polish_steps=polish_steps, p=p
+            )
+        except ValueError as ve:
+            return jsonify({'error': str(ve)}), 400
+
+        response = {
+            'degree': max(int(coefficients.size) - 1, 0),
+            'coefficients': [float(c) for c in coefficients],
+            'roots': real_roots,
+            'count': len(real_roots),
+            'function_evaluations': p.evaluations
+        }
+        if include_complex:
+            response['complex_roots'] = complex_roots
+        return jsonify(response)
+
+    except Exception as e:
+        logger.exception("Error inesperado en el controlador de raíces de polinomios.")
+        return jsonify({'error': 'Ocurrió un error inesperado durante el cálculo.'}), 500
@@ -1,28 +1,23 @@
-from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 import numpy as np
-import plotly
-import plotly.graph_objs as go
-import json
-import sympy as sp
-import re
 import logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
-def newton_raphsonMethod(f, f_prime, x0, max_iter, iteration_history=None, tol=1e-6):
+def newton_raphsonMethod(f, f_prime, x0, max_iter, iteration_history=None, tol=1e-6, fused=None):
+    """
+    Si se pasa `fused` (ver equation.parse_fused_equation), f y f' se obtienen
+    juntas con una sola evaluación por iteración y `f_prime` puede ser None.
+    """
     if iteration_history is None:
         iteration_history = []
 
     x_prev = x0
     for i in range(1, max_iter + 1):
         try:
-            fx = f(x_prev)
-            fpx = f_prime(x_prev)
+            if fused is not None:
+                fx, fpx = fused(x_prev)
+            else:
+                fx = f(x_prev)
+                fpx = f_prime(x_prev)
             if fpx == 0:
                 raise ZeroDivisionError(f"La derivada es cero en x = {x_prev}.")
             x_next = x_prev - fx / fpx
@@ -40,4 +35,125 @@ def newton_raphsonMethod(f, f_prime, x0, max_iter, iteration_history=None, tol=1
         except Exception as e:
             logger.error(f"Error en la iteración {i} del método Newton-Raphson: {str(e)}")
             return None, False, i, iteration_history
-    return x_prev, False, max_iter, iteration_history
\ No newline at end of file
+    return x_prev, False, max_iter, iteration_history
+
+def _householder_step(values):
+    """
+    Corrección de Householder de orden d = len(values) - 1 a partir de
+    (f, f', ..., f^(d)): d=1 es Newton, d=2 Halley y d=3 Householder de
+    tercer orden (convergencia de orden d + 1).
+    """
+    if len(values) == 2:
+        fx, f1 = values
+        return fx / f1
+    if len(values) == 3:
+        fx, f1, f2 = values
+        return 2 * fx * f1 / (2 * f1 ** 2 - fx * f2)
+    fx, f1, f2, f3 = values
+    return (6 * fx * f1 ** 2 - 3 * fx ** 2 * f2) / (6 * f1 ** 3 - 6 * fx * f1 * f2 + fx ** 2 * f3)
+
+
+def householder_method(fused, x0, max_iter, order, iteration_history=None, tol=1e-6):
+    """
+    Método de Householder de orden `order` (2: Halley, 3: Householder).
+
+    `fused` debe devolver (f, f', ..., f^(order)) en una sola llamada (ver
+    equation.parse_fused_equation), así cada iteración cuesta una evaluación
+    fusionada de order + 1 valores.
+
+    Returns:
+        tuple: (raíz, convergió, iteraciones, historial)
+    """
+    if iteration_history is None:
+        iteration_history = []
+
+    x_prev = x0
+    for i in range(1, max_iter + 1):
+        try:
+            values = fused(x_prev)
+            fx = values[0]
+            # Raíz exacta: el paso es cero y la iteración también se registra
+            step = 0.0 if fx == 0 else _householder_step(values)
+            if not np.isfinite(step):
+                raise ZeroDivisionError(f"La corrección no es finita en x = {x_prev}.")
+            x_next = x_prev - step
+            error = abs(step)
+            iteration_history.append({
+                'iteration': i,
+                'x': round(float(x_next), 6),
+                'fx': round(float(fx), 6),
+                'error': round(float(error), 6)
+            })
+            logger.info(f"Householder (orden {order}) Iteración {i}: x = {x_next}, f(x) = {fx}, error = {error}")
+            if error < tol:
+                return x_next, True, i, iteration_history
+            x_prev = x_next
+        except Exception as e:
+            logger.error(f"Error en la iteración {i} del método de Householder: {str(e)}")
+            return None, False, i, iteration_history
+    return x_prev, False, max_iter, iteration_history
+
+
+def newton_multistart(fused, x0, max_iter, tol=1e-6, divergence_bound=1e12):
+    """
+    Newton-Raphson desde muchos puntos iniciales a la vez.
+
+    `fused` debe devolver (f, f') para un arreglo de x (ver
+    equation.parse_fused_equation). Cada carril se detiene al converger
+    (|paso| < tol) o al divergir (f o f' no finitos, f' = 0 o |x| mayor que
+    `divergence_bound`); en cada iteración solo se evalúan los carriles activos.
+
+    Returns:
+        dict: arreglos 'x' (última aproximación), 'status' ('converged',
+        'diverged' o 'max_iter'), 'iterations' y 'evaluations' (total).
+    """
+    x = np.array(x0, dtype=float).ravel()
+    status = np.full(x.size, 'max_iter', dtype=object)
+    iterations = np.zeros(x.size, dtype=int)
+    active = np.isfinite(x)
+    status[~active] = 'diverged'
+    evaluations = 0
+
+    for i in range(1, max_iter + 1):
+        lanes = np.flatnonzero(active)
+        if lanes.size == 0:
+            break
+        fx, fpx = fused(x[lanes])
+        evaluations += lanes.size
+
+        with np.errstate(all='ignore'):
+            step = fx / fpx
+            x_next = x[lanes] - step
+        bad = ~np.isfinite(fx) | ~np.isfinite(fpx) | (fpx == 0) | ~np.isfinite(x_next) \
+            | (np.abs(x_next) > divergence_bound)
+        status[lanes[bad]] = 'diverged'
+        active[lanes[bad]] = False
+
+        ok = ~bad
+        x[lanes[ok]] = x_next[ok]
+        iterations[lanes[ok]] = i
+        done = ok & (np.abs(step) < tol)
+        status[lanes[done]] = 'converged'
+        active[lanes[done]] = False
+
+    logger.info(f"Newton multiarranque: {x.size} arranques, "
+                f"{int(np.sum(status == 'converged'))} convergieron, {evaluations} evaluaciones")
+    return {'x': x, 'status': status, 'iterations': iterations, 'evaluations': evaluations}
+
+
+def group_roots(roots, tol=1e-6):
+    """
+    Agrupa raíces que difieren en menos de `tol` (relativo para |x| > 1).
+
+    Returns:
+        list: una lista de índices (de `roots`) por cada raíz distinta, en orden creciente.
+    """
+    roots = np.asarray(roots, dtype=float)
+    order = np.argsort(roots)
+    groups = []
+    for index in order:
+        if groups and abs(roots[index] - roots[groups[-1][-1]]) <= tol * max(1.0, abs(roots[index])):
+            groups[-1].append(int(index))
+        else:
+            groups.append([int(index)])
+    return groups
@@ -0,0 +1,290 @@
+import numpy as np
+import logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def _norm(v):
+    return float(np.linalg.norm(v, ord=np.inf))
+
+
+def _is_sparse(Jx):
+    return hasattr(Jx, 'tocsc')
+
+
+def _all_finite(Jx):
+    return bool(np.all(np.isfinite(Jx.data if _is_sparse(Jx) else Jx)))
+
+
+def _solve(Jx, rhs):
+    """Resuelve Jx dx = rhs (Jx densa o de scipy.sparse)."""
+    if _is_sparse(Jx):
+        from scipy.sparse.linalg import spsolve, lsqr
+
+        with np.errstate(all='ignore'):
+            dx = spsolve(Jx.tocsc(), rhs)
+        if not np.all(np.isfinite(dx)):
+            # Jacobiana singular: paso de mínimos cuadrados
+            dx = lsqr(Jx, rhs)[0]
+        return dx
+    try:
+        return np.linalg.solve(Jx, rhs)
+    except np.linalg.LinAlgError:
+        # Jacobiana singular: paso de mínimos cuadrados
+        return np.linalg.lstsq(Jx, rhs, rcond=None)[0]
+
+
+def _line_search(F, x, fx, direction, armijo=1e-4, min_step=1e-10):
+    """
+    Búsqueda lineal por retroceso sobre ||F||: parte del paso completo y lo
+    divide a la mitad hasta que la norma del residuo baje lo suficiente
+    (condición de Armijo) y sea finita.
+
+    Returns:
+        tuple: (t, x_nuevo, F(x_nuevo), evaluaciones); t es None si no hubo descenso.
+    """
+    norm = np.linalg.norm(fx)
+    t = 1.0
+    evaluations = 0
+    while t >= min_step:
+        x_new = x + t * direction
+        f_new = F(x_new)
+        evaluations += 1
+        if np.all(np.isfinite(f_new)) and np.linalg.norm(f_new) <= (1 - armijo * t) * norm:
+            return t, x_new, f_new, evaluations
+        t *= 0.5
+    return None, x, fx, evaluations
+
+
+def newton_system(F, J, x0, max_iter, tol=1e-8, iteration_history=None):
+    """
+    Método de Newton para sistemas F(x) = 0 con búsqueda lineal.
+
+    `F` devuelve el vector de residuos y `J` la Jacobiana, densa (ver
+    equation.get_compiled_system) o de scipy.sparse (ver
+    sparse_jacobian.FiniteDifferenceJacobian). En cada iteración se resuelve
+    J(x) dx = -F(x) y se recorta el paso hasta que ||F|| disminuya.
+    Converge cuando ||F||_inf < tol o el paso es menor que tol (relativo).
+
+    Returns:
+        dict: 'x', 'converged', 'iterations', 'iteration_history',
+        'residual_norm', 'residual_evaluations', 'jacobian_evaluations' y
+        'linear_solves'.
+    """
+    if iteration_history is None:
+        iteration_history = []
+
+    x = np.array(x0, dtype=float)
+    fx = F(x)
+    stats = {'residual_evaluations': 1, 'jacobian_evaluations': 0, 'linear_solves': 0}
+    if not np.all(np.isfinite(fx)):
+        raise ValueError("El sistema no es evaluable en el punto inicial.")
+
+    converged = _norm(fx) < tol
+    iterations = 0
+    for i in range(1, max_iter + 1):
+        if converged:
+            break
+        iterations = i
+        Jx = J(x)
+        stats['jacobian_evaluations'] += 1
+        if not _all_finite(Jx):
+            logger.error(f"La Jacobiana no es finita en la iteración {i}.")
+            break
+        dx = _solve(Jx, -fx)
+        stats['linear_solves'] += 1
+
+        t, x_new, f_new, evaluations = _line_search(F, x, fx, dx)
+        stats['residual_evaluations'] += evaluations
+        if t is None:
+            logger.error(f"Newton para sistemas: la búsqueda lineal no logró descenso en la iteración {i}.")
+            break
+
+        step = _norm(t * dx)
+        x, fx = x_new, f_new
+        residual = _norm(fx)
+        iteration_history.append({
+            'iteration': i,
+            'x': [round(float(v), 6) for v in x],
+            'residual_norm': float(residual),
+            'step_norm': float(step),
+            'step_length': t
+        })
+        logger.info(f"Newton para sistemas Iteración {i}: ||F|| = {residual}, paso = {step}, t = {t}")
+        converged = residual < tol or step < tol * max(1.0, _norm(x))
+
+    return {
+        'x': x,
+        'converged': bool(converged),
+        'iterations': iterations,
+        'iteration_history': iteration_history,
+        'residual_norm': _norm(fx),
+        **stats
+    }
+
+
+def _inverse(Jx):
+    if _is_sparse(Jx):
+        Jx = Jx.toarray()
+    try:
+        return np.linalg.inv(Jx)
+    except np.linalg.LinAlgError:
+        return np.linalg.pinv(Jx)
+
+
+class _InverseJacobian:
+    """
+    Aproximación H de la inversa de la Jacobiana para Broyden.
+
+    Con una Jacobiana densa H se guarda explícitamente. Con una dispersa no
+    se forma la inversa (es densa en general): se factoriza J0 con splu y
+    H = J0^-1 + sum(u_k v_k^T), donde cada actualización de rango uno se
+    guarda como el par de vectores (u_k, v_k).
+    """
+
+    def __init__(self, Jx):
+        self.lu = None
+        self.matrix = None
+        self.updates = []
+        if _is_sparse(Jx):
+            from scipy.sparse.linalg import splu
+
+            try:
+                self.lu = splu(Jx.tocsc())
+                return
+            except RuntimeError:
+                # Jacobiana singular: se recurre a la pseudoinversa densa
+                pass
+        self.matrix = _inverse(Jx)
+
+    def matvec(self, w):
+        """H w"""
+        if self.matrix is not None:
+            return self.matrix @ w
+        result = self.lu.solve(w)
+        for u, v in self.updates:
+            result += u * (v @ w)
+        return result
+
+    def rmatvec(self, w):
+        """w^T H"""
+        if self.matrix is not None:
+            return w @ self.matrix
+        result = self.lu.solve(w, trans='T')
+        for u, v in self.updates:
+            result += v * (w @ u)
+        return result
+
+    def update(self, u, v):
+        """H += u v^T"""
+        if self.matrix is not None:
+            self.matrix = self.matrix + np.outer(u, v)
+        else:
+            self.updates.append((u, v))
+
+
+def broyden_system(F, J, x0, max_iter, tol=1e-8, update='good', iteration_history=None):
+    """
+    Método de Broyden (cuasi-Newton) para sistemas F(x) = 0.
+
+    La Jacobiana se evalúa e invierte solo al inicio (si es dispersa, se
+    factoriza con LU dispersa; ver _InverseJacobian); después se mantiene una
+    aproximación H de su inversa con actualizaciones de rango uno
+    (Sherman-Morrison), de modo que cada paso es un producto matriz-vector en
+    lugar de una resolución lineal:
+
+        good: H += (s - H y) (s^T H) / (s^T H y)
+        bad:  H += (s - H y) y^T / (y^T y)
+
+    con s = x_{k+1} - x_k e y = F(x_{k+1}) - F(x_k). Si la dirección no hace
+    bajar ||F|| o la actualización se degenera, se vuelve a evaluar la
+    Jacobiana en el punto actual; si ni así hay descenso, se detiene.
+
+    Returns:
+        dict: mismas claves que newton_system.
+    """
+    if update not in ('good', 'bad'):
+        raise ValueError("update debe ser 'good' o 'bad'.")
+    if iteration_history is None:
+        iteration_history = []
+
+    x = np.array(x0, dtype=float)
+    fx = F(x)
+    stats = {'residual_evaluations': 1, 'jacobian_evaluations': 0, 'linear_solves': 0}
+    if not np.all(np.isfinite(fx)):
+        raise ValueError("El sistema no es evaluable en el punto inicial.")
+
+    def refresh(x):
+        Jx = J(x)
+        stats['jacobian_evaluations'] += 1
+        stats['linear_solves'] += 1
+        if not _all_finite(Jx):
+            raise ValueError("La Jacobiana no es finita en el punto actual.")
+        return _InverseJacobian(Jx)
+
+    H = None
+    converged = _norm(fx) < tol
+    iterations = 0
+    for i in range(1, max_iter + 1):
+        if converged:
+            break
+        iterations = i
+        fresh = H is None
+        if fresh:
+            try:
+                H = refresh(x)
+            except ValueError as e:
+                logger.error(f"Broyden: {str(e)}")
+                break
+
+        t, x_new, f_new, evaluations = _line_search(F, x, fx, -H.matvec(fx))
+        stats['residual_evaluations'] += evaluations
+        if t is None and not fresh:
+            # La aproximación dejó de servir: reiniciar desde la Jacobiana exacta
+            try:
+                H = refresh(x)
+            except ValueError as e:
+                logger.error(f"Broyden: {str(e)}")
+                break
+            t, x_new, f_new, evaluations = _line_search(F, x, fx, -H.matvec(fx))
+            stats['residual_evaluations'] += evaluations
+        if t is None:
+            logger.error(f"Broyden: la búsqueda lineal no logró descenso en la iteración {i}.")
+            break
+
+        s = x_new - x
+        y = f_new - fx
+        Hy = H.matvec(y)
+        if update == 'good':
+            row = H.rmatvec(s)
+            denominator = row @ y
+        else:
+            row = y
+            denominator = y @ y
+        if abs(denominator) > 1e-14 * max(1.0, np.linalg.norm(s) * np.linalg.norm(y)):
+            H.update(s - Hy, row / denominator)
+        else:
+            # Actualización degenerada: la próxima iteración usa la Jacobiana exacta
+            H = None
+
+        step = _norm(s)
+        x, fx = x_new, f_new
+        residual = _norm(fx)
+        iteration_history.append({
+            'iteration': i,
+            'x': [round(float(v), 6) for v in x],
+            'residual_norm': float(residual),
+            'step_norm': float(step),
+            'step_length': t
+        })
+        logger.info(f"Broyden ({update}) Iteración {i}: ||F|| = {residual}, paso = {step}, t = {t}")
+        converged = residual < tol or step < tol * max(1.0, _norm(x))
+
+    return {
+        'x': x,
+        'converged': bool(converged),
+        'iterations': iterations,
+        'iteration_history': iteration_history,
+        'residual_norm': _norm(fx),
+        **stats
+    }
@@ -16,3 +16,18 @@ def index():
 def newton_raphson_endpoint():
     data = request.get_json()
     return newton_controller.controller_newton(data)
+
+@main.route('/newton_raphson/multistart', methods=['POST'])
+def newton_raphson_multistart_endpoint():
+    data = request.get_json()
+    return newton_controller.controller_newton_multistart(data)
+
+@main.route('/newton_raphson/system', methods=['POST'])
+def newton_raphson_system_endpoint():
+    data = request.get_json()
+    return newton_controller.controller_newton_system(data)
+
+@main.route('/newton_raphson/all_roots', methods=['POST'])
+def newton_raphson_all_roots_endpoint():
+    data = request.get_json()
+    return newton_controller.controller_newton_all_roots(data)
@@ -1,43 +1,92 @@
-from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 import numpy as np
-import plotly
-import plotly.graph_objs as go
-import json
-import sympy as sp
-import re
 import logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
-def secant_method(f, x0, x1, max_iter, tol=1e-6):
+# Reglas de actualización disponibles: secante (dos puntos), interpolación
+# cuadrática inversa y Muller sobre el eje real (tres puntos)
+SECANT_VARIANTS = ('secant', 'iqi', 'muller')
+
+
+def _iqi_step(x0, x1, x2, f0, f1, f2):
+    """Cero del polinomio cuadrático inverso x(f) que pasa por los tres puntos."""
+    return (x0 * f1 * f2 / ((f0 - f1) * (f0 - f2))
+            + x1 * f0 * f2 / ((f1 - f0) * (f1 - f2))
+            + x2 * f0 * f1 / ((f2 - f0) * (f2 - f1)))
+
+
+def _muller_step(x0, x1, x2, f0, f1, f2):
+    """
+    Raíz de la parábola que interpola los tres puntos más cercana a x2. Si
+    el discriminante es negativo se toma su parte real (se anula), así el
+    método se queda en el eje real.
+    """
+    h1 = x1 - x0
+    h2 = x2 - x1
+    d1 = (f1 - f0) / h1
+    d2 = (f2 - f1) / h2
+    a = (d2 - d1) / (h2 + h1)
+    b = a * h2 + d2
+    discriminant = max(b * b - 4 * a * f2, 0.0)
+    denominator = b + np.copysign(np.sqrt(discriminant), b)
+    return x2 - 2 * f2 / denominator
+
+
+def secant_method(f, x0, x1, max_iter, tol=1e-6, variant='secant'):
+    """
+    Método de la Secante. Cada iteración evalúa f una sola vez, en el nuevo
+    punto x2; f(x0) y f(x1) se arrastran de las iteraciones anteriores.
+
+    Con variant='iqi' o 'muller' el nuevo punto se obtiene de los tres
+    últimos (convergencia de orden ~1.84 en lugar de ~1.62) con el mismo
+    costo por iteración. La primera iteración, y cualquier paso de tres
+    puntos que resulte no finito, usan la secante.
+    """
+    if variant not in SECANT_VARIANTS:
+        raise ValueError(f"Variante no soportada: {variant}. Opciones: {', '.join(SECANT_VARIANTS)}")
+
     iteration_history = []
+    try:
+        fx0 = f(x0)
+        fx1 = f(x1)
+    except Exception as e:
+        logger.error(f"Error al evaluar los puntos iniciales del método Secante: {str(e)}")
+        return None, False, 0, iteration_history
+    # Punto anterior a x0, para las variantes de tres puntos
+    x_prev = fx_prev = None
     for i in range(1, max_iter + 1):
         try:
-            fx0 = f(x0)
-            fx1 = f(x1)
-            if fx1 == fx0:
-                raise ZeroDivisionError("División por cero en el método Secante.")
-            x2 = x1 - fx1 * (x1 - x0) / (fx1 - fx0)
+            x2 = None
+            if variant != 'secant' and x_prev is not None:
+                step = _iqi_step if variant == 'iqi' else _muller_step
+                try:
+                    with np.errstate(all='ignore'):
+                        candidate = step(x_prev, x0, x1, fx_prev, fx0, fx1)
+                except ZeroDivisionError:
+                    # Puntos o valores repetidos: este paso se hace con la secante
+                    candidate = np.nan
+                if np.isfinite(candidate):
+                    x2 = float(candidate)
+            if x2 is None:
+                if fx1 == fx0:
+                    raise ZeroDivisionError("División por cero en el método Secante.")
+                x2 = x1 - fx1 * (x1 - x0) / (fx1 - fx0)
+            fx2 = f(x2)
             error = abs(x2 - x1)
             iteration_history.append({
                 'iteration': i,
                 'x': round(float(x2), 6),
-                'fx': round(float(f(x2)), 6),
+                'fx': round(float(fx2), 6),
                 'error': round(float(error), 6)
             })
-            logger.info(f"Secante Iteración {i}: x = {x2}, f(x) = {f(x2)}, error = {error}")
+            logger.info(f"Secante ({variant}) Iteración {i}: x = {x2}, f(x) = {fx2}, error = {error}")
             if error < tol:
                 return x2, True, i, iteration_history
-            x0, x1 = x1, x2
+            x_prev, x0, x1 = x0, x1, x2
+            fx_prev, fx0, fx1 = fx0, fx1, fx2
         except ZeroDivisionError as e:
             logger.error(f"Error en la iteración {i} del método Secante: {str(e)}")
             return None, False, i, iteration_history
         except Exception as e:
             logger.error(f"Error en la iteración {i} del método Secante: {str(e)}")
             return None, False, i, iteration_history
-    return x1, False, max_iter, iteration_history
\ No newline at end of file
+    return x1, False, max_iter, iteration_history
@@ -1,33 +1,20 @@
 from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 from . import secant
 
 import numpy as np
-import plotly
-import plotly.graph_objs as go
 import json
-import sympy as sp
-import re
 import logging
 from microservices.app.util import equation as eq
-
-# Definir las transformaciones incluyendo 'convert_xor'
-transformations = (
-    standard_transformations +
-    (implicit_multiplication_application,) +
-    (convert_xor,)
-)
+from microservices.app.util.evaluator import CountingEvaluator
 
 # Configuración del logger
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 def controller_secant(data):
+    import plotly
+    import plotly.graph_objs as go
+
     if not data or 'equation' not in data or 'x0' not in data or 'x1' not in data or 'iterations' not in data:
         return jsonify({'error': 'Faltan campos requeridos: equation, x0, x1, iterations'}), 400
 
@@ -35,21 +22,20 @@ def controller_secant(data):
     x0 = float(data['x0'])
     x1 = float(data['x1'])
     max_iter = int(data['iterations'])
+    variant = data.get('variant', 'secant')
+    if variant not in secant.SECANT_VARIANTS:
+        return jsonify({'error': f"variant debe ser uno de: {', '.join(secant.SECANT_VARIANTS)}."}), 400
 
     try:
-        expr, f = eq.parse_equation(equation)
+        # La gráfica usa la función sin contador: solo se cuentan las evaluaciones del método
+        f_plain = eq.parse_function(equation)
+        f = CountingEvaluator(f_plain)
         iteration_history = []  # Inicializa iteration_history
-        root, converged, iterations, iteration_history = secant.secant_method(f, x0, x1, max_iter)
+        root, converged, iterations, iteration_history = secant.secant_method(f, x0, x1, max_iter, variant=variant)
 
         # Generar puntos para la gráfica en un rango que abarque adecuadamente la función
         x_vals = np.linspace(min(x0, x1) - 10, max(x0, x1) + 10, 1000)
-        y_vals = []
-        for x in x_vals:
-            try:
-                y_val = f(x)
-                y_vals.append(y_val)
-            except Exception as e:
-                y_vals.append(np.nan)
+        y_vals = eq.sample_function(f_plain, x_vals)
 
         # Trazado de la función f(x)
         trace_function = go.Scatter(
@@ -64,7 +50,7 @@ def controller_secant(data):
         data_traces = [trace_function]
         if root is not None:
             try:
-                root_y = f(root)
+                root_y = f_plain(root)
                 if not np.isfinite(root_y):
                     root_y = 0
             except:
@@ -166,6 +152,8 @@ def controller_secant(data):
             'converged': converged,
             'iterations': iterations,
             'iteration_history': iteration_history,
+            'variant': variant,
+            'function_evaluations': f.evaluations,
             'plot_json': graphJSON
         }
         logger.debug("Returning response")
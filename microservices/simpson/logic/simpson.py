@@ -1,16 +1,4 @@
-from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 import numpy as np
-import plotly
-import plotly.graph_objs as go
-import json
-import sympy as sp
-import re
 import logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -18,10 +6,12 @@ def calculate_simpson_error(expr, a, b, n):
     """
     Calcula el error estimado para el método de Simpson.
     """
+    import sympy as sp
+
     x = sp.Symbol('x')
     try:
         fourth_derivative = sp.diff(expr, x, 4)
-        f_fourth_prime = sp.lambdify(x, fourth_derivative, modules=['numpy'])
+        f_fourth_prime = sp.lambdify(x, fourth_derivative, modules=['numpy'], cse=True)
         # Evaluar en múltiples puntos para encontrar el máximo absoluto
         x_vals = np.linspace(a, b, 1000)
         f_fourth_prime_vals = np.abs(f_fourth_prime(x_vals))
@@ -1,43 +1,42 @@
 from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 
 from microservices.app.util import equation as eq
+from microservices.app.util.chebyshev import ChebyshevProxy
 from . import simpson
 import numpy as np
-import plotly
-import plotly.graph_objs as go
 import json
-import sympy as sp
-import re
 import logging
 
-# Definir las transformaciones incluyendo 'convert_xor'
-transformations = (
-    standard_transformations +
-    (implicit_multiplication_application,) +
-    (convert_xor,)
-)
-
 # Configuración del logger
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Métodos disponibles en /simpson
+INTEGRATION_METHODS = ('simpson', 'chebyshev')
+
 def controller_simpson(data):
     """
     Controlador para el método de Simpson de integración numérica.
     Procesa los datos de entrada, calcula la integral y genera una visualización mejorada.
     
+    Con 'method': 'chebyshev' la integral se calcula por Clenshaw-Curtis
+    sobre el interpolante de Chebyshev de f y no se requiere 'n'.
+
     Args:
         data (dict): Diccionario con los parámetros 'equation', 'a', 'b', 'n'
+            y opcionalmente 'method' ('simpson' o 'chebyshev')
         
     Returns:
         tuple: Respuesta JSON con el resultado y la visualización, o mensaje de error
     """
+    import plotly
+
+    method = (data or {}).get('method', 'simpson')
+    if method not in INTEGRATION_METHODS:
+        return jsonify({'error': f"Método no soportado: {method}. Opciones: {', '.join(INTEGRATION_METHODS)}"}), 400
+    if method == 'chebyshev':
+        return controller_chebyshev(data)
+
     # Validar datos de entrada
     if not data or 'equation' not in data or 'a' not in data or 'b' not in data or 'n' not in data:
         return jsonify({'error': 'Faltan campos requeridos: equation, a, b, n'}), 400
@@ -57,7 +56,7 @@ def controller_simpson(data):
         
         # Parsear la ecuación y calcular la integral
         logger.info(f"Calculando integral de '{equation}' en [{a}, {b}] con n={n}")
-        expr, f = eq.parse_equation(equation)
+        f = eq.parse_function(equation)
         area, shapes = simpson.simpson_method(f, a, b, n)
         
         # Generar visualización mejorada
@@ -86,6 +85,96 @@ def controller_simpson(data):
         logger.error(f"Error inesperado: {str(e)}", exc_info=True)
         return jsonify({'error': f'Error al procesar la solicitud: {str(e)}'}), 500
 
+def controller_chebyshev(data):
+    """
+    Integral de f en [a, b] con el interpolante de Chebyshev: f se muestrea
+    una sola vez (malla adaptativa) y de la misma muestra salen la integral
+    (Clenshaw-Curtis) y la curva de la gráfica.
+    """
+    import plotly
+
+    if not data or 'equation' not in data or 'a' not in data or 'b' not in data:
+        return jsonify({'error': 'Faltan campos requeridos: equation, a, b'}), 400
+
+    try:
+        equation = data['equation']
+        a = float(data['a'])
+        b = float(data['b'])
+        if a >= b:
+            return jsonify({'error': 'El límite inferior (a) debe ser menor que el límite superior (b)'}), 400
+
+        logger.info(f"Calculando integral de '{equation}' en [{a}, {b}] con Chebyshev")
+        f = eq.parse_function(equation)
+        proxy = ChebyshevProxy(f, a, b)
+        area = proxy.integral()
+
+        fig = generate_chebyshev_plot(proxy, equation)
+        graphJSON = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+
+        response = {
+            'area': round(area, 6),
+            'plot_json': graphJSON,
+            'equation': equation,
+            'interval': [a, b],
+            'method': 'chebyshev',
+            'degree': proxy.degree,
+            'converged': proxy.converged,
+            'function_evaluations': proxy.evaluations
+        }
+        if not proxy.converged:
+            response['warning'] = ('La función no es suave en el intervalo: el interpolante no convergió '
+                                   'y el área puede ser imprecisa.')
+        logger.info(f"Integral calculada: {area} (grado {proxy.degree}, {proxy.evaluations} evaluaciones)")
+        return jsonify(response)
+
+    except ValueError as ve:
+        logger.error(f"Error de valor: {str(ve)}")
+        return jsonify({'error': f'Error en los datos: {str(ve)}'}), 400
+    except Exception as e:
+        logger.error(f"Error inesperado: {str(e)}", exc_info=True)
+        return jsonify({'error': f'Error al procesar la solicitud: {str(e)}'}), 500
+
+def generate_chebyshev_plot(proxy, equation_str):
+    """
+    Gráfica del interpolante de Chebyshev (sin nuevas evaluaciones de f) con
+    el área sombreada y los puntos de la muestra (a lo sumo 200 marcados).
+    """
+    import plotly.graph_objs as go
+
+    x_vals, y_vals = proxy.sample(1000)
+    x_nodes, y_nodes = proxy.nodes
+    stride = max(1, len(x_nodes) // 200)
+
+    trace_function = go.Scatter(
+        x=x_vals,
+        y=y_vals,
+        fill='tozeroy',
+        fillcolor='rgba(44, 160, 44, 0.3)',
+        mode='lines',
+        name='f(x)',
+        line=dict(color='rgb(31, 119, 180)', width=3)
+    )
+    trace_nodes = go.Scatter(
+        x=x_nodes[::stride],
+        y=y_nodes[::stride],
+        mode='markers',
+        name='Puntos de Chebyshev',
+        marker=dict(color='rgb(255, 127, 14)', size=6)
+    )
+    layout = go.Layout(
+        title=dict(
+            text=f"Integración de {equation_str} con interpolación de Chebyshev (grado {proxy.degree})",
+            font=dict(size=18)
+        ),
+        xaxis=dict(title='x', gridcolor='rgb(230, 230, 230)', zerolinecolor='rgb(200, 200, 200)'),
+        yaxis=dict(title='f(x)', gridcolor='rgb(230, 230, 230)', zerolinecolor='rgb(200, 200, 200)'),
+        plot_bgcolor='rgb(250, 250, 250)',
+        paper_bgcolor='rgb(250, 250, 250)',
+        hovermode='closest',
+        margin=dict(l=65, r=50, b=65, t=90)
+    )
+    return go.Figure(data=[trace_function, trace_nodes], layout=layout)
+
 def generate_simpson_plot(f, a, b, n, shapes, equation_str):
     """
     Genera una visualización mejorada del método de Simpson.
@@ -101,6 +190,9 @@ def generate_simpson_plot(f, a, b, n, shapes, equation_str):
     Returns:
         plotly.graph_objs.Figure: Figura de Plotly con la visualización
     """
+    import plotly
+    import plotly.graph_objs as go
+
     # Crear un rango de valores x más denso para una curva más suave
     x_vals = np.linspace(a, b, 1000)
     y_vals = [f(x) for x in x_vals]
@@ -1,27 +1,11 @@
 from flask import Blueprint, request, jsonify, render_template
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
 
 from microservices.app.util import equation as eq
 from . import trapecio
 import numpy as np
-import plotly
-import plotly.graph_objs as go
 import json
-import sympy as sp
-import re
 import logging
 
-# Definir las transformaciones incluyendo 'convert_xor'
-transformations = (
-    standard_transformations +
-    (implicit_multiplication_application,) +
-    (convert_xor,)
-)
 # Configuración del logger
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -37,6 +21,8 @@ def controller_trapecio(data):
     Returns:
         tuple: Respuesta JSON con el resultado y la visualización, o mensaje de error
     """
+    import plotly
+
     # Validar datos de entrada
     if not data or 'equation' not in data or 'a' not in data or 'b' not in data or 'n' not in data:
         return jsonify({'error': 'Faltan campos requeridos: equation, a, b, n'}), 400
@@ -56,7 +42,7 @@ def controller_trapecio(data):
         
         # Parsear la ecuación y calcular la integral
         logger.info(f"Calculando integral de '{equation}' en [{a}, {b}] con n={n} usando método trapezoidal")
-        expr, f = eq.parse_equation(equation)
+        f = eq.parse_function(equation)
         area, trapezoids = trapecio.trapezoidal_method(f, a, b, n)
         
         # Generar visualización mejorada
@@ -100,6 +86,9 @@ def generate_trapezoid_plot(f, a, b, n, trapezoids, equation_str):
     Returns:
         plotly.graph_objs.Figure: Figura de Plotly con la visualización
     """
+    import plotly
+    import plotly.graph_objs as go
+
     # Crear un rango de valores x más denso para una curva más suave
     x_vals = np.linspace(a, b, 1000)
     y_vals = [f(x) for x in x_vals]
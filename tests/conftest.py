@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+# Las pruebas importan el paquete `microservices` desde la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_client(blueprint):
+    app = Flask(__name__)
+    app.register_blueprint(blueprint)
+    return app.test_client()
+
+
+@pytest.fixture
+def newton_client():
+    from microservices.newton_raphson.routes import main
+    return make_client(main)
+
+
+@pytest.fixture
+def bisection_client():
+    from microservices.bisection.routes import main
+    return make_client(main)
+
+
+@pytest.fixture
+def secant_client():
+    from microservices.secant.routes import main
+    return make_client(main)
+
+
+@pytest.fixture
+def fixed_point_client():
+    from microservices.fixed_point.routes import main
+    return make_client(main)
+
+
+@pytest.fixture
+def simpson_client():
+    from microservices.simpson.routes import main
+    return make_client(main)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from microservices.app.util import equation as eq
+from microservices.app.util.autodiff import compile_value_and_derivative
+
+EQUATIONS = [
+    '(-2)**3 * x**(-1)',
+    'x + (-1)**2',
+    'x**2 + (-1)**2 - 5',
+    '-x**2',
+    '-(-x)**3',
+    '(-3)**2 * x',
+    'x**(-2.0)',
+    '(x**2)**3',
+    '2**(x**2)',
+    '(1 + x**2)**(x/3)',
+    'sin(x)**2 + cos(-x)**2',
+    'exp(-x) * log(1 + x**2)',
+    'sqrt(1 + (x - 1)**2) / (2 + tan(x/4))',
+    '-(x - (-0.5)**2)**(-3)',
+]
+
+POINTS = np.array([-1.7, -0.4, 0.3, 0.9, 1.3, 2.0])
+
+
+@pytest.mark.parametrize('processed', EQUATIONS)
+def test_dual_matches_symbolic_fused(processed):
+    dual = compile_value_and_derivative(processed)
+    fused = eq._lambdify([eq._sympy_parse(processed), eq._sympy_parse(processed).diff(eq.X_SYMBOL)])
+    with np.errstate(all='ignore'):
+        for x in POINTS:
+            value, derivative = dual(float(x))
+            expected_value, expected_derivative = fused(float(x))
+            if not np.isfinite(expected_value):
+                continue
+            assert value == pytest.approx(float(expected_value), rel=1e-12, abs=1e-12)
+            assert derivative == pytest.approx(float(expected_derivative), rel=1e-10, abs=1e-10)
+
+        # Camino vectorizado
+        values, derivatives = dual(POINTS)
+        expected_values, expected_derivatives = fused(POINTS)
+    finite = np.isfinite(np.broadcast_to(expected_values, POINTS.shape))
+    np.testing.assert_allclose(np.broadcast_to(values, POINTS.shape)[finite],
+                               np.broadcast_to(expected_values, POINTS.shape)[finite], rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(np.broadcast_to(derivatives, POINTS.shape)[finite],
+                               np.broadcast_to(expected_derivatives, POINTS.shape)[finite], rtol=1e-10, atol=1e-10)
+
+
+def test_negative_literal_base_keeps_sign():
+    with np.errstate(invalid='ignore'):
+        value, _ = compile_value_and_derivative('(-2)**x')(2.0)
+    assert value == 4.0
+    value, derivative = compile_value_and_derivative('x + (-1)**2')(3.0)
+    assert (value, derivative) == (4.0, 1.0)
+
+
+def test_dual_func_matches_fused_func_through_latex():
+    compiled = eq.get_compiled_equation('x^{2}+(-1)^{2}-5+\\sin(x)')
+    dual = compiled.dual_func()
+    fused = compiled.fused_func(1)
+    for x in POINTS:
+        assert dual(float(x))[0] == pytest.approx(float(fused(float(x))[0]), rel=1e-12)
+        assert dual(float(x))[1] == pytest.approx(float(fused(float(x))[1]), rel=1e-12)
+
+
+def test_newton_autodiff_agrees_with_symbolic(newton_client):
+    roots = {}
+    for derivative in ('symbolic', 'autodiff'):
+        response = newton_client.post('/newton_raphson', json={
+            'equation': 'x^{2}+(-1)^{2}-5', 'initial_guess': 1, 'iterations': 50, 'derivative': derivative
+        })
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        assert body['converged']
+        roots[derivative] = body['root']
+    assert roots['autodiff'] == pytest.approx(2.0, abs=1e-6)
+    assert roots['symbolic'] == pytest.approx(roots['autodiff'], abs=1e-9)
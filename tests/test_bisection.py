@@ -0,0 +1,158 @@
+import math
+
+import numpy as np
+import pytest
+
+from microservices.bisection.logic import bisection
+from microservices.bisection.logic.bisection_controller import MAX_GRID_POINTS, MAX_KSECTION_K, MAX_REFINE_ITERATIONS
+
+
+def _counted(f):
+    def wrapped(x):
+        wrapped.calls += 1
+        return f(x)
+    wrapped.calls = 0
+    return wrapped
+
+
+@pytest.mark.parametrize('f, a, b, root', [
+    (lambda x: x ** 3 - 2 * x - 5, 2.0, 3.0, 2.0945514815423265),
+    (lambda x: math.cos(x) - x, 0.0, 1.0, 0.7390851332151607),
+    (lambda x: math.exp(x) - 10, 0.0, 5.0, math.log(10)),
+    (lambda x: (x - 1) ** 3, 0.0, 3.0, 1.0),
+])
+def test_brent_converges_within_a_true_bracket(f, a, b, root):
+    history = []
+    x, converged, iterations, history, evaluations = bisection.brent_method(f, a, b, 300, history, tol=1e-10)
+    assert converged
+    assert x == pytest.approx(root, abs=1e-9)
+    assert evaluations == iterations + 2
+    # 'error' es el semiancho del intervalo con cambio de signo que contiene a x
+    for entry in history:
+        assert abs(entry['x'] - root) <= 2 * entry['error'] + 1e-6
+
+
+def test_brent_uses_fewer_evaluations_than_bisection():
+    f = _counted(lambda x: math.cos(x) - x)
+    bisection.brent_method(f, 0.0, 1.0, 100, [], tol=1e-10)
+    g = _counted(lambda x: math.cos(x) - x)
+    bisection.bisection_method(g, 0.0, 1.0, 100, [], tol=1e-10)
+    assert f.calls < g.calls
+
+
+def test_brent_does_not_stop_before_the_bracket_is_small():
+    # Función muy plana a un lado: los pasos caen del mismo lado del contrapunto
+    f = lambda x: np.tanh(20 * (x - 0.8)) + 1e-3 * x
+    x, converged, _, _, _ = bisection.brent_method(f, -5.0, 1.0, 200, [], tol=1e-8)
+    assert converged
+    assert abs(f(x)) < 1e-6
+
+
+def test_brent_rejects_interval_without_sign_change():
+    with pytest.raises(ValueError):
+        bisection.brent_method(lambda x: x ** 2 + 1, -1.0, 1.0, 10, [])
+
+
+@pytest.mark.parametrize('k', [2, 16, 64])
+def test_ksection_matches_root(k):
+    f = lambda x: np.cos(x) - x
+    x, converged, _, _, evaluations = bisection.ksection_method(f, 0.0, 1.0, 50, [], tol=1e-10, k=k)
+    assert converged
+    assert x == pytest.approx(0.7390851332151607, abs=1e-9)
+
+
+def test_bisection_batch_solves_every_lane():
+    f = lambda x: np.sin(x)
+    batch = bisection.bisection_batch(f, [2.0, 5.0, -4.0], [4.0, 7.0, -2.0], 100, 1e-10)
+    np.testing.assert_allclose(batch['root'], [np.pi, 2 * np.pi, -np.pi], atol=1e-9)
+    assert batch['valid'].all() and batch['converged'].all()
+
+
+@pytest.mark.parametrize('method', ['bisection', 'brent'])
+def test_endpoint_ignores_k_outside_ksection(bisection_client, method):
+    response = bisection_client.post('/bisection', json={
+        'equation': 'x^{2}-2', 'a': 0, 'b': 2, 'iterations': 60, 'method': method, 'k': 'unused'
+    })
+    assert response.status_code == 200
+    assert response.get_json()['root'] == pytest.approx(2 ** 0.5, abs=2e-6)
+
+
+@pytest.mark.parametrize('k', [1, MAX_KSECTION_K + 1, 'many'])
+def test_endpoint_rejects_invalid_k_for_ksection(bisection_client, k):
+    response = bisection_client.post('/bisection', json={
+        'equation': 'x^{2}-2', 'a': 0, 'b': 2, 'iterations': 10, 'method': 'ksection', 'k': k
+    })
+    assert response.status_code == 400
+
+
+def test_find_valid_interval_reports_only_function_evaluations(bisection_client):
+    response = bisection_client.post('/find_valid_interval', json={
+        'equation': 'x^{2}-2', 'start': -3, 'end': 3, 'num_points': 100
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert 'evaluations' not in body
+    assert body['function_evaluations'] >= 100
+    assert body['a'] < -2 ** 0.5 < body['b']
+    assert len([i for i in body['intervals'] if i['kind'] == 'sign_change']) == 2
+
+
+def test_batch_endpoint_solves_intervals_and_problems(bisection_client):
+    response = bisection_client.post('/bisection/batch', json={
+        'equation': '\\sin(x)', 'intervals': [[2, 4], {'a': 6, 'b': 7}, [0.5, 1]], 'tol': 1e-10
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['lanes'] == 3 and 'plot_json' not in body
+    first, second, third = body['results']
+    assert first['root'] == pytest.approx(math.pi, abs=1e-9) and first['converged']
+    assert second['root'] == pytest.approx(2 * math.pi, abs=1e-9)
+    assert not third['converged'] and 'error' in third
+
+    response = bisection_client.post('/bisection/batch', json={'problems': [
+        {'equation': 'x^{2}-2', 'a': 0, 'b': 2}, {'equation': 'x^{3}-8', 'a': 0, 'b': 3}
+    ], 'tol': 1e-10})
+    assert [r['root'] for r in response.get_json()['results']] == pytest.approx([2 ** 0.5, 2.0], abs=1e-9)
+
+
+def test_batch_endpoint_requires_lanes(bisection_client):
+    assert bisection_client.post('/bisection/batch', json={'equation': 'x'}).status_code == 400
+    assert bisection_client.post('/bisection/batch', json={'equation': 'x', 'intervals': []}).status_code == 400
+
+
+@pytest.mark.parametrize('method', ['sweep', 'chebyshev'])
+def test_all_roots_endpoint_methods_agree(bisection_client, method):
+    response = bisection_client.post('/bisection/all_roots', json={
+        'equation': '\\sin(x)', 'a': -10, 'b': 10, 'method': method, 'tol': 1e-10
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['method'] == method
+    assert [r['root'] for r in body['roots']] == pytest.approx(math.pi * np.arange(-3, 4), abs=1e-8)
+    assert body['function_evaluations'] > 0
+
+
+def test_find_valid_interval_omits_a_b_without_sign_change(bisection_client):
+    response = bisection_client.post('/find_valid_interval', json={'equation': 'x^{2}'})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert 'a' not in body and 'b' not in body
+    assert [i['kind'] for i in body['intervals']] == ['touch']
+
+
+@pytest.mark.parametrize('num_points', [1, MAX_GRID_POINTS + 1])
+def test_find_valid_interval_rejects_num_points_out_of_range(bisection_client, num_points):
+    response = bisection_client.post('/find_valid_interval', json={'equation': 'x', 'num_points': num_points})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('field, value', [
+    ('num_points', 1), ('num_points', MAX_GRID_POINTS + 1),
+    ('iterations', 0), ('iterations', MAX_REFINE_ITERATIONS + 1), ('iterations', 'many'),
+])
+def test_all_roots_endpoint_rejects_out_of_range_sizes(bisection_client, field, value):
+    response = bisection_client.post('/bisection/all_roots', json={
+        'equation': '\\sin(x)', 'a': -10, 'b': 10, field: value
+    })
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from microservices.app.util.chebyshev import ChebyshevProxy, chebyshev_points, values_to_coefficients
+
+
+def test_coefficients_of_a_chebyshev_polynomial():
+    # T_3(t) = 4t^3 - 3t
+    t = chebyshev_points(8)
+    np.testing.assert_allclose(values_to_coefficients(4 * t ** 3 - 3 * t), [0, 0, 0, 1, 0, 0, 0, 0, 0], atol=1e-14)
+
+
+def test_roots_integral_and_values():
+    proxy = ChebyshevProxy(np.sin, -10.0, 10.0)
+    assert proxy.converged
+    np.testing.assert_allclose(proxy.roots(), np.pi * np.arange(-3, 4), atol=1e-10)
+    assert proxy.integral() == pytest.approx(0.0, abs=1e-12)
+    x = np.linspace(-10, 10, 7)
+    np.testing.assert_allclose(proxy(x), np.sin(x), atol=1e-12)
+
+
+def test_high_degree_roots_use_subdivision():
+    proxy = ChebyshevProxy(lambda x: np.sin(50 * x), 0.0, 10.0)
+    assert proxy.degree > 50
+    roots = proxy.roots()
+    np.testing.assert_allclose(roots, np.pi / 50 * np.arange(0, 160), atol=1e-9)
+
+
+def test_integral_matches_closed_form():
+    proxy = ChebyshevProxy(np.exp, 0.0, 1.0)
+    assert proxy.integral() == pytest.approx(np.e - 1, rel=1e-14)
+    assert proxy.evaluations == len(proxy.values)
+
+
+def test_non_finite_and_non_smooth_functions():
+    # El punto medio del intervalo es un punto de Chebyshev
+    with np.errstate(divide='ignore'), pytest.raises(ValueError):
+        ChebyshevProxy(lambda x: 1 / (x - 1), 0.0, 2.0)
+    proxy = ChebyshevProxy(np.sign, -1.0, 1.3, max_points=64)
+    assert not proxy.converged
+    with pytest.raises(ValueError):
+        proxy.roots()
+
+
+def test_simpson_endpoint_chebyshev_method(simpson_client):
+    response = simpson_client.post('/simpson', json={'equation': 'e^{x}', 'a': 0, 'b': 1, 'method': 'chebyshev'})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['method'] == 'chebyshev' and body['converged']
+    assert body['area'] == pytest.approx(np.e - 1, abs=1e-6)
+    assert body['function_evaluations'] > 0
+    assert simpson_client.post('/simpson', json={'equation': 'x', 'a': 0, 'b': 1, 'method': 'gauss'}).status_code == 400
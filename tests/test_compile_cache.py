@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from microservices.app.util import compile_cache, equation as eq
+
+SOURCE = "def _f(x):\n    return x**2 - 2\n"
+
+
+@pytest.fixture
+def disk_cache_env(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache' / 'equations.sqlite')
+    monkeypatch.setattr(compile_cache, '_disk_cache', None)
+    monkeypatch.setenv('EQUATION_DISK_CACHE', path)
+    eq.clear_expression_cache()
+    yield path
+    eq.clear_expression_cache()
+
+
+def test_put_get_round_trip(tmp_path):
+    cache = compile_cache.DiskCompileCache(str(tmp_path / 'c.sqlite'), 'v1')
+    assert cache.get('x^{2}-2') is None
+    cache.put('x^{2}-2', 'x**2-2', {'func': SOURCE})
+    record = cache.get('x^{2}-2')
+    assert record == {'processed': 'x**2-2', 'sources': {'func': SOURCE}}
+    func = compile_cache.function_from_source(record['sources']['func'])
+    assert func(3.0) == 7.0
+    assert cache.info()['hits'] == 1 and cache.info()['misses'] == 1 and cache.info()['size'] == 1
+
+
+def test_versions_share_the_file_without_wiping_each_other(tmp_path):
+    path = str(tmp_path / 'c.sqlite')
+    old = compile_cache.DiskCompileCache(path, 'v1')
+    old.put('x', 'x', {'func': SOURCE})
+
+    # Un servicio con otra versión no ve la entrada vieja ni la borra
+    new = compile_cache.DiskCompileCache(path, 'v2')
+    assert new.get('x') is None
+    new.put('x', 'x', {'func': "def _g(x):\n    return x\n"})
+    assert old.get('x')['sources']['func'] == SOURCE
+    assert new.get('x')['sources']['func'] != SOURCE
+
+    new.clear()
+    assert new.get('x') is None and old.get('x') is not None
+    assert old.info()['size'] == 1 and new.info()['size'] == 0
+
+
+def test_least_recently_used_rows_are_evicted(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(compile_cache.time, 'time', lambda: float(next(clock)))
+    cache = compile_cache.DiskCompileCache(str(tmp_path / 'c.sqlite'), 'v1', max_entries=2)
+    cache.put('a', 'a', {})
+    cache.put('b', 'b', {})
+    cache.get('a')
+    cache.put('c', 'c', {})
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+
+
+def test_unreadable_file_is_a_miss(tmp_path):
+    directory = tmp_path / 'not_a_file'
+    directory.mkdir()
+    cache = compile_cache.DiskCompileCache(str(directory), 'v1')
+    assert cache.get('x') is None
+    cache.put('x', 'x', {})
+    assert cache.info()['errors'] == 2
+
+
+def test_disk_cache_is_off_without_the_variable(monkeypatch):
+    monkeypatch.setattr(compile_cache, '_disk_cache', None)
+    monkeypatch.delenv('EQUATION_DISK_CACHE', raising=False)
+    assert compile_cache.get_disk_cache('v1') is None
+    assert 'disk' not in eq.expression_cache_info()
+
+
+def test_disk_cache_follows_the_variable_and_version(disk_cache_env, tmp_path, monkeypatch):
+    cache = compile_cache.get_disk_cache('v1')
+    assert cache.path == disk_cache_env
+    assert compile_cache.get_disk_cache('v1') is cache
+    assert compile_cache.get_disk_cache('v2').version == 'v2'
+    monkeypatch.setenv('EQUATION_DISK_CACHE', str(tmp_path / 'other.sqlite'))
+    assert compile_cache.get_disk_cache('v2').path.endswith('other.sqlite')
+
+
+@pytest.mark.parametrize('equation', ['x^{2}-2', '\\sin(x)+e^{x}'])
+def test_compiled_equation_survives_the_memory_cache(disk_cache_env, equation):
+    first = eq.get_compiled_equation(equation)
+    derivative = first.derivative_func(1)
+    x = np.linspace(-2, 2, 9)
+    expected, expected_derivative = first.func(x), derivative(x)
+
+    # Sin la caché en memoria (otro worker) la ecuación sale del disco
+    eq.clear_expression_cache()
+    second = eq.get_compiled_equation(equation)
+    assert second is not first
+    assert eq.expression_cache_info()['disk']['hits'] >= 1
+    assert set(second.sources) >= {'func', 'derivative:1'}
+    np.testing.assert_allclose(second.func(x), expected)
+    np.testing.assert_allclose(second.derivative_func(1)(x), expected_derivative)
+    assert second._expr is None
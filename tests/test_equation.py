@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from microservices.app.util import equation as eq
+
+
+def test_expression_cache_hits_and_lru_eviction():
+    cache = eq.ExpressionCache(maxsize=2)
+    built = []
+
+    def factory(key):
+        return lambda: built.append(key) or object()
+
+    a = cache.get_or_create('a', factory('a'))
+    b = cache.get_or_create('b', factory('b'))
+    assert cache.get_or_create('a', factory('a')) is a  # 'a' pasa a ser la más reciente
+    cache.get_or_create('c', factory('c'))  # desaloja 'b'
+    assert cache.get_or_create('a', factory('a')) is a
+    assert cache.get_or_create('b', factory('b')) is not b
+    assert built == ['a', 'b', 'c', 'b']
+    assert cache.info() == {'hits': 2, 'misses': 4, 'evictions': 2, 'size': 2, 'maxsize': 2}
+
+
+def test_expression_cache_does_not_store_failures():
+    cache = eq.ExpressionCache(maxsize=2)
+
+    def failing():
+        raise ValueError('no parsea')
+
+    with pytest.raises(ValueError):
+        cache.get_or_create('x', failing)
+    assert cache.get_or_create('x', lambda: 'ok') == 'ok'
+    assert cache.info()['size'] == 1
+
+
+def test_compiled_equations_are_shared_across_parsers():
+    eq.clear_expression_cache()
+    first = eq.get_compiled_equation('x^{2}-2')
+    assert eq.get_compiled_equation('  x^{2}-2 ') is first
+    eq.parse_function('x^{2}-2')
+    eq.parse_derivative_equation('x^{2}-2')
+    info = eq.expression_cache_info()
+    assert info['misses'] == 1 and info['hits'] == 3
+    eq.clear_expression_cache()
+    assert eq.get_compiled_equation('x^{2}-2') is not first
+
+
+@pytest.mark.parametrize('latex, x, expected', [
+    ('\\ln(x)', -1.0, np.inf),
+    ('\\sqrt{x}', -4.0, np.inf),
+    ('\\frac{1}{x}', 0.0, np.inf),
+    ('e^{x}', 1000.0, np.inf),
+    ('\\sqrt{x}', 4.0, 2.0),
+])
+def test_safe_function_scalar_values(latex, x, expected):
+    result = eq.parse_function(latex)(x)
+    assert isinstance(result, float)
+    assert result == expected
+
+
+def test_safe_function_array_masks_invalid_points():
+    f = eq.parse_function('\\ln(x)+\\sqrt{x}')
+    x = np.array([-1.0, 0.0, 1.0, 4.0])
+    result = f(x)
+    assert result.dtype == float and result.shape == x.shape
+    np.testing.assert_array_equal(result[:2], [np.inf, np.inf])
+    np.testing.assert_allclose(result[2:], [1.0, np.log(4) + 2])
+    # Cada punto del arreglo coincide con la evaluación escalar
+    np.testing.assert_array_equal(result, [f(v) for v in x])
+    np.testing.assert_array_equal(f(x.reshape(2, 2)), result.reshape(2, 2))
+
+
+@pytest.mark.parametrize('bad', [np.nan, np.inf, -np.inf])
+def test_safe_function_non_finite_values(bad):
+    f = eq.make_safe_function(lambda x: x * 1.0)
+    assert f(bad) == np.inf
+    np.testing.assert_array_equal(f(np.array([bad, 2.0])), [np.inf, 2.0])
+
+
+def test_safe_function_constants_and_raising_functions():
+    f = eq.parse_function('3')
+    assert f(1.0) == 3.0
+    np.testing.assert_array_equal(f(np.zeros(3)), [3.0, 3.0, 3.0])
+
+    def picky(x):
+        if np.ndim(x):
+            raise TypeError('solo escalares')
+        if x < 0:
+            raise ValueError('fuera del dominio')
+        return x
+
+    safe = eq.make_safe_function(picky)
+    assert safe(-1.0) == np.inf
+    np.testing.assert_array_equal(safe(np.array([-1.0, 2.0])), [np.inf, 2.0])
+
+
+FUSED_CASES = ['x^{3}-2x+1', '\\sin(x)e^{x}', '\\frac{x}{x^{2}+1}', '\\ln(x^{2}+1)-\\cos(x)']
+
+
+def _sympy_derivatives(latex, order):
+    import sympy as sp
+
+    x = sp.Symbol('x')
+    expr = eq._sympy_parse(eq.preprocess_equation(latex))
+    return [sp.lambdify(x, sp.diff(expr, x, k), modules=['numpy']) for k in range(order + 1)]
+
+
+@pytest.mark.parametrize('latex', FUSED_CASES)
+@pytest.mark.parametrize('derivative, order', [('symbolic', 1), ('symbolic', 2), ('autodiff', 1)])
+def test_fused_equation_matches_symbolic_derivatives(latex, derivative, order):
+    fused = eq.parse_fused_equation(latex, order=order, derivative=derivative)
+    expected = _sympy_derivatives(latex, order)
+    x = np.linspace(-2.0, 2.5, 11)
+
+    values = fused(x)
+    assert len(values) == order + 1
+    for k in range(order + 1):
+        np.testing.assert_allclose(values[k], expected[k](x), rtol=1e-12, atol=1e-12)
+
+    scalar = fused(0.7)
+    assert len(scalar) == order + 1
+    for k in range(order + 1):
+        assert scalar[k] == pytest.approx(float(expected[k](0.7)), rel=1e-12, abs=1e-12)
+
+
+def test_fused_equation_is_built_once_per_mode():
+    assert eq.parse_fused_equation('x^{3}-2x+1', order=2) is eq.parse_fused_equation('x^{3}-2x+1', order=2)
+    assert eq.parse_fused_equation('x^{3}-2x+1', order=1) is not eq.parse_fused_equation('x^{3}-2x+1', order=2)
+
+
+@pytest.mark.parametrize('kwargs', [{'order': 2, 'derivative': 'autodiff'}, {'derivative': 'numeric'}])
+def test_fused_equation_rejects_unsupported_modes(kwargs):
+    with pytest.raises(ValueError):
+        eq.parse_fused_equation('x^{2}', **kwargs)
+
+
+def test_fused_equation_out_of_domain_point():
+    f, df = eq.parse_fused_equation('\\sqrt{x+2}')(-3.0)
+    assert f == np.inf and np.isnan(df)
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from microservices.app.util import equation as eq
+from microservices.app.util.evaluator import CountingEvaluator
+
+
+def _counted(f):
+    def wrapped(x):
+        wrapped.calls += 1
+        return f(x)
+    wrapped.calls = 0
+    return wrapped
+
+
+def test_scalar_values_are_memoized():
+    inner = _counted(lambda x: x ** 2)
+    f = CountingEvaluator(inner)
+    assert f(3.0) == 9.0
+    assert f(3) == 9.0
+    assert f(np.float64(3.0)) == 9.0
+    assert inner.calls == 1
+    assert f.evaluations == 1 and f.hits == 2
+    assert f.info() == {'evaluations': 1, 'hits': 2, 'size': 1}
+
+
+def test_cache_is_bounded_and_least_recently_used():
+    inner = _counted(lambda x: x + 1)
+    f = CountingEvaluator(inner, maxsize=2)
+    f(1.0)
+    f(2.0)
+    f(1.0)  # 1.0 pasa a ser el más reciente
+    f(3.0)  # desaloja 2.0
+    assert f.info()['size'] == 2
+    f(1.0)
+    assert inner.calls == 3
+    f(2.0)
+    assert inner.calls == 4 and f.evaluations == 4
+
+
+def test_arrays_are_counted_per_element_and_not_cached():
+    inner = _counted(lambda x: np.sin(x))
+    f = CountingEvaluator(inner)
+    x = np.linspace(0, 1, 7)
+    np.testing.assert_allclose(f(x), np.sin(x))
+    np.testing.assert_allclose(f(x.tolist()), np.sin(x))
+    assert inner.calls == 2 and f.evaluations == 14 and f.hits == 0
+
+
+def test_complex_inputs_are_counted_without_cache():
+    f = CountingEvaluator(lambda z: z ** 2 + 1)
+    assert f(1j) == 0
+    np.testing.assert_allclose(f(np.array([1j, 2.0 + 0j])), [0, 5])
+    assert f.evaluations == 3 and f.info()['size'] == 0
+
+
+def test_sample_function_masks_invalid_points_without_counting():
+    f = CountingEvaluator(eq.parse_function('\\frac{1}{x-1}'))
+    x = np.array([0.0, 1.0, 1.0005, 3.0])
+    y = eq.sample_function(f.f, x, limit=1000)
+    assert y[0] == pytest.approx(-1.0) and y[3] == pytest.approx(0.5)
+    assert np.isnan(y[1]) and np.isnan(y[2])
+    assert f.evaluations == 0
+    np.testing.assert_array_equal(eq.sample_function(lambda x: 2.0, x), [2.0] * 4)
+
+
+# La malla de la gráfica no debe sumar evaluaciones al método
+@pytest.mark.parametrize('method', ['bisection', 'brent'])
+def test_bisection_plot_is_not_counted(bisection_client, method):
+    body = bisection_client.post('/bisection', json={
+        'equation': 'x^{2}-2', 'a': 0, 'b': 2, 'iterations': 60, 'method': method
+    }).get_json()
+    assert 'plot_json' in body
+    assert body['function_evaluations'] == body['evaluations']
+
+
+def test_newton_plot_is_not_counted(newton_client):
+    body = newton_client.post('/newton_raphson', json={
+        'equation': 'x^{2}-2', 'initial_guess': 1, 'iterations': 50
+    }).get_json()
+    assert body['converged']
+    assert body['function_evaluations'] == body['iterations']
+
+
+def test_fixed_point_plot_is_not_counted(fixed_point_client):
+    body = fixed_point_client.post('/fixed_point', json={
+        'gFunction': '\\cos(x)', 'initial_guess': 1, 'iterations': 1000
+    }).get_json()
+    assert body['converged'] and 'plot_json' in body
+    assert body['function_evaluations'] == body['iterations']
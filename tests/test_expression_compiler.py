@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from microservices.app.util import equation as eq
+from microservices.app.util import expression_compiler
+
+EQUATIONS = [
+    'x**3 - 2*x + 1',
+    '-x**2 + (-2)**2',
+    'sin(x)**2 + cos(x)/3',
+    'exp(-x/2) * log(1 + x**2)',
+    'sqrt(x**2 + 1) - x**(1/2 + 0)',
+    'e**x - E*pi',
+    'abs(x - 1) / (1 + tan(x/4))',
+    'x**(1/2)',
+]
+
+
+@pytest.mark.parametrize('processed', EQUATIONS)
+def test_compiled_matches_sympy_lambdify(processed):
+    x = np.linspace(0.1, 2.0, 11)
+    compiled = expression_compiler.compile_expression(processed)
+    expected = eq._lambdify(eq._sympy_parse(processed))
+    with np.errstate(all='ignore'):
+        np.testing.assert_allclose(np.broadcast_to(compiled(x), x.shape),
+                                   np.broadcast_to(expected(x), x.shape), rtol=1e-12)
+
+
+@pytest.mark.parametrize('processed', [
+    'Integral(x, x)', 'x*y', 'sin', 'x + 1e400', 'x + 1' + '0' * 400,
+])
+def test_unsupported_expressions_raise(processed):
+    with pytest.raises(expression_compiler.UnsupportedExpression):
+        expression_compiler.compile_expression(processed)
+
+
+def test_huge_integer_literal_falls_back_to_sympy():
+    f = eq.parse_function('x - 1' + '0' * 400 + '/1' + '0' * 399)
+    assert f(1.0) == pytest.approx(-9.0)
+
+
+@pytest.mark.parametrize('latex', [
+    '\\frac{x^{2}+1}{\\sqrt{x}}',
+    '2x\\cdot\\sin(x)-\\ln(x)',
+    '\\sqrt[3]{x+1}-e^{-x}',
+    '\\left|x-1\\right|+\\log(x)',
+])
+def test_parse_function_matches_sympy_for_latex(latex):
+    x = np.linspace(0.2, 3.0, 9)
+    expected = eq._lambdify(eq._sympy_parse(eq.preprocess_equation(latex)))
+    f = eq.parse_function(latex)
+    np.testing.assert_allclose(np.broadcast_to(f(x), x.shape), np.broadcast_to(expected(x), x.shape), rtol=1e-12)
+    assert f(1.3) == pytest.approx(float(expected(1.3)), rel=1e-12)
+
+
+@pytest.mark.parametrize('processed', ['x', '2', 'x**2'])
+def test_scalar_input_returns_a_float(processed):
+    f = expression_compiler.compile_expression(processed)
+    assert isinstance(f(1.5), float)
+    assert np.shape(f(np.arange(3.0))) in ((), (3,))
+
+
+@pytest.mark.parametrize('g, root', [('x', 1.5), ('2', 2.0)])
+def test_fixed_point_endpoint_with_identity_or_constant_g(fixed_point_client, g, root):
+    assert isinstance(eq.parse_g_function(g)(1.5), float)
+    response = fixed_point_client.post('/fixed_point', json={'gFunction': g, 'initial_guess': 1.5, 'iterations': 50})
+    assert response.status_code == 200
+    assert response.get_json()['root'] == pytest.approx(root)
@@ -0,0 +1,131 @@
+import math
+
+import numpy as np
+import pytest
+
+from microservices.fixed_point.logic import fixed_point, fixed_point_system
+
+DOTTIE = 0.7390851332151607
+
+
+@pytest.mark.parametrize('acceleration', fixed_point.ACCELERATIONS)
+def test_accelerations_reach_the_fixed_point_faster(acceleration):
+    plain = fixed_point.fixed_point_method(math.cos, 1.0, 200, [], tol=1e-10)
+    root, converged, iterations, _, stats = fixed_point.accelerated_fixed_point(
+        math.cos, 1.0, 200, [], tol=1e-10, acceleration=acceleration
+    )
+    assert converged and stats['stop_reason'] == 'converged'
+    assert root == pytest.approx(DOTTIE, abs=1e-9)
+    assert plain[1] and stats['g_evaluations'] < plain[2]
+
+
+def test_unknown_acceleration_is_rejected(fixed_point_client):
+    with pytest.raises(ValueError):
+        fixed_point.accelerated_fixed_point(math.cos, 1.0, 10, [], acceleration='anderson')
+    response = fixed_point_client.post('/fixed_point', json={
+        'gFunction': '\\cos(x)', 'initial_guess': 1, 'iterations': 50, 'acceleration': 'anderson'
+    })
+    assert response.status_code == 400
+
+
+def test_fixed_point_endpoint_with_steffensen(fixed_point_client):
+    response = fixed_point_client.post('/fixed_point', json={
+        'gFunction': '\\cos(x)', 'initial_guess': 1, 'iterations': 50, 'acceleration': 'steffensen'
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['root'] == pytest.approx(DOTTIE, abs=1e-6)
+    assert body['acceleration'] == 'steffensen'
+    assert body['function_evaluations'] >= body['g_evaluations']
+
+
+def _linear_map(n):
+    """G(x) = A x + b, con A contractiva (radio espectral 0.9)."""
+    A = 0.45 * (np.eye(n, k=1) + np.eye(n, k=-1)) / np.cos(np.pi / (n + 1))
+    b = np.ones(n)
+    return A, b, np.linalg.solve(np.eye(n) - A, b)
+
+
+@pytest.mark.parametrize('m', [0, 1, 5])
+def test_anderson_solves_a_contractive_linear_map(m):
+    A, b, exact = _linear_map(20)
+    result = fixed_point_system.anderson_fixed_point(lambda x: A @ x + b, np.zeros(20), 2000, tol=1e-10, m=m)
+    assert result['converged']
+    np.testing.assert_allclose(result['x'], exact, atol=1e-8)
+
+
+def test_anderson_needs_fewer_evaluations_than_picard():
+    A, b, _ = _linear_map(20)
+    G = lambda x: A @ x + b
+    picard = fixed_point_system.anderson_fixed_point(G, np.zeros(20), 2000, tol=1e-10, m=0)
+    anderson = fixed_point_system.anderson_fixed_point(G, np.zeros(20), 2000, tol=1e-10, m=5)
+    assert anderson['g_evaluations'] < picard['g_evaluations'] / 2
+
+
+def test_fixed_point_system_endpoint(fixed_point_client):
+    response = fixed_point_client.post('/fixed_point/system', json={
+        'gFunctions': ['cos(y)/2', 'sin(x)/3 + 1'], 'variables': ['x', 'y'],
+        'initial_guess': [0, 0], 'tol': 1e-10, 'm': 3
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['converged']
+    x, y = body['x']
+    assert x == pytest.approx(math.cos(y) / 2, abs=1e-9)
+    assert y == pytest.approx(math.sin(x) / 3 + 1, abs=1e-9)
+    assert body['function_evaluations'] == body['g_evaluations']
+
+    response = fixed_point_client.post('/fixed_point/system', json={
+        'gFunctions': ['x'], 'variables': ['x'], 'initial_guess': [0], 'm': -1
+    })
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('g, x0, orbit', [
+    (lambda x: -x, 0.7, [-0.7, 0.7]),
+    # Órbita de período 2 del mapa logístico con r = 3.2
+    (lambda x: 3.2 * x * (1 - x), 0.3, [(4.2 - math.sqrt(0.84)) / 6.4, (4.2 + math.sqrt(0.84)) / 6.4]),
+])
+def test_two_cycles_are_detected_with_their_period(g, x0, orbit):
+    x, converged, iterations, history, diagnostics = fixed_point.fixed_point_method(g, x0, 500, [])
+    assert not converged and iterations < 100
+    assert diagnostics['stop_reason'] == 'cycle'
+    assert diagnostics['cycle_period'] == 2
+    assert sorted(entry['x'] for entry in history[-2:]) == pytest.approx(orbit, abs=1e-5)
+
+
+def test_period_four_cycle():
+    _, _, _, _, diagnostics = fixed_point.fixed_point_method(lambda x: 3.5 * x * (1 - x), 0.3, 500, [])
+    assert diagnostics['stop_reason'] == 'cycle'
+    assert diagnostics['cycle_period'] == 4
+
+
+@pytest.mark.parametrize('g, x0', [(lambda x: x + 1, 0.0), (lambda x: 2 * x, 1.0), (lambda x: -2 * x, 1.0)])
+def test_divergence_is_detected(g, x0):
+    _, converged, iterations, _, diagnostics = fixed_point.fixed_point_method(g, x0, 1000, [])
+    assert not converged and iterations < 100
+    assert diagnostics['stop_reason'] == 'divergence'
+    assert diagnostics['cycle_period'] is None
+
+
+def test_slow_convergence_is_reported_as_stagnation():
+    x, converged, iterations, _, diagnostics = fixed_point.fixed_point_method(lambda x: x - 0.01 * x ** 3, 1.0, 200, [])
+    assert not converged and iterations < 200
+    assert diagnostics['stop_reason'] == 'stagnation'
+    assert 0.9 < diagnostics['contraction'] < 1
+
+
+@pytest.mark.parametrize('g, x0, reason, period', [
+    ('-x', 0.7, 'cycle', 2),
+    ('3.2x\\left(1-x\\right)', 0.3, 'cycle', 2),
+    ('x+1', 0, 'divergence', None),
+    ('2x', 1, 'divergence', None),
+])
+def test_fixed_point_endpoint_reports_stop_reason(fixed_point_client, g, x0, reason, period):
+    response = fixed_point_client.post('/fixed_point', json={'gFunction': g, 'initial_guess': x0, 'iterations': 500})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert not body['converged']
+    assert body['stop_reason'] == reason
+    assert body['cycle_period'] == period
+    assert body['iterations'] < 100
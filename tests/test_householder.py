@@ -0,0 +1,69 @@
+import math
+from decimal import Decimal, localcontext
+from fractions import Fraction
+
+import pytest
+
+from microservices.newton_raphson.logic import newton_raphson
+
+
+def _cube_root_values(x, order):
+    """(f, f', ..., f^(order)) de f(x) = x^3 - 2."""
+    return (x ** 3 - 2, 3 * x ** 2, 6 * x, Fraction(6))[:order + 1]
+
+
+@pytest.mark.parametrize('order', [1, 2, 3])
+def test_householder_step_has_order_d_plus_one(order):
+    # Aritmética exacta: en punto flotante el error llega a eps antes de ver el orden
+    with localcontext() as context:
+        context.prec = 1000
+        root = Decimal(2) ** (Decimal(1) / 3)
+        x = Fraction(2)
+        errors = []
+        for _ in range(5):
+            errors.append(abs(Decimal(x.numerator) / Decimal(x.denominator) - root))
+            x -= newton_raphson._householder_step(_cube_root_values(x, order))
+        rate = (errors[-1] / errors[-2]).ln() / (errors[-2] / errors[-3]).ln()
+    assert float(rate) == pytest.approx(order + 1, abs=0.02)
+
+
+def test_higher_orders_need_fewer_iterations():
+    iterations = {}
+    for order in (1, 2, 3):
+        fused = lambda x, order=order: (math.exp(x) - 2,) + (math.exp(x),) * order
+        root, converged, iterations[order], history = newton_raphson.householder_method(
+            fused, 2.5, 50, order, tol=1e-12
+        )
+        assert converged and root == pytest.approx(math.log(2), abs=1e-12)
+        assert len(history) == iterations[order]
+    assert iterations[3] < iterations[2] < iterations[1]
+
+
+def test_exact_root_is_recorded_in_the_history():
+    root, converged, iterations, history = newton_raphson.householder_method(
+        lambda x: (x - 1.0, 1.0, 0.0), 1.0, 10, 2
+    )
+    assert converged and root == 1.0
+    assert iterations == 1 and len(history) == 1
+    assert history[0]['error'] == 0
+
+
+@pytest.mark.parametrize('method, order', [('halley', 2), ('householder3', 3)])
+def test_newton_endpoint_higher_order_methods(newton_client, method, order):
+    response = newton_client.post('/newton_raphson', json={
+        'equation': 'x^{3}-2x-5', 'initial_guess': 2, 'iterations': 50, 'method': method
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['converged'] and body['method'] == method
+    assert body['root'] == pytest.approx(2.0945514815423265, abs=1e-6)
+    assert body['evaluations_per_iteration'] == order + 1
+    assert 'evaluations' not in body
+    assert body['function_evaluations'] >= body['iterations']
+
+
+def test_newton_endpoint_rejects_autodiff_above_first_order(newton_client):
+    response = newton_client.post('/newton_raphson', json={
+        'equation': 'x^{2}-2', 'initial_guess': 1, 'iterations': 20, 'method': 'halley', 'derivative': 'autodiff'
+    })
+    assert response.status_code == 400
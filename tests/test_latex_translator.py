@@ -0,0 +1,34 @@
+import pytest
+
+from microservices.app.util.latex_translator import MAX_DEPTH, translate_latex
+
+
+@pytest.mark.parametrize('latex, expected', [
+    ('2x+1', '2*x+1'),
+    ('(x+1)(x-1)', '(x+1)*(x-1)'),
+    ('e^{x}-2', 'e**(x)-2'),
+    ('\\frac{1}{x}', '(1)/(x)'),
+    ('\\sqrt{x}', 'sqrt(x)'),
+    ('\\sqrt[3]{x}', '(x)**(1/(3))'),
+    ('\\int_{0}^{1} x^{2} dx', 'Integral(x**(2), (x, 0, 1))'),
+    ('\\left|x\\right|', 'abs(x)'),
+    ('\\ln(x)\\cdot\\log(x)', 'log(x)*log10(x)'),
+    ('\\operatorname{sinh}(x)', 'sinh(x)'),
+    ('2\\frac{x}{3}', '2*(x)/(3)'),
+])
+def test_known_translations(latex, expected):
+    assert translate_latex(latex) == expected
+
+
+def test_deep_nesting_is_linear_and_bounded():
+    nested = '\\frac{1}{' * 150 + 'x' + '}' * 150
+    translated = translate_latex(nested)
+    assert translated.count('(') == translated.count(')')
+    with pytest.raises(ValueError):
+        translate_latex('\\frac{1}{' * (MAX_DEPTH + 1) + 'x' + '}' * (MAX_DEPTH + 1))
+
+
+@pytest.mark.parametrize('latex', ['\\frac{1}', '{x+1', 'x}', '\\int_{0}^{1} x', '\\sqrt'])
+def test_malformed_input_raises_value_error(latex):
+    with pytest.raises(ValueError):
+        translate_latex(latex)
@@ -0,0 +1,30 @@
+import pytest
+
+
+def test_multistart_finds_roots_and_basins(newton_client):
+    response = newton_client.post('/newton_raphson/multistart', json={
+        'equation': 'x^{3}-x', 'range': [-2, 2], 'count': 21
+    })
+    assert response.status_code == 200, response.get_json()
+    body = response.get_json()
+    roots = sorted(r['root'] for r in body['roots'])
+    assert roots == pytest.approx([-1.0, 0.0, 1.0], abs=1e-6)
+    assert len(body['basins']) == 21
+    assert body['function_evaluations'] > 0
+
+
+@pytest.mark.parametrize('count', [0, 10 ** 10, 'many'])
+def test_multistart_rejects_bad_count_before_allocating(newton_client, count):
+    response = newton_client.post('/newton_raphson/multistart', json={
+        'equation': 'x^{2}-2', 'range': [-2, 2], 'count': count
+    })
+    assert response.status_code == 400
+
+
+def test_multistart_rejects_too_many_guesses(newton_client):
+    from microservices.newton_raphson.logic.newton_controller import MAX_STARTS
+
+    response = newton_client.post('/newton_raphson/multistart', json={
+        'equation': 'x^{2}-2', 'initial_guesses': [1.0] * (MAX_STARTS + 1)
+    })
+    assert response.status_code == 400
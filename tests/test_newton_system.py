@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+import scipy.sparse as sparse
+
+from microservices.newton_raphson.logic import newton_system
+
+
+def _chain(n):
+    """Sistema tridiagonal: 4 x_i + x_i^3 - x_{i-1} - x_{i+1} = 1 (con x_0 = x_{n+1} = 0)."""
+    variables = [f'x{i}' for i in range(1, n + 1)]
+    equations = []
+    for i in range(1, n + 1):
+        terms = [f'4*x{i} + x{i}**3']
+        if i > 1:
+            terms.append(f'- x{i - 1}')
+        if i < n:
+            terms.append(f'- x{i + 1}')
+        equations.append(' '.join(terms) + ' = 1')
+    return equations, variables
+
+
+@pytest.mark.parametrize('method', ['newton', 'broyden_good', 'broyden_bad'])
+@pytest.mark.parametrize('jacobian', ['symbolic', 'sparse_fd'])
+def test_system_endpoint_methods_agree(newton_client, method, jacobian):
+    equations, variables = _chain(30)
+    response = newton_client.post('/newton_raphson/system', json={
+        'equations': equations, 'variables': variables, 'initial_guess': [0.0] * 30,
+        'method': method, 'jacobian': jacobian, 'tol': 1e-10
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['converged']
+    reference = newton_system.newton_system(
+        lambda x: 4 * x + x ** 3 - np.concatenate([[0], x[:-1]]) - np.concatenate([x[1:], [0]]) - 1,
+        lambda x: np.diag(4 + 3 * x ** 2) - np.eye(30, k=1) - np.eye(30, k=-1),
+        np.zeros(30), 50, 1e-12
+    )
+    np.testing.assert_allclose(body['x'], reference['x'], atol=1e-8)
+
+
+def test_system_endpoint_rejects_oversized_dense_system(newton_client):
+    equations, variables = _chain(201)
+    response = newton_client.post('/newton_raphson/system', json={
+        'equations': equations, 'variables': variables, 'initial_guess': [0.0] * 201
+    })
+    assert response.status_code == 400
+
+
+def test_sparse_inverse_jacobian_matches_dense():
+    rng = np.random.default_rng(0)
+    n = 40
+    dense = np.diag(4 + rng.random(n)) + np.diag(rng.random(n - 1), 1) + np.diag(rng.random(n - 1), -1)
+    from_sparse = newton_system._InverseJacobian(sparse.csr_matrix(dense))
+    from_dense = newton_system._InverseJacobian(dense)
+    assert from_sparse.matrix is None
+    for _ in range(3):
+        u, v = rng.standard_normal(n), rng.standard_normal(n)
+        from_sparse.update(u, v)
+        from_dense.update(u, v)
+    w = rng.standard_normal(n)
+    np.testing.assert_allclose(from_sparse.matvec(w), from_dense.matvec(w), rtol=1e-10)
+    np.testing.assert_allclose(from_sparse.rmatvec(w), from_dense.rmatvec(w), rtol=1e-10)
+
+
+def test_singular_sparse_jacobian_falls_back_to_pseudoinverse():
+    H = newton_system._InverseJacobian(sparse.csr_matrix(np.array([[1.0, 1.0], [1.0, 1.0]])))
+    assert H.matrix is not None
+    np.testing.assert_allclose(H.matvec(np.array([2.0, 2.0])), [1.0, 1.0])
+
+
+def test_sparse_finite_difference_jacobian_matches_symbolic():
+    from microservices.app.util import equation as eq
+    from microservices.newton_raphson.logic import sparse_jacobian
+
+    equations, variables = _chain(12)
+    system = eq.get_compiled_system(equations, variables)
+    rows, cols = system.sparsity
+    fd = sparse_jacobian.FiniteDifferenceJacobian(system.residual, rows, cols, len(system.variables))
+    # Tridiagonal: basta con 3 colores (3 evaluaciones del residuo) para 12 columnas
+    assert fd.num_colors == 3
+    x = np.linspace(-1, 1, 12)
+    np.testing.assert_allclose(fd(x).toarray(), system.jacobian(x), atol=1e-6)
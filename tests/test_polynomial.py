@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from microservices.app.util import polynomial
+from microservices.app.util.evaluator import CountingEvaluator
+
+
+def test_roots_with_multiplicities_and_complex_pair():
+    # (x - 1)^3 (x + 2) (x^2 + 1)
+    coefficients = np.polymul(np.poly([1, 1, 1, -2]), [1, 0, 1])
+    real, complex_roots = polynomial.polynomial_roots(coefficients)
+    assert [r['multiplicity'] for r in real] == [1, 3]
+    assert [r['root'] for r in real] == pytest.approx([-2.0, 1.0], abs=1e-9)
+    assert sorted(c['imag'] for c in complex_roots) == pytest.approx([-1.0, 1.0], abs=1e-12)
+
+
+def test_close_simple_roots_are_not_merged():
+    real, _ = polynomial.polynomial_roots(np.poly([1.0, 1.001]))
+    assert [r['multiplicity'] for r in real] == [1, 1]
+    assert [r['root'] for r in real] == pytest.approx([1.0, 1.001], abs=1e-12)
+
+
+def test_counted_evaluator_sees_complex_polish_points():
+    coefficients = np.array([1.0, 0.0, 1.0, -10.0])
+    p = CountingEvaluator(lambda z: np.polyval(coefficients, z))
+    real, complex_roots = polynomial.polynomial_roots(coefficients, p=p)
+    assert len(real) == 1 and len(complex_roots) == 2
+    assert real[0]['root'] == pytest.approx(2.0, abs=1e-12)
+    assert p.evaluations > 0
+
+
+def test_polynomial_coefficients_rejects_non_polynomials():
+    import sympy as sp
+
+    x = sp.Symbol('x')
+    assert polynomial.polynomial_coefficients(sp.sin(x), x) is None
+    assert polynomial.polynomial_coefficients(1 / x, x) is None
+    np.testing.assert_array_equal(polynomial.polynomial_coefficients(x ** 2.0 - 3, x), [1.0, 0.0, -3.0])
+
+
+def test_all_roots_endpoint_reports_function_evaluations(newton_client):
+    response = newton_client.post('/newton_raphson/all_roots', json={
+        'equation': 'x^{3}-6x^{2}+11x-6', 'complex': True
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [r['root'] for r in body['roots']] == pytest.approx([1.0, 2.0, 3.0], abs=1e-12)
+    assert body['count'] == 3 and body['complex_roots'] == []
+    assert body['function_evaluations'] > 0
+
+
+def test_all_roots_endpoint_rejects_non_polynomials(newton_client):
+    response = newton_client.post('/newton_raphson/all_roots', json={'equation': '\\sin(x)'})
+    assert response.status_code == 400
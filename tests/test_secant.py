@@ -0,0 +1,59 @@
+import math
+
+import pytest
+
+from microservices.secant.logic import secant
+
+
+def _counted(f):
+    def wrapped(x):
+        wrapped.calls += 1
+        return f(x)
+    wrapped.calls = 0
+    return wrapped
+
+
+@pytest.mark.parametrize('variant', secant.SECANT_VARIANTS)
+@pytest.mark.parametrize('f, x0, x1, root', [
+    (lambda x: x ** 2 - 2, 1.0, 2.0, 2 ** 0.5),
+    (lambda x: math.cos(x) - x, 0.0, 1.0, 0.7390851332151607),
+    (lambda x: math.exp(x) - 3, 0.0, 2.0, math.log(3)),
+])
+def test_variants_converge(variant, f, x0, x1, root):
+    counted = _counted(f)
+    x, converged, iterations, history = secant.secant_method(counted, x0, x1, 50, tol=1e-12, variant=variant)
+    assert converged
+    assert x == pytest.approx(root, abs=1e-10)
+    # Una evaluación por iteración más las dos iniciales
+    assert counted.calls == iterations + 2
+    assert len(history) == iterations
+
+
+def test_three_point_variants_need_fewer_iterations():
+    f = lambda x: math.exp(x) - 3 * x ** 2
+    iterations = {
+        variant: secant.secant_method(f, 3.0, 4.0, 50, tol=1e-13, variant=variant)[2]
+        for variant in secant.SECANT_VARIANTS
+    }
+    assert iterations['iqi'] <= iterations['secant']
+    assert iterations['muller'] <= iterations['secant']
+
+
+def test_unknown_variant_is_rejected(secant_client):
+    with pytest.raises(ValueError):
+        secant.secant_method(math.sin, 3.0, 3.5, 10, variant='halley')
+    response = secant_client.post('/secant', json={
+        'equation': 'x^{2}-2', 'x0': 1, 'x1': 2, 'iterations': 20, 'variant': 'halley'
+    })
+    assert response.status_code == 400
+
+
+def test_endpoint_reports_variant_and_evaluations(secant_client):
+    response = secant_client.post('/secant', json={
+        'equation': 'x^{2}-2', 'x0': 1, 'x1': 2, 'iterations': 20, 'variant': 'iqi'
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['variant'] == 'iqi' and body['converged']
+    assert body['root'] == pytest.approx(2 ** 0.5, abs=1e-6)
+    assert body['function_evaluations'] == body['iterations'] + 2